@@ -0,0 +1,180 @@
+"""
+dataset_generator.py
+
+This module generates synthetic datasets of scored predictions, shaped like the files users upload, to
+benchmark the processing of datasets far larger than the test data.
+
+Every row has a value for each of `columns` protected classes, an optional numerical `age`, and the
+`marked` and `actual` outcomes. The traits of each category are drawn with a Zipf-like skew, and bias
+is injected into the first category: the outcomes of its traits are flipped with a probability rising
+linearly from `error_rate` for its first trait to `error_rate + bias` for its last one, so the FPRs
+of that category spread apart as `bias` grows while the other categories stay fair.
+
+Rows are generated and written in fixed blocks of `BLOCK_SIZE` rows, each drawn from its own seeded
+random generator, so memory does not grow with the number of rows and a given seed always produces the
+same file.
+
+Usage:
+    python -m backend.benchmarks.dataset_generator data.parquet --rows 1e7 --columns 3 --cardinality 50
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backend.entities.protected_classes import PROTECTED_CLASSES
+
+# Protected classes used as the categorical columns of generated datasets, in order, starting with those of the
+# test data
+CATEGORY_NAMES = ["citizenship", "sex", *sorted(PROTECTED_CLASSES - {"citizenship", "sex", "age"})]
+
+# Number of rows generated and written at a time
+BLOCK_SIZE = 1_000_000
+
+# Formats that can be written, by file extension
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+
+
+def get_trait_probabilities(cardinality: int, skew: float) -> np.ndarray:
+    """
+    Computes the probability of every trait of a category, decreasing with its rank as a Zipf law.
+
+    Args:
+        cardinality (int): The number of traits of the category.
+        skew (float): The exponent of the Zipf law. 0 makes every trait equally likely, and higher values make
+            the first traits increasingly common.
+
+    Returns:
+        np.ndarray: The probability of every trait, summing to 1.
+    """
+    weights = 1 / np.arange(1, cardinality + 1, dtype=np.float64) ** skew
+    return weights / weights.sum()
+
+
+def generate_block(seed: int, block: int, rows: int, columns: int, cardinality: int, skew: float, bias: float,
+                   error_rate: float, age: bool) -> pd.DataFrame:
+    """
+    Generates one block of rows of a dataset.
+
+    Args:
+        seed (int): The seed of the dataset.
+        block (int): The index of the block, which seeds its random generator together with `seed`.
+        rows (int): The number of rows of the block.
+        columns (int): The number of categorical protected classes.
+        cardinality (int): The number of traits of each categorical protected class.
+        skew (float): The skew of the trait frequencies (see `get_trait_probabilities`).
+        bias (float): The spread of error rates injected across the traits of the first category.
+        error_rate (float): The probability that a prediction is wrong for the least biased trait.
+        age (bool): Whether to add a numerical `age` column.
+
+    Returns:
+        pd.DataFrame: The rows of the block.
+    """
+    rng = np.random.default_rng([seed, block])
+    probabilities = get_trait_probabilities(cardinality, skew)
+    data = {}
+    codes = None
+    for name in CATEGORY_NAMES[:columns]:
+        traits = rng.choice(cardinality, size=rows, p=probabilities)
+        codes = traits if codes is None else codes
+        data[name] = pd.Categorical.from_codes(traits, [f"{name}-{i}" for i in range(cardinality)])
+    if age:
+        data["age"] = rng.integers(18, 90, size=rows)
+
+    # The first category's traits are increasingly likely to get a wrong prediction
+    flip_probability = np.full(rows, error_rate)
+    if codes is not None and cardinality > 1:
+        flip_probability += bias * codes / (cardinality - 1)
+    actual = rng.integers(0, 2, size=rows)
+    data["marked"] = actual ^ (rng.random(rows) < flip_probability)
+    data["actual"] = actual
+    return pd.DataFrame(data)
+
+
+def generate_dataset(path: str, rows: int, columns: int = 3, cardinality: int = 10, skew: float = 1.0,
+                     bias: float = 0.3, error_rate: float = 0.1, age: bool = True, seed: int = 0) -> str:
+    """
+    Writes a synthetic dataset to a CSV or Parquet file, one block of rows at a time.
+
+    Args:
+        path (str): The path of the file, whose extension sets the format (see `FORMATS`).
+        rows (int): The number of rows.
+        columns (int): The number of categorical protected classes, at most `len(CATEGORY_NAMES)`.
+        cardinality (int): The number of traits of each categorical protected class.
+        skew (float): The skew of the trait frequencies (see `get_trait_probabilities`).
+        bias (float): The spread of error rates injected across the traits of the first category.
+        error_rate (float): The probability that a prediction is wrong for the least biased trait.
+        age (bool): Whether to add a numerical `age` column.
+        seed (int): The seed of the dataset.
+
+    Returns:
+        str: The path of the file.
+
+    Raises:
+        ValueError: If the format, the number of rows, columns or traits, or the error rates are invalid.
+    """
+    file_format = FORMATS.get(os.path.splitext(path)[1].lower())
+    if file_format is None:
+        raise ValueError(f"Unsupported format: {path}")
+    if rows <= 0 or cardinality <= 0 or not 0 <= columns <= len(CATEGORY_NAMES):
+        raise ValueError("The rows and traits must be positive, and the columns at most "
+                         f"{len(CATEGORY_NAMES)}.")
+    if not 0 <= error_rate <= error_rate + bias <= 1:
+        raise ValueError("The error rates must lie between 0 and 1.")
+
+    writer = None
+    with open(path, "wb") as file:
+        for block, start in enumerate(range(0, rows, BLOCK_SIZE)):
+            df = generate_block(seed, block, min(BLOCK_SIZE, rows - start), columns, cardinality, skew, bias,
+                                error_rate, age)
+            if file_format == "csv":
+                df.to_csv(file, header=not block, index=False)
+                continue
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(file, table.schema)
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+    return path
+
+
+def parse_count(value: str) -> int:
+    """
+    Parses a count written as an integer or in scientific notation, such as "1e6".
+
+    Args:
+        value (str): The count.
+
+    Returns:
+        int: The count.
+    """
+    return int(float(value))
+
+
+def main() -> None:
+    """
+    Generates a dataset with the command-line options.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="file to write, .csv or .parquet")
+    parser.add_argument("--rows", type=parse_count, default=100_000, help="number of rows, e.g. 1e6")
+    parser.add_argument("--columns", type=int, default=3, help="number of categorical protected classes")
+    parser.add_argument("--cardinality", type=int, default=10, help="traits of each categorical protected class")
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of the trait frequencies")
+    parser.add_argument("--bias", type=float, default=0.3, help="spread of error rates across the first category")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="error rate of the least biased trait")
+    parser.add_argument("--no-age", dest="age", action="store_false", help="leave out the numerical age column")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the dataset")
+    args = parser.parse_args()
+
+    generate_dataset(args.path, args.rows, args.columns, args.cardinality, args.skew, args.bias, args.error_rate,
+                     args.age, args.seed)
+    print(f"{args.path}: {args.rows:,} rows, {os.path.getsize(args.path) / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,433 @@
+"""
+load_test.py
+
+This module load-tests the API with concurrent clients sending a mix of requests:
+- "upload": `POST /api/generateDataset` with a synthetic CSV file from `dataset_generator`.
+- "read": `GET /api/getDataset` for a dataset uploaded earlier.
+- "compare": `POST /api/saveComparison` with a comparison of two uploaded datasets.
+
+The app is served either in-process, through httpx's ASGI transport (no network, but the clients share
+the event loop and CPU with the app), or by uvicorn on localhost with `--workers` worker processes, as
+in production. `--url` targets a server that is already running instead.
+
+Every client sends requests one after another, picking each operation at random with the weights of
+`--mix`, until `--requests` requests were sent or `--duration` seconds passed. Uploads cycle through
+`--upload-files` distinct files: once all of them were uploaded, the next uploads are answered from
+the stored results, as repeated uploads are in production. A response counts as an error if it has an
+error status, is "Missing", or the request fails.
+
+The throughput, error rate and latency percentiles of every operation are printed, and can be saved with
+`--output` and compared with earlier results with `--baseline`: the load test exits with status 1 if the
+median or 99th percentile latency of an operation grew by more than `--tolerance`, or its error rate rose.
+
+Usage:
+    python -m backend.benchmarks.load_test --server uvicorn --concurrency 16 --duration 30 --output load.json
+    python -m backend.benchmarks.load_test --server uvicorn --concurrency 16 --duration 30 --baseline load.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import AsyncIterator, Callable
+
+import httpx
+import numpy as np
+
+from backend.benchmarks.dataset_generator import generate_dataset, parse_count
+
+# Percentiles of the latency of every operation reported, in percent
+PERCENTILES = (50, 90, 99)
+
+# Seconds to wait for a uvicorn server to start answering
+STARTUP_TIMEOUT = 30
+
+
+def make_uploads(count: int, rows: int) -> list[bytes]:
+    """
+    Generates distinct synthetic CSV files to upload.
+
+    Args:
+        count (int): The number of files.
+        rows (int): The number of rows of every file.
+
+    Returns:
+        list[bytes]: The content of every file.
+    """
+    uploads = []
+    with tempfile.TemporaryDirectory() as directory:
+        for seed in range(count):
+            path = generate_dataset(os.path.join(directory, f"{seed}.csv"), rows, seed=seed)
+            with open(path, "rb") as file:
+                uploads.append(file.read())
+    return uploads
+
+
+async def upload(client: httpx.AsyncClient, state: dict, rng: random.Random) -> httpx.Response:
+    """
+    Uploads the next file to be processed, and records the ID of the dataset.
+
+    Args:
+        client (httpx.AsyncClient): The client connected to the app.
+        state (dict): The files to upload and the IDs of the uploaded datasets, shared by all clients.
+        rng (random.Random): The random generator of the client.
+
+    Returns:
+        httpx.Response: The response.
+    """
+    index = state["uploaded"] % len(state["uploads"])
+    state["uploaded"] += 1
+    response = await client.post("/api/generateDataset",
+                                 files={"file": (f"load-{index}.csv", state["uploads"][index], "text/csv")})
+    if response.status_code == 200:
+        state["datasets"].append(response.json()["id"])
+    return response
+
+
+async def read(client: httpx.AsyncClient, state: dict, rng: random.Random) -> httpx.Response:
+    """
+    Retrieves a dataset uploaded earlier.
+
+    Args:
+        client (httpx.AsyncClient): The client connected to the app.
+        state (dict): The files to upload and the IDs of the uploaded datasets, shared by all clients.
+        rng (random.Random): The random generator of the client.
+
+    Returns:
+        httpx.Response: The response.
+    """
+    return await client.get("/api/getDataset", params={"id": rng.choice(state["datasets"])})
+
+
+async def compare(client: httpx.AsyncClient, state: dict, rng: random.Random) -> httpx.Response:
+    """
+    Saves a comparison of two datasets uploaded earlier.
+
+    Args:
+        client (httpx.AsyncClient): The client connected to the app.
+        state (dict): The files to upload and the IDs of the uploaded datasets, shared by all clients.
+        rng (random.Random): The random generator of the client.
+
+    Returns:
+        httpx.Response: The response.
+    """
+    data = json.dumps({"dataset1": rng.choice(state["datasets"]), "dataset2": rng.choice(state["datasets"])})
+    return await client.post("/api/saveComparison", json={"data": data})
+
+
+# Operations of the workload by name
+OPERATIONS: dict[str, Callable] = {"upload": upload, "read": read, "compare": compare}
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """
+    Parses the weights of the operations of the workload, such as "upload=1,read=8,compare=1".
+
+    Args:
+        value (str): The weight of every operation, separated by commas.
+
+    Returns:
+        dict[str, float]: The weight of every operation by name.
+
+    Raises:
+        argparse.ArgumentTypeError: If an operation is unknown or a weight is not a positive number.
+    """
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        try:
+            mix[name.strip()] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid weight: {part}")
+        if name.strip() not in OPERATIONS or mix[name.strip()] <= 0:
+            raise argparse.ArgumentTypeError(f"Invalid operation or weight: {part}")
+    return mix
+
+
+def is_error(response: httpx.Response) -> bool:
+    """
+    Determines whether a response reports an error, by its status or a "Missing" body.
+
+    Args:
+        response (httpx.Response): The response.
+
+    Returns:
+        bool: True if the request failed, False otherwise.
+    """
+    return response.status_code >= 400 or response.content == b'"Missing"'
+
+
+async def run_client(client: httpx.AsyncClient, state: dict, mix: dict[str, float], seed: int,
+                     results: dict[str, list], should_stop: Callable[[], bool]) -> None:
+    """
+    Sends requests one after another until told to stop, and records the latency and outcome of each.
+
+    Args:
+        client (httpx.AsyncClient): The client to send the requests with.
+        state (dict): The files to upload and the IDs of the uploaded datasets, shared by all clients.
+        mix (dict[str, float]): The weight of every operation.
+        seed (int): The seed of the choice of operations.
+        results (dict[str, list]): The (latency, error) pair of every request by operation, added to.
+        should_stop (Callable[[], bool]): Called before every request, returning True once the test is over.
+    """
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    while not should_stop():
+        name = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            error = is_error(await OPERATIONS[name](client, state, rng))
+        except httpx.HTTPError:
+            error = True
+        results[name].append((time.perf_counter() - start, error))
+
+
+async def run_load(client: httpx.AsyncClient, uploads: list[bytes], mix: dict[str, float], concurrency: int,
+                   requests: int | None, duration: float | None, seed: int = 0) -> dict:
+    """
+    Runs the workload with concurrent clients against the app.
+
+    One file is uploaded before the clients start, so that there is a dataset to read and compare.
+
+    Args:
+        client (httpx.AsyncClient): The client connected to the app.
+        uploads (list[bytes]): The distinct files to upload.
+        mix (dict[str, float]): The weight of every operation.
+        concurrency (int): The number of concurrent clients.
+        requests (int | None): The total number of requests to send, or None to send them for `duration`.
+        duration (float | None): The number of seconds to send requests for, or None to send `requests`.
+        seed (int): The seed of the choice of operations.
+
+    Returns:
+        dict: The summary of the run (see `summarize`).
+
+    Raises:
+        RuntimeError: If the first upload fails.
+    """
+    state = {"uploads": uploads, "uploaded": 0, "datasets": []}
+    response = await upload(client, state, random.Random(seed))
+    if is_error(response):
+        raise RuntimeError(f"The first upload failed with status {response.status_code}: {response.text}")
+
+    results = {name: [] for name in mix}
+    start = time.perf_counter()
+    sent = 0
+
+    def should_stop() -> bool:
+        nonlocal sent
+        sent += 1
+        if requests is not None:
+            return sent > requests
+        return time.perf_counter() - start >= duration
+
+    await asyncio.gather(*(run_client(client, state, mix, seed + 1 + index, results, should_stop)
+                           for index in range(concurrency)))
+    return summarize(results, time.perf_counter() - start)
+
+
+def summarize(results: dict[str, list], elapsed: float) -> dict:
+    """
+    Computes the throughput, error rate and latency percentiles of every operation and of all requests.
+
+    Args:
+        results (dict[str, list]): The (latency, error) pair of every request by operation.
+        elapsed (float): The duration of the run in seconds.
+
+    Returns:
+        dict: The "seconds" the run lasted, and for every operation and "all" requests, the number of
+            "requests", "errors" and "errorRate", the "throughput" in requests per second and the latency
+            percentiles and maximum in milliseconds (such as "p50Ms" and "maxMs").
+    """
+    summary = {"seconds": elapsed, "operations": {}}
+    for name, values in {**results, "all": [value for values in results.values() for value in values]}.items():
+        latencies = np.array([latency for latency, _ in values]) * 1000
+        errors = sum(error for _, error in values)
+        summary["operations"][name] = {
+            "requests": len(values),
+            "errors": errors,
+            "errorRate": errors / len(values) if values else 0.0,
+            "throughput": len(values) / elapsed,
+            **{f"p{percentile}Ms": float(np.percentile(latencies, percentile)) if values else None
+               for percentile in PERCENTILES},
+            "maxMs": float(latencies.max()) if values else None
+        }
+    return summary
+
+
+def compare_summaries(summary: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compares the summary of a run with a baseline.
+
+    Args:
+        summary (dict): The summary of the run, as produced by `summarize`.
+        baseline (dict): The summary of an earlier run.
+        tolerance (float): The relative latency growth allowed before it counts as a regression, e.g. 0.2 for 20%.
+
+    Returns:
+        list[str]: A description of every regression.
+    """
+    regressions = []
+    for name, result in summary["operations"].items():
+        previous = baseline["operations"].get(name)
+        if not previous or not result["requests"] or not previous["requests"]:
+            continue
+        for key in ("p50Ms", "p99Ms"):
+            if result[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{name} {key}: {previous[key]:.1f} ms -> {result[key]:.1f} ms")
+        if result["errorRate"] > previous["errorRate"]:
+            regressions.append(f"{name} errorRate: {previous['errorRate']:.2%} -> {result['errorRate']:.2%}")
+    return regressions
+
+
+def get_free_port() -> int:
+    """
+    Finds a free TCP port on localhost.
+
+    Returns:
+        int: The port.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def serve(server: str, workers: int, url: str | None) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Serves the app and yields a client connected to it.
+
+    Args:
+        server (str): "inprocess" to serve the app through httpx's ASGI transport, or "uvicorn" to start uvicorn
+            on localhost.
+        workers (int): The number of uvicorn worker processes.
+        url (str | None): The URL of a server that is already running, used instead of starting one.
+
+    Yields:
+        httpx.AsyncClient: The client connected to the app.
+
+    Raises:
+        RuntimeError: If uvicorn exits or does not answer within `STARTUP_TIMEOUT` seconds.
+    """
+    timeout = httpx.Timeout(None)
+    if url is not None:
+        async with httpx.AsyncClient(base_url=url, timeout=timeout) as client:
+            yield client
+        return
+
+    if server == "inprocess":
+        from main import app
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load-test",
+                                     timeout=timeout) as client:
+            yield client
+        return
+
+    port = get_free_port()
+    # Started in its own process group, so that the job runner's worker processes are stopped along with it
+    process = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port",
+                                str(port), "--workers", str(workers), "--log-level", "warning"], start_new_session=True)
+    try:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=timeout, limits=limits) as client:
+            deadline = time.monotonic() + STARTUP_TIMEOUT
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with status {process.returncode}.")
+                try:
+                    await client.get("/api/getStoreStatistics")
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(f"uvicorn did not answer within {STARTUP_TIMEOUT} seconds.")
+                    await asyncio.sleep(0.1)
+            yield client
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait()
+
+
+def print_summary(summary: dict) -> None:
+    """
+    Prints the summary of a run, one line per operation.
+
+    Args:
+        summary (dict): The summary of the run, as produced by `summarize`.
+    """
+    print(f"{summary['seconds']:.1f} s")
+    for name, result in summary["operations"].items():
+        if not result["requests"]:
+            print(f"{name:>8}: no requests")
+            continue
+        percentiles = "  ".join(f"p{percentile} {result[f'p{percentile}Ms']:8.1f} ms" for percentile in PERCENTILES)
+        print(f"{name:>8}: {result['requests']:>7} requests  {result['throughput']:8.1f} req/s  "
+              f"errors {result['errorRate']:6.2%}  {percentiles}  max {result['maxMs']:8.1f} ms")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """
+    Serves the app and runs the workload with the command-line options.
+
+    Args:
+        args (argparse.Namespace): The command-line options.
+
+    Returns:
+        dict: The summary of the run (see `summarize`).
+    """
+    uploads = make_uploads(args.upload_files, args.upload_rows)
+    async with serve(args.server, args.workers, args.url) as client:
+        return await run_load(client, uploads, args.mix, args.concurrency, args.requests, args.duration,
+                              args.seed)
+
+
+def main() -> None:
+    """
+    Runs the load test with the command-line options, prints its summary and compares it with the baseline.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", choices=("inprocess", "uvicorn"), default="inprocess", help="how to serve the app")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--url", help="URL of a running server to test instead")
+    parser.add_argument("--concurrency", type=int, default=8, help="number of concurrent clients")
+    parser.add_argument("--duration", type=float, default=10, help="seconds to send requests for")
+    parser.add_argument("--requests", type=parse_count, help="total requests to send, instead of a duration")
+    parser.add_argument("--mix", type=parse_mix, default="upload=1,read=8,compare=1", help="weight of every operation")
+    parser.add_argument("--upload-files", type=int, default=50, help="distinct files to upload")
+    parser.add_argument("--upload-rows", type=parse_count, default=10_000, help="rows of every uploaded file")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the choice of operations")
+    parser.add_argument("--output", help="file to save the summary to, as JSON")
+    parser.add_argument("--baseline", help="summary saved by an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative latency growth counted as a regression")
+    args = parser.parse_args()
+
+    settings = {key: value for key, value in vars(args).items() if key not in ("output", "baseline", "tolerance")}
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline["settings"] != settings:
+            parser.error(f"The baseline was run with other settings: {baseline['settings']}")
+
+    summary = {"settings": settings, **asyncio.run(run(args))}
+    print_summary(summary)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(summary, file, indent=2)
+
+    if baseline is not None:
+        regressions = compare_summaries(summary, baseline, args.tolerance)
+        if regressions:
+            print(f"Regressions beyond {args.tolerance:.0%}:")
+            print("\n".join(regressions))
+            sys.exit(1)
+        print(f"No latency grew by more than {args.tolerance:.0%} and no error rate rose.")
+
+
+if __name__ == "__main__":
+    main()
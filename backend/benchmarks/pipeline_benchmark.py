@@ -0,0 +1,252 @@
+"""
+pipeline_benchmark.py
+
+This module benchmarks the processing of uploaded datasets, stage by stage, on synthetic datasets from
+`dataset_generator`:
+- "parse": loading the file into a `DatasetFile`, whole or in chunks.
+- "process": scoring it with the `CalculatorPipeline`, as uploads are.
+- "analyze": writing its analysis with the `SimpleAnalyzer`.
+- "response": building its categories and encoding the JSON response.
+
+Every dataset is processed `--repeat` times, and the median time of every stage is reported. It is then
+processed once more under `tracemalloc`, whose peak allocation during each stage is reported too (memory
+allocated by pyarrow outside of the Python allocator is not traced).
+
+The results can be saved with `--output` and compared with earlier ones with `--baseline`: the benchmark
+exits with status 1 if a stage got slower than the baseline by more than `--tolerance`. Generated files
+are kept in `--data-dir`, if given, and reused by later runs with the same parameters.
+
+Usage:
+    python -m backend.benchmarks.pipeline_benchmark --rows 1e5 1e6 --formats csv parquet --output baseline.json
+    python -m backend.benchmarks.pipeline_benchmark --rows 1e5 1e6 --formats csv parquet --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from backend.benchmarks.dataset_generator import generate_dataset, parse_count
+from backend.entities.dataset_files.dataset_file_factory import create_dataset_file
+from backend.presenters.dataset_formats import encode_json
+from backend.presenters.presenters import build_category
+from backend.use_cases.bias_analyzers.simple_analyzer import SimpleAnalyzer
+from backend.use_cases.bias_calculators.calculator_pipeline import CalculatorPipeline
+
+STAGES = ("parse", "process", "analyze", "response")
+
+
+def run_stages(path: str, chunk_size: int | None, metric: str, measure: Callable) -> bytes:
+    """
+    Processes a dataset file the way uploads are, measuring every stage.
+
+    Args:
+        path (str): The path of the dataset file.
+        chunk_size (int | None): The number of rows to read at a time, or None to load the whole file.
+        metric (str): The rate of `METRICS` to base the scores on.
+        measure (Callable): A function taking a stage's name and function, running it and returning its result.
+
+    Returns:
+        bytes: The encoded JSON response.
+    """
+    dataset_file = measure("parse", lambda: create_dataset_file(path, None, chunk_size))
+    scores = measure("process", lambda: CalculatorPipeline(metric).process_dataset(dataset_file))
+    description = measure("analyze", lambda: SimpleAnalyzer(dataset_file).get_overall_analysis())
+    return measure("response", lambda: encode_json({
+        "name": os.path.basename(path),
+        "metric": metric,
+        "categories": [build_category(dataset_file, category, scores["categories"][category])
+                       for category in dataset_file.categories],
+        "score": dataset_file.get_overall_score(),
+        "scores": scores["overall"],
+        "description": description
+    }))
+
+
+def time_stages(path: str, chunk_size: int | None, metric: str) -> dict[str, float]:
+    """
+    Processes a dataset file and times every stage.
+
+    Args:
+        path (str): The path of the dataset file.
+        chunk_size (int | None): The number of rows to read at a time, or None to load the whole file.
+        metric (str): The rate of `METRICS` to base the scores on.
+
+    Returns:
+        dict[str, float]: The duration of every stage in seconds.
+    """
+    durations = {}
+
+    def measure(stage: str, function: Callable) -> object:
+        start = time.perf_counter()
+        result = function()
+        durations[stage] = time.perf_counter() - start
+        return result
+
+    run_stages(path, chunk_size, metric, measure)
+    return durations
+
+
+def trace_stages(path: str, chunk_size: int | None, metric: str) -> dict[str, float]:
+    """
+    Processes a dataset file and traces the peak memory allocated during every stage.
+
+    Args:
+        path (str): The path of the dataset file.
+        chunk_size (int | None): The number of rows to read at a time, or None to load the whole file.
+        metric (str): The rate of `METRICS` to base the scores on.
+
+    Returns:
+        dict[str, float]: The peak memory allocated during every stage, above what was allocated before it,
+            in MiB.
+    """
+    peaks = {}
+
+    def measure(stage: str, function: Callable) -> object:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        result = function()
+        peaks[stage] = (tracemalloc.get_traced_memory()[1] - before) / 1024 / 1024
+        return result
+
+    tracemalloc.start()
+    try:
+        run_stages(path, chunk_size, metric, measure)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def benchmark_file(path: str, chunk_size: int | None, metric: str, repeat: int) -> dict:
+    """
+    Benchmarks every stage of the processing of a dataset file.
+
+    Args:
+        path (str): The path of the dataset file.
+        chunk_size (int | None): The number of rows to read at a time, or None to load the whole file.
+        metric (str): The rate of `METRICS` to base the scores on.
+        repeat (int): The number of timed runs.
+
+    Returns:
+        dict: The median "seconds" and the traced "peakMiB" of every stage.
+    """
+    runs = [time_stages(path, chunk_size, metric) for _ in range(repeat)]
+    peaks = trace_stages(path, chunk_size, metric)
+    return {stage: {"seconds": statistics.median(run[stage] for run in runs), "peakMiB": peaks[stage]}
+            for stage in STAGES}
+
+
+def compare(results: dict, baseline: dict, tolerance: float, noise: float = 0.001) -> list[str]:
+    """
+    Compares benchmark results with a baseline.
+
+    Stages taking well under a millisecond vary by more than any sensible tolerance from run to run, so a
+    stage only counts as a regression if it also got slower by more than `noise` seconds.
+
+    Args:
+        results (dict): The results of every case by name, as produced by `benchmark_file`.
+        baseline (dict): Earlier results in the same form.
+        tolerance (float): The relative slowdown allowed before a stage counts as a regression, e.g. 0.2 for 20%.
+        noise (float): The absolute slowdown in seconds allowed before a stage counts as a regression.
+
+    Returns:
+        list[str]: A description of every regression.
+    """
+    regressions = []
+    for case, stages in results.items():
+        for stage, result in stages.items():
+            previous = baseline.get(case, {}).get(stage)
+            if previous and result["seconds"] > max(previous["seconds"] * (1 + tolerance), previous["seconds"] + noise):
+                regressions.append(f"{case} {stage}: {previous['seconds'] * 1000:.1f} ms -> "
+                                   f"{result['seconds'] * 1000:.1f} ms")
+    return regressions
+
+
+def summarize(case: str, stages: dict, baseline: dict | None) -> list[str]:
+    """
+    Formats the results of a case, with their change from the baseline if there is one.
+
+    Args:
+        case (str): The name of the case.
+        stages (dict): The results of the case, as produced by `benchmark_file`.
+        baseline (dict | None): The baseline results of the case.
+
+    Returns:
+        list[str]: A line for every stage.
+    """
+    lines = []
+    for stage, result in stages.items():
+        line = f"{case:>24} {stage:>9}: {result['seconds'] * 1000:10.1f} ms  peak {result['peakMiB']:8.1f} MiB"
+        previous = (baseline or {}).get(stage)
+        if previous:
+            line += f"  ({result['seconds'] / previous['seconds'] - 1:+.0%} time, "
+            line += f"{result['peakMiB'] - previous['peakMiB']:+.1f} MiB)"
+        lines.append(line)
+    return lines
+
+
+def main() -> None:
+    """
+    Runs the benchmark with the command-line options, prints its summary and compares it with the baseline.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=parse_count, nargs="+", default=[100_000], help="dataset sizes, e.g. 1e6")
+    parser.add_argument("--formats", nargs="+", choices=("csv", "parquet"), default=["csv"], help="file formats")
+    parser.add_argument("--columns", type=int, default=3, help="number of categorical protected classes")
+    parser.add_argument("--cardinality", type=int, default=10, help="traits of each categorical protected class")
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of the trait frequencies")
+    parser.add_argument("--bias", type=float, default=0.3, help="spread of error rates across the first category")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the datasets")
+    parser.add_argument("--chunk-size", type=parse_count, help="rows to read at a time (default: whole files)")
+    parser.add_argument("--metric", default="error_rate", help="rate to base the scores on")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs of every dataset")
+    parser.add_argument("--data-dir", help="directory to keep generated datasets in (default: a temporary one)")
+    parser.add_argument("--output", help="file to save the results to, as JSON")
+    parser.add_argument("--baseline", help="results saved by an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative slowdown counted as a regression")
+    args = parser.parse_args()
+
+    settings = {key: value for key, value in vars(args).items()
+                if key in ("columns", "cardinality", "skew", "bias", "seed", "chunk_size", "metric")}
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            saved = json.load(file)
+        if saved["settings"] != settings:
+            parser.error(f"The baseline was run with other settings: {saved['settings']}")
+        baseline = saved["cases"]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        data_dir = args.data_dir or directory
+        os.makedirs(data_dir, exist_ok=True)
+        for rows in args.rows:
+            for file_format in args.formats:
+                case = f"{file_format}-{rows}"
+                path = os.path.join(data_dir, f"{case}-{args.columns}x{args.cardinality}-skew{args.skew}-"
+                                              f"bias{args.bias}-seed{args.seed}.{file_format}")
+                if not os.path.exists(path):
+                    generate_dataset(path, rows, args.columns, args.cardinality, args.skew, args.bias,
+                                     seed=args.seed)
+                results[case] = benchmark_file(path, args.chunk_size, args.metric, args.repeat)
+                print("\n".join(summarize(case, results[case], (baseline or {}).get(case))), flush=True)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"settings": settings, "cases": results}, file, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Stages slower than the baseline by more than {args.tolerance:.0%}:")
+            print("\n".join(regressions))
+            sys.exit(1)
+        print(f"No stage is slower than the baseline by more than {args.tolerance:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
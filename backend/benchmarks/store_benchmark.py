@@ -0,0 +1,142 @@
+"""
+store_benchmark.py
+
+This module benchmarks the read and write latency of `SqliteStore` when several worker processes
+use the same database at once, as gunicorn workers do.
+
+Every worker writes `--writes` datasets shaped like the API's dataset responses, then reads
+`--reads` datasets chosen at random among those written by all workers. Latency percentiles and
+throughput are reported per operation.
+
+Usage:
+    python -m backend.benchmarks.store_benchmark --workers 4 --writes 200 --reads 2000
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from backend.use_cases.result_stores.sqlite_store import SqliteStore
+
+
+def make_dataset(traits: int, seed: int) -> dict:
+    """
+    Generates a dataset response with three categories of random traits.
+
+    Args:
+        traits (int): The number of traits of each category.
+        seed (int): The seed of the random scores.
+
+    Returns:
+        dict: A dataset shaped like the responses of `/api/generateDataset`.
+    """
+    rng = random.Random(seed)
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "name": "benchmark.csv",
+        "categories": [{
+            "name": category,
+            "fprScore": rng.uniform(0, 10),
+            "traits": [{"name": f"{category}-{i}", "count": rng.randint(1, 10_000), "fprMean": rng.random()}
+                       for i in range(traits)]
+        } for category in ("citizenship", "sex", "age")],
+        "score": rng.uniform(0, 10),
+        "description": "Benchmark dataset."
+    }
+
+
+def run_worker(path: str, worker: int, writes: int, reads: int, workers: int, traits: int, results) -> None:
+    """
+    Writes then reads datasets, and reports the latency of every operation.
+
+    Args:
+        path (str): The path of the database file.
+        worker (int): The index of this worker.
+        writes (int): The number of datasets to write.
+        reads (int): The number of datasets to read.
+        workers (int): The total number of workers, to pick keys written by any of them.
+        traits (int): The number of traits of each category of the datasets.
+        results (multiprocessing.Queue): The queue receiving (operation, latencies) pairs.
+    """
+    store = SqliteStore(path, "datasets")
+    rng = random.Random(worker)
+
+    latencies = []
+    for i in range(writes):
+        dataset = make_dataset(traits, worker * writes + i)
+        start = time.perf_counter()
+        store[f"{worker}-{i}"] = dataset
+        latencies.append(time.perf_counter() - start)
+    results.put(("write", latencies))
+
+    latencies = []
+    for _ in range(reads):
+        key = f"{rng.randrange(workers)}-{rng.randrange(writes)}"
+        start = time.perf_counter()
+        store.get(key)
+        latencies.append(time.perf_counter() - start)
+    results.put(("read", latencies))
+
+
+def summarize(operation: str, latencies: list[float], elapsed: float) -> str:
+    """
+    Formats the latency percentiles and throughput of an operation.
+
+    Args:
+        operation (str): The name of the operation.
+        latencies (list[float]): The latency of every operation in seconds.
+        elapsed (float): The wall-clock time of the whole benchmark in seconds.
+
+    Returns:
+        str: A one-line summary.
+    """
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return (f"{operation:>5}: {len(latencies):>7} ops  p50 {p50:7.3f} ms  p95 {p95:7.3f} ms  "
+            f"p99 {p99:7.3f} ms  max {max(latencies) * 1000:7.3f} ms  ({len(latencies) / elapsed:,.0f} ops/s)")
+
+
+def main() -> None:
+    """
+    Runs the benchmark with the command-line options and prints its summary.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="number of concurrent worker processes")
+    parser.add_argument("--writes", type=int, default=200, help="datasets written by each worker")
+    parser.add_argument("--reads", type=int, default=2000, help="datasets read by each worker")
+    parser.add_argument("--traits", type=int, default=100, help="traits of each category of the datasets")
+    parser.add_argument("--path", help="database file to use (default: a temporary file)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.path or os.path.join(directory, "results.db")
+        SqliteStore(path, "datasets")
+
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        processes = [context.Process(target=run_worker, args=(path, worker, args.writes, args.reads, args.workers,
+                                                              args.traits, results))
+                     for worker in range(args.workers)]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        latencies = {"write": [], "read": []}
+        for _ in range(2 * args.workers):
+            operation, values = results.get()
+            latencies[operation] += values
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        print(f"{args.workers} workers, datasets of {3 * args.traits} traits, {elapsed:.2f} s")
+        for operation, values in latencies.items():
+            print(summarize(operation, values, elapsed))
+        print(f"database size: {os.path.getsize(path) / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
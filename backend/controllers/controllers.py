@@ -5,24 +5,85 @@ This module defines API endpoints for interacting with datasets and comparisons.
 
 It provides routes for:
 - Retrieving datasets and comparisons by their unique IDs.
-- Uploading files to generate datasets with scores and analyses.
+- Uploading files to generate datasets with scores and analyses, either waiting for the result or as
+  background jobs whose status and result are polled.
+- Uploading many files or archives of files at once, processed in parallel as a batch.
 - Saving comparisons and generating frontend-compatible links.
+- Monitoring a stream of scored predictions over sliding or tumbling time windows.
+- Exposing the metrics of the API in the Prometheus text format, when enabled.
 
 The module uses FastAPI's routing system and depends on the backend for dataset processing and storage.
 """
 
-from fastapi import APIRouter, UploadFile
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response, UploadFile
+from backend.presenters.batches import ArchiveTooLargeError, get_batch, submit_batch
+from backend.presenters import metrics
+from backend.presenters.dataset_formats import ENCODERS, JSON, negotiate_format
+from backend.presenters.monitoring import create_monitor, get_monitor, ingest_events
 from backend.presenters.presenters import (
+    DatasetJobError,
+    append_dataset,
+    describe_job,
     generate_dataset,
     get_dataset,
+    get_job,
+    get_job_result,
+    get_metrics,
+    get_store_statistics,
+    limit_traits,
     save_comparison,
+    save_comparison_reference,
     get_comparison,
+    submit_dataset,
 )
+from backend.use_cases.job_runners.job_runner import JobQueueFullError
+from backend.use_cases.memory_budgets.memory_budget import MemoryBudgetExceededError, MemoryBudgetFullError
 from pydantic import BaseModel
 import os
 
 router = APIRouter()
 
+# Rates the scores of a dataset can be based on (see `TraitStatistics.get_rates`)
+Metric = Literal["error_rate", "fpr", "fnr", "tpr", "ppv"]
+
+# Ways of choosing the traits kept in every category of a dataset (see `limit_traits`)
+TraitRanking = Literal["count", "deviation"]
+
+# Number of traits to keep in every category of a dataset, all of them if not given
+TopK = Annotated[int | None, Query(ge=1)]
+
+# Number of rows to read at a time, to stream large files with bounded memory, the whole file at once if not given
+ChunkSize = Annotated[int | None, Query(ge=1)]
+
+
+def format_dataset(dataset: str | dict, accept: str | None, top_k: int | None = None,
+                   rank_by: str = "count") -> str | dict | Response:
+    """
+    Converts a dataset to the format negotiated with the client's `Accept` header, optionally keeping only the
+    top traits of every category.
+
+    Args:
+        dataset (str | dict): The dataset, or a status string such as "Missing", which is returned as it is.
+        accept (str | None): The `Accept` request header.
+        top_k (int | None): The number of traits to keep in every category, the others being folded into one
+            "other" trait (see `limit_traits`), or None to keep them all.
+        rank_by (str): How to choose the traits kept: the most common ("count") or those whose rate deviates most
+            from that of their category ("deviation").
+
+    Returns:
+        str | dict | Response: The dataset itself for the default JSON format, and otherwise a response with the
+            dataset encoded in the negotiated format.
+    """
+    if not isinstance(dataset, dict):
+        return dataset
+    dataset = limit_traits(dataset, top_k, rank_by)
+    media_type = negotiate_format(accept)
+    if media_type == JSON:
+        return dataset
+    return Response(ENCODERS[media_type](dataset), media_type=media_type)
+
 
 class Comparison(BaseModel):
     """
@@ -34,18 +95,64 @@ class Comparison(BaseModel):
     data: str
 
 
-@router.get("/api/getDataset")
-async def get_dataset_endpoint(id: str) -> str | dict:
+class ComparisonReference(BaseModel):
+    """
+    Represents a comparison between two stored datasets, to be received via the API.
+
+    Attributes:
+        dataset1Id (str): The ID of the first dataset.
+        dataset2Id (str): The ID of the second dataset.
+        metadata (dict): Information about the comparison to return along with it.
+    """
+    dataset1Id: str
+    dataset2Id: str
+    metadata: dict = {}
+
+
+class MonitorWindow(BaseModel):
+    """
+    Represents a time window of a monitor, to be received via the API.
+
+    Attributes:
+        name (str): The name under which the window is reported.
+        size (int): The length of the window in seconds.
+        step (int | None): The number of seconds by which a sliding window advances, which must divide `size`.
+            None makes a tumbling window, which starts over every `size` seconds.
+    """
+    name: str
+    size: int
+    step: int | None = None
+
+
+class MonitorSettings(BaseModel):
+    """
+    Represents the settings of a monitor to be created via the API.
+
+    Attributes:
+        windows (list[MonitorWindow]): The time windows over which events are scored.
+    """
+    windows: list[MonitorWindow]
+
+
+@router.get("/api/getDataset", response_model=None)
+async def get_dataset_endpoint(id: str, top_k: TopK = None, rank_by: TraitRanking = "count",
+                               accept: Annotated[str | None, Header()] = None) -> str | dict | Response:
     """
     Retrieves a dataset by its unique ID.
 
     Args:
         id (str): The unique identifier for the dataset.
+        top_k (int | None): The number of traits to return in every category, the others being folded into one
+            "other" trait. All traits are returned if not given.
+        rank_by (TraitRanking): Whether to keep the most common traits ("count") or those whose rate deviates most
+            from that of their category ("deviation").
+        accept (str | None): The `Accept` request header, to return the dataset in a columnar or binary format
+            (see `dataset_formats`).
 
     Returns:
-        dict | str: The dataset information if found, or "Missing" if the ID is not in storage.
+        dict | str | Response: The dataset information if found, or "Missing" if the ID is not in storage.
     """
-    return await get_dataset(id)
+    return format_dataset(await get_dataset(id), accept, top_k, rank_by)
 
 
 @router.get("/api/getComparison")
@@ -58,26 +165,63 @@ async def get_comparison_endpoint(id: str) -> str | dict:
 
     Returns:
         dict | str: The comparison data if found, or "Missing" if the ID is not in storage.
+
+    Raises:
+        HTTPException: 400 if the comparison refers to datasets scored by different rates.
     """
-    return await get_comparison(id)
+    try:
+        return await get_comparison(id)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
 
 
-@router.post("/api/generateDataset")
-async def generate_dataset_endpoint(file: UploadFile) -> dict:
+@router.post("/api/generateDataset", response_model=None)
+async def generate_dataset_endpoint(file: UploadFile, chunk_size: ChunkSize = None,
+                                    duplicates: Literal["reuse", "alias"] = "reuse", metric: Metric = "error_rate",
+                                    top_k: TopK = None, rank_by: TraitRanking = "count",
+                                    accept: Annotated[str | None, Header()] = None) -> dict | Response:
     """
     Processes an uploaded file to generate a dataset with scores and analyses.
 
     Args:
         file (UploadFile): The uploaded file containing the dataset.
+        chunk_size (int | None): The number of rows to read at a time, to stream large files with bounded memory.
+        duplicates (str): If the same file was processed before, "reuse" to answer with the stored dataset's ID,
+            or "alias" to answer with a new ID referring to it. Either way, the file is not processed again.
+        metric (Metric): The rate the scores are based on: the share of misclassified rows (default), the false
+            positive rate, false negative rate, true positive rate or precision. The last four need binary outcomes.
+        top_k (int | None): The number of traits to return in every category, the others being folded into one
+            "other" trait. All traits are returned if not given, and are stored either way.
+        rank_by (TraitRanking): Whether to keep the most common traits ("count") or those whose rate deviates most
+            from that of their category ("deviation").
+        accept (str | None): The `Accept` request header, to return the dataset in a columnar or binary format
+            (see `dataset_formats`).
 
     Returns:
-        dict: A structured dataset representation including its ID, name, categories, scores, and analysis.
+        dict | Response: A structured dataset representation including its ID, name, categories, scores, and
+            analysis.
+
+    Raises:
+        HTTPException: 413 if processing the file needs more memory than the server allows, 429 if too many
+            datasets are already being processed or they leave too little memory to process it, 422 if the file
+            could not be processed, or 500 if the dataset was evicted from storage before it could be returned.
     """
-    return await generate_dataset(file)
+    try:
+        return format_dataset(await generate_dataset(file, chunk_size, duplicates, metric), accept, top_k, rank_by)
+    except MemoryBudgetExceededError as error:
+        raise HTTPException(status_code=413, detail=str(error))
+    except (JobQueueFullError, MemoryBudgetFullError) as error:
+        raise HTTPException(status_code=429, detail=str(error))
+    except DatasetJobError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+    except RuntimeError as error:
+        raise HTTPException(status_code=500, detail=str(error))
 
 
 @router.post("/api/generateDatasetLink")
-async def generate_dataset_link_endpoint(file: UploadFile) -> str:
+async def generate_dataset_link_endpoint(file: UploadFile, chunk_size: ChunkSize = None,
+                                         duplicates: Literal["reuse", "alias"] = "reuse",
+                                         metric: Metric = "error_rate") -> str:
     """
     Processes an uploaded file to generate a dataset and returns a frontend-compatible link.
 
@@ -85,15 +229,187 @@ async def generate_dataset_link_endpoint(file: UploadFile) -> str:
 
     Args:
         file (UploadFile): The uploaded file containing the dataset.
+        chunk_size (int | None): The number of rows to read at a time, to stream large files with bounded memory.
+        duplicates (str): If the same file was processed before, "reuse" to answer with the stored dataset's ID,
+            or "alias" to answer with a new ID referring to it. Either way, the file is not processed again.
+        metric (Metric): The rate the scores are based on: the share of misclassified rows (default), the false
+            positive rate, false negative rate, true positive rate or precision. The last four need binary outcomes.
 
     Returns:
         str: A frontend-compatible URL linking to the generated dataset.
+
+    Raises:
+        HTTPException: 413 if processing the file needs more memory than the server allows, 429 if too many
+            datasets are already being processed or they leave too little memory to process it, 422 if the file
+            could not be processed, or 500 if the dataset was evicted from storage before it could be returned.
     """
     frontend_url = os.getenv("FRONTEND_URL")
-    dataset = await generate_dataset(file)
+    try:
+        dataset = await generate_dataset(file, chunk_size, duplicates, metric)
+    except MemoryBudgetExceededError as error:
+        raise HTTPException(status_code=413, detail=str(error))
+    except (JobQueueFullError, MemoryBudgetFullError) as error:
+        raise HTTPException(status_code=429, detail=str(error))
+    except DatasetJobError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+    except RuntimeError as error:
+        raise HTTPException(status_code=500, detail=str(error))
     return f"{frontend_url}/#{dataset['id']}"
 
 
+@router.post("/api/appendDataset", response_model=None)
+async def append_dataset_endpoint(id: str, file: UploadFile, chunk_size: ChunkSize = None, top_k: TopK = None,
+                                  rank_by: TraitRanking = "count",
+                                  accept: Annotated[str | None, Header()] = None) -> str | dict | Response:
+    """
+    Adds new rows to a stored dataset and returns the updated dataset under a new ID.
+
+    Only the new rows are processed: they are merged into the stored per-trait counts and mismatch totals of
+    the dataset, from which its scores and analysis are recomputed.
+
+    Args:
+        id (str): The unique identifier of the dataset to append rows to.
+        file (UploadFile): The uploaded file with the new rows only.
+        chunk_size (int | None): The number of rows to read at a time, to stream large files with bounded memory.
+        top_k (int | None): The number of traits to return in every category, the others being folded into one
+            "other" trait. All traits are returned if not given, and are stored either way.
+        rank_by (TraitRanking): Whether to keep the most common traits ("count") or those whose rate deviates most
+            from that of their category ("deviation").
+        accept (str | None): The `Accept` request header, to return the dataset in a columnar or binary format
+            (see `dataset_formats`).
+
+    Returns:
+        dict | str | Response: The updated dataset, or "Missing" if the dataset is not in storage.
+
+    Raises:
+        HTTPException: 413 if processing the file needs more memory than the server allows, 429 if too many
+            datasets are already being processed or they leave too little memory to process it, 422 if the rows
+            could not be processed or do not have the protected classes of the dataset, or 500 if the updated
+            dataset was evicted from storage before it could be returned.
+    """
+    try:
+        return format_dataset(await append_dataset(id, file, chunk_size), accept, top_k, rank_by)
+    except MemoryBudgetExceededError as error:
+        raise HTTPException(status_code=413, detail=str(error))
+    except (JobQueueFullError, MemoryBudgetFullError) as error:
+        raise HTTPException(status_code=429, detail=str(error))
+    except DatasetJobError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+    except RuntimeError as error:
+        raise HTTPException(status_code=500, detail=str(error))
+
+
+@router.post("/api/submitDataset", status_code=202)
+async def submit_dataset_endpoint(file: UploadFile, chunk_size: ChunkSize = None,
+                                  duplicates: Literal["reuse", "alias"] = "reuse",
+                                  metric: Metric = "error_rate") -> dict:
+    """
+    Queues an uploaded file to be processed in the background.
+
+    Args:
+        file (UploadFile): The uploaded file containing the dataset.
+        chunk_size (int | None): The number of rows to read at a time, to stream large files with bounded memory.
+        duplicates (str): If the same file was processed before, "reuse" to answer with the stored dataset's ID,
+            or "alias" to answer with a new ID referring to it. Either way, the file is not processed again.
+        metric (Metric): The rate the scores are based on: the share of misclassified rows (default), the false
+            positive rate, false negative rate, true positive rate or precision. The last four need binary outcomes.
+
+    Returns:
+        dict: The job's ID and status, to poll with `/api/getJob` and `/api/getJobResult`, and the number of rows
+            read at a time as `chunkSize` if the file is streamed to fit in the memory of the server.
+
+    Raises:
+        HTTPException: 413 if processing the file needs more memory than the server allows, or 429 if too many
+            datasets are already being processed or they leave too little memory to process it.
+    """
+    try:
+        job = await submit_dataset(file, chunk_size, duplicates, metric)
+    except MemoryBudgetExceededError as error:
+        raise HTTPException(status_code=413, detail=str(error))
+    except (JobQueueFullError, MemoryBudgetFullError) as error:
+        raise HTTPException(status_code=429, detail=str(error))
+    return describe_job(job)
+
+
+@router.post("/api/submitBatch", status_code=202)
+async def submit_batch_endpoint(files: list[UploadFile], chunk_size: ChunkSize = None,
+                                duplicates: Literal["reuse", "alias"] = "reuse", metric: Metric = "error_rate") -> dict:
+    """
+    Queues many uploaded dataset files, or ZIP and TAR archives of them, to be processed in parallel.
+
+    The status of every file, with its dataset ID once it is done, is polled with `/api/getBatch`.
+
+    Args:
+        files (list[UploadFile]): The uploaded files and archives.
+        chunk_size (int | None): The number of rows to read at a time, to stream large files with bounded memory.
+        duplicates (Literal["reuse", "alias"]): How to answer files processed before, as for `/api/submitDataset`.
+        metric (Metric): The rate the scores of every file are based on, as for `/api/submitDataset`.
+
+    Returns:
+        dict: The ID of the batch and the status of every file.
+
+    Raises:
+        HTTPException: 400 if the batch holds no file or too many files, or 413 if an archive holds too many
+            entries or the archives expand to too many bytes.
+    """
+    try:
+        return await submit_batch(files, chunk_size, duplicates, metric)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    except ArchiveTooLargeError as error:
+        raise HTTPException(status_code=413, detail=str(error))
+
+
+@router.get("/api/getBatch")
+async def get_batch_endpoint(id: str) -> str | dict:
+    """
+    Retrieves the status of a batch, with the dataset ID or error of every file processed so far.
+
+    Args:
+        id (str): The unique identifier of the batch.
+
+    Returns:
+        str | dict: The status of the batch, or "Missing" if the batch is unknown.
+    """
+    return await get_batch(id)
+
+
+@router.get("/api/getJob")
+async def get_job_endpoint(id: str) -> str | dict:
+    """
+    Retrieves the status of a dataset job by its unique ID.
+
+    Args:
+        id (str): The unique identifier for the job.
+
+    Returns:
+        dict | str: The job's status (queued, running, done or failed), with the dataset ID once it is done,
+            or "Missing" if the job is unknown.
+    """
+    return await get_job(id)
+
+
+@router.get("/api/getJobResult", response_model=None)
+async def get_job_result_endpoint(id: str, top_k: TopK = None, rank_by: TraitRanking = "count",
+                                  accept: Annotated[str | None, Header()] = None) -> str | dict | Response:
+    """
+    Retrieves the dataset generated by a job.
+
+    Args:
+        id (str): The unique identifier for the job.
+        top_k (int | None): The number of traits to return in every category, the others being folded into one
+            "other" trait. All traits are returned if not given.
+        rank_by (TraitRanking): Whether to keep the most common traits ("count") or those whose rate deviates most
+            from that of their category ("deviation").
+        accept (str | None): The `Accept` request header, to return the dataset in a columnar or binary format
+            (see `dataset_formats`).
+
+    Returns:
+        dict | str | Response: The dataset if the job is done, or "Pending", "Failed" or "Missing".
+    """
+    return format_dataset(await get_job_result(id), accept, top_k, rank_by)
+
+
 @router.post("/api/saveComparison")
 async def save_comparison_endpoint(data: Comparison) -> str:
     """
@@ -106,3 +422,112 @@ async def save_comparison_endpoint(data: Comparison) -> str:
         str: The unique identifier for the saved comparison.
     """
     return await save_comparison(data.data)
+
+
+@router.post("/api/saveComparisonReference")
+async def save_comparison_reference_endpoint(data: ComparisonReference) -> str:
+    """
+    Saves a comparison between two stored datasets by reference and generates a unique ID for it.
+
+    The comparison is read with `/api/getComparison`, like comparisons saved with `/api/saveComparison`.
+
+    Args:
+        data (ComparisonReference): The IDs of the datasets and the metadata of the comparison.
+
+    Returns:
+        str: The unique identifier for the saved comparison, or "Missing" if one of the datasets is not stored.
+
+    Raises:
+        HTTPException: 400 if the datasets are scored by different rates.
+    """
+    try:
+        return await save_comparison_reference(data.dataset1Id, data.dataset2Id, data.metadata)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+
+@router.get("/api/getStoreStatistics")
+async def get_store_statistics_endpoint() -> dict:
+    """
+    Retrieves the hit, miss and eviction counters of the dataset and comparison stores.
+
+    Returns:
+        dict: The usage counters of each store.
+    """
+    return await get_store_statistics()
+
+
+@router.get("/metrics")
+async def get_metrics_endpoint() -> Response:
+    """
+    Retrieves the metrics of this worker process in the Prometheus text format: the duration of every stage of
+    processing datasets, their sizes, the latency and status of requests, the event loop's lag, the usage of
+    the result stores and the number of pending dataset jobs.
+
+    Returns:
+        Response: The metrics.
+
+    Raises:
+        HTTPException: 404 if metrics are not enabled (see METRICS_ENABLED).
+    """
+    if not metrics.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are not enabled.")
+    return Response(await get_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@router.post("/api/createMonitor")
+async def create_monitor_endpoint(settings: MonitorSettings) -> str:
+    """
+    Creates a monitor, which scores a stream of predictions over the given time windows.
+
+    Args:
+        settings (MonitorSettings): The windows of the monitor.
+
+    Returns:
+        str: The unique identifier of the monitor.
+
+    Raises:
+        HTTPException: 400 if no window is given or a window is invalid.
+    """
+    try:
+        return await create_monitor({window.name: (window.size, window.step) for window in settings.windows})
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+
+@router.post("/api/ingestEvents")
+async def ingest_events_endpoint(id: str, events: list[dict]) -> str | dict:
+    """
+    Adds a batch of scored predictions to a monitor.
+
+    Every event holds a "timestamp" (seconds since the epoch or an ISO 8601 date and time), the "marked" and
+    "actual" outcomes, and the protected attributes of the person it concerns.
+
+    Args:
+        id (str): The unique identifier of the monitor.
+        events (list[dict]): The events to add.
+
+    Returns:
+        str | dict: The number of events ingested and dropped, or "Missing" if there is no such monitor.
+
+    Raises:
+        HTTPException: 400 if the events lack a required field or hold invalid values.
+    """
+    try:
+        return await ingest_events(id, events)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+
+@router.get("/api/getMonitor")
+async def get_monitor_endpoint(id: str) -> str | dict:
+    """
+    Retrieves the scores of every window of a monitor.
+
+    Args:
+        id (str): The unique identifier of the monitor.
+
+    Returns:
+        str | dict: The scored windows of the monitor, or "Missing" if there is no such monitor.
+    """
+    return await get_monitor(id)
@@ -0,0 +1,115 @@
+"""
+http_cache_middleware.py
+
+This module defines the `HttpCacheMiddleware` class, which serves stored datasets and comparisons
+from their pre-encoded HTTP responses.
+
+Stored results never change, so their responses:
+- Are encoded and compressed with brotli and gzip once, when the result is stored (or first read by a
+  worker process that did not store it, or first read in another format), so a read is a lookup plus
+  a bytes write. Datasets are encoded in the format negotiated with the `Accept` header (see
+  `dataset_formats`); comparisons are always JSON. Datasets limited to their top traits (`top_k` and
+  `rank_by`) are encoded and cached separately from the full datasets.
+- Carry a strong ETag, so clients revalidating with `If-None-Match` are answered with 304 Not Modified.
+- Are marked as immutable, so browsers and proxies do not revalidate them at all.
+
+Requests for results that are not stored are passed on to the API unchanged.
+"""
+from urllib.parse import parse_qs
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.presenters.dataset_formats import JSON, negotiate_format
+from backend.presenters.presenters import TRAIT_RANKINGS, encode_result, get_encoded_result
+
+
+class HttpCacheMiddleware:
+    """
+    An ASGI middleware answering reads of stored results with cached, compressed responses.
+
+    Attributes:
+        app (ASGIApp): The application to pass other requests on to.
+    """
+
+    app: ASGIApp
+
+    # Kind of result served by each cached route
+    CACHED_PATHS = {
+        "/api/getDataset": "dataset",
+        "/api/getComparison": "comparison",
+    }
+
+    CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Initializes the middleware around an application.
+
+        Args:
+            app (ASGIApp): The application to pass other requests on to.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Answers a read of a stored result from its encoded response, or passes the request on.
+
+        Args:
+            scope (Scope): The connection scope.
+            receive (Receive): The channel receiving request messages.
+            send (Send): The channel sending response messages.
+        """
+        kind = self.CACHED_PATHS.get(scope.get("path")) if scope["type"] == "http" else None
+        query = parse_qs(scope["query_string"].decode("latin-1")) if kind is not None else {}
+        ids = query.get("id")
+        view = self.get_trait_view(query) if kind == "dataset" else (None, "count")
+        if not ids or view is None or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        media_type = negotiate_format(headers.get("accept")) if kind == "dataset" else JSON
+        encoded = get_encoded_result(kind, ids[0], media_type, *view)
+        if encoded is None:
+            encoded = await run_in_threadpool(encode_result, kind, ids[0], None, media_type, *view)
+        if encoded is None:
+            await self.app(scope, receive, send)
+            return
+
+        response_headers = {"ETag": encoded.etag, "Cache-Control": self.CACHE_CONTROL,
+                            "Vary": "Accept, Accept-Encoding"}
+        if encoded.matches(headers.get("if-none-match")):
+            response = Response(status_code=304, headers=response_headers)
+        else:
+            coding, body = encoded.select_encoding(headers.get("accept-encoding"))
+            if coding is not None:
+                response_headers["Content-Encoding"] = coding
+            response = Response(body if scope["method"] == "GET" else b"", headers=response_headers,
+                                media_type=encoded.media_type)
+            if scope["method"] == "HEAD":
+                response.headers["Content-Length"] = str(len(body))
+        await response(scope, receive, send)
+
+    @staticmethod
+    def get_trait_view(query: dict[str, list[str]]) -> tuple[int | None, str] | None:
+        """
+        Reads which traits of a dataset are requested from the query parameters.
+
+        Args:
+            query (dict[str, list[str]]): The query parameters of the request.
+
+        Returns:
+            tuple[int | None, str] | None: The number of traits to keep in every category (None for all of them)
+                and how to choose them, or None if the parameters are invalid, for the API to reject them.
+        """
+        top_k, rank_by = query.get("top_k", [None])[0], query.get("rank_by", ["count"])[0]
+        if rank_by not in TRAIT_RANKINGS:
+            return None
+        if top_k is None:
+            return None, rank_by
+        if not top_k.isdigit() or int(top_k) < 1:
+            return None
+        return int(top_k), rank_by
@@ -0,0 +1,78 @@
+"""
+timing_middleware.py
+
+This module defines the `TimingMiddleware` class, which times every request, reports the duration of
+its stages in a `Server-Timing` header and records its latency and status in the metrics.
+
+It is only installed when METRICS_ENABLED is set (see `metrics`), so requests are not instrumented
+otherwise.
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.controllers.controllers import router
+from backend.entities.stage_timer import StageTimer
+from backend.presenters import metrics
+
+
+class TimingMiddleware:
+    """
+    An ASGI middleware timing requests and the stages they go through.
+
+    Attributes:
+        app (ASGIApp): The application handling the requests.
+        paths (set): The routes of the API, the only paths recorded in the metrics, so that requests for
+            unknown paths do not create a series each.
+    """
+
+    app: ASGIApp
+    paths: set
+
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Initializes the middleware around an application.
+
+        Args:
+            app (ASGIApp): The application handling the requests.
+        """
+        self.app = app
+        self.paths = {route.path for route in router.routes}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Handles a request with a new timer as the current one, and adds its stages to the response headers.
+
+        The "total" stage lasts until the response headers are sent, which for the API is once the response
+        is complete.
+
+        Args:
+            scope (Scope): The connection scope.
+            receive (Receive): The channel receiving request messages.
+            send (Send): The channel sending response messages.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics.watch_event_loop()
+        start = time.perf_counter()
+        timer = StageTimer()
+        status = 500
+
+        async def send_timed(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timer.add("total", time.perf_counter() - start)
+                message["headers"] = [*message.get("headers", ()),
+                                      (b"server-timing", timer.get_server_timing().encode("latin-1"))]
+            await send(message)
+
+        token = metrics.request_timer.set(timer)
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            metrics.request_timer.reset(token)
+            path = scope["path"] if scope["path"] in self.paths else "other"
+            metrics.record_request(scope["method"], path, status, time.perf_counter() - start)
@@ -0,0 +1,114 @@
+"""
+arrow_file.py
+
+This module defines the ArrowFile class, which is a subclass of DatasetFile.
+It represents a dataset file in the Apache Arrow IPC format (file or stream). Files given by
+path are memory-mapped, so the outcome and protected class columns are read without copying
+and the pages of other columns are never touched.
+
+The memory needed to load a file is estimated from the length of its record batches alone (see
+`estimate_memory`).
+"""
+from typing import BinaryIO
+
+import pandas as pd
+import pyarrow as pa
+from backend.entities.dataset_files.dataset_file import DatasetFile
+
+
+class ArrowFile(DatasetFile):
+    """
+    Represents a dataset file specifically for Arrow IPC format.
+
+    Inherits from the DatasetFile base class and implements the `load_file`
+    method for loading Arrow data into a DataFrame.
+
+    Attributes:
+        df (pd.DataFrame): The loaded dataset from the Arrow file.
+        categories (set): A set of categories present in the dataset.
+    """
+
+    df: pd.DataFrame
+    categories: set
+
+    # Bytes an Arrow IPC file (as opposed to stream) starts with
+    FILE_MAGIC = b"ARROW1"
+
+    # Bytes of memory taken by every value converted to pandas, calibrated on generated datasets (see
+    # `benchmarks.dataset_generator`)
+    CONVERTED_VALUE_BYTES = 24
+
+    @classmethod
+    def estimate_memory(cls, file_address: str, chunk_size: int | None = None) -> int:
+        """
+        Estimates the peak memory needed to load and process an Arrow IPC file from the number of rows of its
+        record batches and its used columns. The file is memory-mapped, so the batches are not copied to be
+        counted. When the file is streamed, its largest record batch is assumed to be converted at once.
+
+        Args:
+            file_address (str): The path of the Arrow IPC file.
+            chunk_size (int | None): The number of rows to read at a time, or None to read the whole file at once.
+
+        Returns:
+            int: The estimated number of bytes.
+        """
+        with pa.memory_map(file_address) as source:
+            if source.read(len(cls.FILE_MAGIC)) == cls.FILE_MAGIC:
+                source.seek(0)
+                reader = pa.ipc.open_file(source)
+                batch_rows = [reader.get_batch(i).num_rows for i in range(reader.num_record_batches)]
+            else:
+                source.seek(0)
+                reader = pa.ipc.open_stream(source)
+                batch_rows = [batch.num_rows for batch in reader]
+        columns = sum(cls.is_used_column(name) for name in reader.schema.names)
+        rows = sum(batch_rows) if chunk_size is None else max(batch_rows, default=0)
+        return rows * columns * cls.CONVERTED_VALUE_BYTES
+
+    def load_file(self, file_address: str | BinaryIO) -> None:
+        """
+        Loads the dataset from an Arrow IPC file into a pandas DataFrame, or streams it record batch by
+        record batch if a chunk size was given.
+
+        Args:
+            file_address (BinaryIO): The file object or file-like object pointing to the Arrow file.
+
+        Returns:
+            None
+        """
+        source = pa.memory_map(file_address) if isinstance(file_address, str) else file_address
+        position = source.tell()
+        is_file_format = source.read(len(self.FILE_MAGIC)) == self.FILE_MAGIC
+        source.seek(position)
+
+        reader = pa.ipc.open_file(source) if is_file_format else pa.ipc.open_stream(source)
+        if self.chunk_size is None:
+            self.df = self.to_dataframe(reader.read_all())
+            return
+
+        header = self.to_dataframe(reader.schema.empty_table())
+        if is_file_format:
+            self.load_chunks((self.to_dataframe(pa.Table.from_batches([reader.get_batch(i)]))
+                              for i in range(reader.num_record_batches)), header)
+        else:
+            self.load_chunks((self.to_dataframe(pa.Table.from_batches([batch])) for batch in reader), header)
+
+    def to_dataframe(self, table: pa.Table) -> pd.DataFrame:
+        """
+        Converts the used columns of an Arrow table to a pandas DataFrame.
+
+        Protected classes holding text are dictionary-encoded into categoricals; other columns are
+        converted without copying where their layout allows it.
+
+        Args:
+            table (pa.Table): The table to convert.
+
+        Returns:
+            pd.DataFrame: The used columns of the table.
+        """
+        table = table.select([name for name in table.column_names if self.is_used_column(name)])
+        for i, field in enumerate(table.schema):
+            if field.name not in self.OUTCOME_COLUMNS and (pa.types.is_string(field.type)
+                                                           or pa.types.is_large_string(field.type)):
+                table = table.set_column(i, field.name, table.column(i).dictionary_encode())
+        return table.to_pandas(split_blocks=True)
@@ -3,8 +3,15 @@ csv_file.py
 
 This module defines the CSVFile class, which is a subclass of DatasetFile.
 It represents a dataset file specifically for CSV files and implements methods
-for loading and processing CSV data.
+for loading and processing CSV data, either all at once or as a stream of fixed-size chunks.
+
+Only the outcome and protected class columns are parsed, with compact dtypes, and whole files are
+parsed by the multi-threaded pyarrow parser.
+
+The memory needed to load a file is estimated by parsing its first bytes only (see `estimate_memory`).
 """
+import io
+import os
 from typing import BinaryIO
 
 import pandas as pd
@@ -21,14 +28,27 @@ class CSVFile(DatasetFile):
     Attributes:
         df (pd.DataFrame): The loaded dataset from the CSV file.
         categories (set): A set of categories present in the dataset.
+        chunk_size (int | None): The number of rows to read at a time, or None to read the whole file at once.
     """
 
     df: pd.DataFrame
     categories: set
+    chunk_size: int | None
+
+    # Number of rows parsed up front to choose the columns and dtypes to load
+    SAMPLE_ROWS = 1000
+
+    # Number of bytes parsed from the start of a file to estimate the memory needed to load it
+    ESTIMATE_SAMPLE_BYTES = 64 * 1024
+
+    # Bytes of memory taken at least by every parsed value while a file is loaded, calibrated on generated
+    # datasets (see `benchmarks.dataset_generator`)
+    PARSED_VALUE_BYTES = 24
 
     def load_file(self, file_address: str | BinaryIO) -> None:
         """
-        Loads the dataset from a CSV file into a pandas DataFrame.
+        Loads the dataset from a CSV file into a pandas DataFrame, or streams it in chunks if a chunk
+        size was given.
 
         Args:
             file_address (BinaryIO): The file object or file-like object pointing to the CSV file.
@@ -36,4 +56,78 @@ class CSVFile(DatasetFile):
         Returns:
             None
         """
-        self.df = pd.read_csv(file_address)
+        options = self.get_read_options(file_address)
+        if self.chunk_size is None:
+            self.df = pd.read_csv(file_address, engine="pyarrow", **options)
+            for column in self.OUTCOME_COLUMNS:
+                if column in self.df.columns and pd.api.types.is_integer_dtype(self.df[column]):
+                    self.df[column] = pd.to_numeric(self.df[column], downcast="integer")
+        else:
+            # The pyarrow parser cannot read in chunks
+            header = pd.DataFrame(columns=options["usecols"]).astype(options["dtype"])
+            with pd.read_csv(file_address, chunksize=self.chunk_size, **options) as chunks:
+                self.load_chunks(chunks, header)
+
+    @classmethod
+    def estimate_memory(cls, file_address: str, chunk_size: int | None = None) -> int:
+        """
+        Estimates the peak memory needed to load and process a CSV file from its size and its first
+        `ESTIMATE_SAMPLE_BYTES` bytes.
+
+        The number of rows is extrapolated from the length of the sampled rows. Every row is assumed to take
+        as much memory as a parsed sampled row with its text held as Python strings, which is about what the
+        parser holds before the text is encoded, but at least `PARSED_VALUE_BYTES` per used column. When the
+        file is streamed, only one chunk of rows is held at a time.
+
+        Args:
+            file_address (str): The path of the CSV file.
+            chunk_size (int | None): The number of rows to read at a time, or None to read the whole file at once.
+
+        Returns:
+            int: The estimated number of bytes.
+        """
+        size = os.path.getsize(file_address)
+        with open(file_address, "rb") as file:
+            sample = file.read(cls.ESTIMATE_SAMPLE_BYTES)
+        if len(sample) < size:
+            # Only parse whole lines
+            sample = sample[:sample.rfind(b"\n") + 1]
+
+        rows = pd.read_csv(io.BytesIO(sample))
+        rows = rows[[column for column in rows.columns if cls.is_used_column(column)]]
+        if rows.empty:
+            return size
+        row_bytes = max(rows.memory_usage(deep=True, index=False).sum() / len(rows),
+                        len(rows.columns) * cls.PARSED_VALUE_BYTES)
+        row_count = len(rows) * size / len(sample)
+        if chunk_size is not None:
+            row_count = min(row_count, chunk_size)
+        return int(row_count * row_bytes)
+
+    def get_read_options(self, file_address: str | BinaryIO) -> dict:
+        """
+        Samples the start of the CSV file to decide which columns to parse and with which dtypes.
+
+        Only the outcome and protected class columns are kept, and protected classes holding text are
+        stored with the pandas `category` dtype. Outcome columns are left to the parser, since a later row
+        may hold a blank or wider value than the sampled ones, and are downcast once the whole file is
+        parsed (see `load_file`). A file object is rewound to where it started after sampling.
+
+        Args:
+            file_address (BinaryIO): The file object or file-like object pointing to the CSV file.
+
+        Returns:
+            dict: The `usecols` and `dtype` options to pass to `pd.read_csv`.
+        """
+        position = None if isinstance(file_address, str) else file_address.tell()
+        sample = pd.read_csv(file_address, nrows=self.SAMPLE_ROWS)
+        if position is not None:
+            file_address.seek(position)
+
+        columns = [column for column in sample.columns if self.is_used_column(column)]
+        dtypes = {}
+        for column in columns:
+            if column not in self.OUTCOME_COLUMNS and pd.api.types.is_object_dtype(sample[column]):
+                dtypes[column] = "category"
+
+        return {"usecols": columns, "dtype": dtypes}
@@ -4,11 +4,20 @@ dataset_file.py
 This module defines the DatasetFile class, which represents a dataset file and provides
 methods for analyzing its content. The class supports extracting categories, calculating
 trait counts, and fetching scores based on pre-defined categories and attributes.
+
+Non-numerical categories are kept as integer codes plus a dictionary of their traits (the pandas
+`category` dtype), and the traits and trait counts of each category are computed once and cached.
+
+Datasets can also be loaded in chunks, in which case only per-trait statistics are kept and memory
+stays bounded by the number of distinct traits rather than the number of rows.
 """
-from typing import BinaryIO
+from typing import BinaryIO, Iterable
 
+import numpy as np
 import pandas as pd
+from backend.entities.numeric_bins import NumericBins
 from backend.entities.protected_classes import PROTECTED_CLASSES
+from backend.entities.trait_statistics import TraitStatistics, get_outcome_cells
 
 
 class DatasetFile:
@@ -17,12 +26,22 @@ class DatasetFile:
     categories, calculating trait counts, and fetching scores.
 
     Attributes:
-        df (pd.DataFrame): The loaded dataset.
+        df (pd.DataFrame): The loaded dataset. When loaded in chunks, this only holds the header (no rows).
         categories (set): A set of categories present in the dataset.
         score (float): The overall score for the dataset.
         category_scores (dict[str, float]): Scores associated with each category.
         category_fprs (dict[str, dict[str, float]]): False positive rates for each category, calculated using
             `obtain_fpr_map`.
+        category_statistics (dict[str, TraitStatistics]): Cached per-trait counts and mismatch totals for each
+            category, computed at most once until `invalidate_statistics` is called.
+        numeric_bins (dict[str, NumericBins]): Cached ranges that numerical categories are grouped into.
+        value_statistics (dict[str, TraitStatistics]): Per-value statistics accumulated by `load_chunks`, with
+            one trait per distinct value (numerical categories are grouped into ranges only when processed).
+        value_resolutions (dict[str, float]): The width of the ranges that the per-value statistics of numerical
+            categories were coarsened into after exceeding `NUMERIC_VALUE_LIMIT` distinct values.
+        category_traits (dict[str, set]): Cached unique traits of each category.
+        category_trait_counts (dict[str, dict]): Cached trait counts of each category.
+        chunk_size (int | None): The number of rows to load at a time, or None to load the whole file at once.
         is_processed (bool): Indicates whether the dataset has been processed.
     """
 
@@ -31,9 +50,22 @@ class DatasetFile:
     score: float
     category_scores: dict[str, float]
     category_fprs: dict[str, dict[str, float]]
+    category_statistics: dict[str, TraitStatistics]
+    numeric_bins: dict[str, NumericBins]
+    value_statistics: dict[str, TraitStatistics]
+    value_resolutions: dict[str, float]
+    category_traits: dict[str, set]
+    category_trait_counts: dict[str, dict]
+    chunk_size: int | None
     is_processed: bool
 
-    def __init__(self, file_address: str | BinaryIO) -> None:
+    # Number of distinct values a numerical category loaded in chunks can have before it is coarsened
+    NUMERIC_VALUE_LIMIT = 10_000
+
+    # Columns holding the model's prediction and the true outcome of every row
+    OUTCOME_COLUMNS = ("marked", "actual")
+
+    def __init__(self, file_address: str | BinaryIO, chunk_size: int | None = None) -> None:
         """
         Initializes a DatasetFile instance by loading a file and extracting categories.
 
@@ -42,9 +74,21 @@ class DatasetFile:
 
         Args:
             file_address (BinaryIO): The file object or file-like object to load.
+            chunk_size (int | None): The number of rows to load at a time. When given, subclasses stream the
+                file through `load_chunks` and only per-trait statistics are kept, so memory does not grow
+                with the file size.
         """
+        self.chunk_size = chunk_size
+        self.category_statistics = {}
+        self.numeric_bins = {}
+        self.value_statistics = {}
+        self.value_resolutions = {}
+        self.category_traits = {}
+        self.category_trait_counts = {}
         self.load_file(file_address)
         self.categories = self.get_present_categories()
+        if chunk_size is None:
+            self.encode_categories()
         self.score = 0
         self.category_scores = {category: 0 for category in self.categories}
         self.is_processed = False
@@ -61,6 +105,141 @@ class DatasetFile:
         """
         raise NotImplementedError
 
+    @classmethod
+    def estimate_memory(cls, file_address: str, chunk_size: int | None = None) -> int:
+        """
+        Estimates the peak memory needed to load and process a file, without loading it. This method must be
+        implemented by subclasses.
+
+        Args:
+            file_address (str): The path of the file.
+            chunk_size (int | None): The number of rows to load at a time, or None to load the whole file at once.
+
+        Returns:
+            int: The estimated number of bytes.
+
+        Raises:
+            NotImplementedError: This method should be implemented by subclasses.
+        """
+        raise NotImplementedError
+
+    def encode_categories(self) -> None:
+        """
+        Stores every non-numerical category as integer codes plus a dictionary of its traits (the pandas
+        `category` dtype), unless the loader already did.
+        """
+        for category in self.categories:
+            column = self.df[category]
+            if not self.is_numeric_category(category) and not isinstance(column.dtype, pd.CategoricalDtype):
+                self.df[category] = column.astype("category")
+
+    def load_chunks(self, chunks: Iterable[pd.DataFrame], header: pd.DataFrame) -> None:
+        """
+        Loads the dataset from consecutive chunks of rows, keeping only per-value statistics.
+
+        Each chunk is folded into the row count and mismatch total of every distinct value of every
+        category and then discarded, so the full dataset is never held in memory. `df` is set to the
+        (empty) header of the first chunk, or to `header` if the file has no rows.
+
+        If a numerical category exceeds `NUMERIC_VALUE_LIMIT` distinct values, its statistics are coarsened
+        into at most that many ranges of equal width (see `TraitStatistics.coarsen`), into which its later
+        values are grouped as they are read. The statistics, and the bins computed from them, do not depend
+        on how the file is split into chunks.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): The consecutive chunks of rows of the dataset.
+            header (pd.DataFrame): The columns of the dataset, without rows.
+        """
+        self.df = header
+        categories = self.get_present_categories()
+        numeric_categories = {category for category in categories if self.is_numeric_category(category)}
+        for i, chunk in enumerate(chunks):
+            if i == 0:
+                self.df = chunk.iloc[:0]
+                categories = self.get_present_categories()
+                numeric_categories = {category for category in categories if self.is_numeric_category(category)}
+
+            mismatches = np.abs(chunk["marked"].to_numpy() - chunk["actual"].to_numpy())
+            cells = get_outcome_cells(chunk["marked"].to_numpy(), chunk["actual"].to_numpy())
+            for category in categories:
+                column = chunk[category]
+                if category in numeric_categories:
+                    column = column.to_numpy(dtype=float)
+                    resolution = self.get_value_resolution(category)
+                    if resolution:
+                        column = np.floor(column / resolution) * resolution
+
+                codes, uniques = pd.factorize(column)
+                statistics = TraitStatistics.from_codes(codes, uniques.tolist(), mismatches, cells)
+                if category in self.value_statistics:
+                    statistics = self.value_statistics[category].merge(statistics)
+                self.value_statistics[category] = statistics
+
+                if category in numeric_categories and len(statistics.traits) > self.NUMERIC_VALUE_LIMIT:
+                    self.coarsen_value_statistics(category)
+
+    def coarsen_value_statistics(self, category: str) -> None:
+        """
+        Merges the per-value statistics of a numerical category into at most `NUMERIC_VALUE_LIMIT` ranges of
+        equal width.
+
+        Args:
+            category (str): The numerical category to coarsen.
+        """
+        self.value_statistics[category], self.value_resolutions[category] = self.value_statistics[category].coarsen(
+            self.NUMERIC_VALUE_LIMIT, self.get_value_resolution(category))
+
+    def get_value_resolution(self, category: str) -> float:
+        """
+        Retrieves the width of the ranges the per-value statistics of a numerical category were coarsened into.
+
+        Args:
+            category (str): The category for which to retrieve the width.
+
+        Returns:
+            float: The width of the ranges, each represented by its lower bound, or 0 if every value is kept.
+        """
+        return self.value_resolutions.get(category, 0.0)
+
+    def get_value_statistics(self, category: str) -> TraitStatistics | None:
+        """
+        Retrieves the per-value statistics of a category accumulated by `load_chunks`.
+
+        Args:
+            category (str): The category for which to retrieve the statistics.
+
+        Returns:
+            TraitStatistics | None: The per-value statistics, or None if the dataset was not loaded in chunks.
+        """
+        return self.value_statistics.get(category)
+
+    def is_numeric_category(self, category: str) -> bool:
+        """
+        Determines whether a category holds numbers (other than booleans) and is grouped into ranges.
+
+        Args:
+            category (str): The category to check.
+
+        Returns:
+            bool: True if the category is numerical, False otherwise.
+        """
+        column = self.df[category]
+        return pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column)
+
+    @classmethod
+    def is_used_column(cls, column: str) -> bool:
+        """
+        Determines whether a column is used in the analysis, i.e. whether it is an outcome column or a
+        protected class. Other columns (such as model features) can be skipped when loading.
+
+        Args:
+            column (str): The name of the column.
+
+        Returns:
+            bool: True if the column is used, False otherwise.
+        """
+        return column in cls.OUTCOME_COLUMNS or column.lower() in PROTECTED_CLASSES
+
     def get_present_categories(self) -> set:
         """
         Identifies the categories present in the dataset based on the column names.
@@ -77,34 +256,126 @@ class DatasetFile:
                 cats_exist.add(i)
         return cats_exist
 
+    def get_category_statistics(self, category: str) -> TraitStatistics | None:
+        """
+        Retrieves the cached per-trait statistics of a category.
+
+        Args:
+            category (str): The category for which to retrieve the statistics.
+
+        Returns:
+            TraitStatistics | None: The cached statistics, or None if they have not been computed yet.
+        """
+        return self.category_statistics.get(category)
+
+    def set_category_statistics(self, category: str, statistics: TraitStatistics) -> None:
+        """
+        Caches the per-trait statistics of a category.
+
+        Args:
+            category (str): The category the statistics belong to.
+            statistics (TraitStatistics): The per-trait statistics of the category.
+        """
+        self.category_statistics[category] = statistics
+        self.category_traits.pop(category, None)
+        self.category_trait_counts.pop(category, None)
+
+    def get_numeric_bins(self, category: str) -> NumericBins | None:
+        """
+        Retrieves the cached ranges of a numerical category.
+
+        Args:
+            category (str): The numerical category for which to retrieve the ranges.
+
+        Returns:
+            NumericBins | None: The cached ranges, or None if they have not been computed yet.
+        """
+        return self.numeric_bins.get(category)
+
+    def set_numeric_bins(self, category: str, bins: NumericBins) -> None:
+        """
+        Caches the ranges of a numerical category.
+
+        Args:
+            category (str): The numerical category the ranges belong to.
+            bins (NumericBins): The ranges the category is grouped into.
+        """
+        self.numeric_bins[category] = bins
+
+    def invalidate_statistics(self) -> None:
+        """
+        Discards the cached statistics and every result derived from them.
+
+        This must be called whenever the underlying data changes, so that the next processing
+        recomputes the statistics instead of reusing stale ones. Per-value statistics accumulated by
+        `load_chunks` are the loaded data itself and are kept.
+        """
+        self.category_statistics = {}
+        self.numeric_bins = {}
+        self.category_traits = {}
+        self.category_trait_counts = {}
+        self.category_fprs = {}
+        self.score = 0
+        self.category_scores = {category: 0 for category in self.categories}
+        self.is_processed = False
+
     def get_category_traits(self, category: str) -> set:
         """
         Retrieves the unique traits for a specific category.
 
+        Once the category has been processed, the traits are those of its statistics (for numerical
+        categories, the ranges they are grouped into). The result is cached.
+
         Args:
             category (str): The category for which to retrieve traits.
 
         Returns:
             set: A set of unique traits in the category.
         """
-        return set(self.df[category])
+        if category not in self.category_traits:
+            self.category_traits[category] = set(self.get_category_trait_counts(category))
+        return self.category_traits[category]
 
     def get_category_trait_counts(self, category: str) -> dict:
         """
         Counts the occurrences of each trait in a given category.
 
+        The counts are taken from the category's statistics when available, and otherwise computed in a
+        single pass over the category's codes. The result is cached.
+
         Args:
             category (str): The category for which to count traits.
 
         Returns:
             dict: A dictionary with traits as keys and their counts as values.
         """
-        result = {}
-        traits = set(self.df[category])
-        for trait in traits:
-            count = self.df[self.df[category] == trait].shape[0]
-            result[trait] = count
-        return result
+        if category not in self.category_trait_counts:
+            statistics = self.category_statistics.get(category, self.value_statistics.get(category))
+            if statistics is not None:
+                self.category_trait_counts[category] = statistics.get_count_map()
+            else:
+                self.category_trait_counts[category] = self.count_category_traits(category)
+        return self.category_trait_counts[category]
+
+    def count_category_traits(self, category: str) -> dict:
+        """
+        Counts the occurrences of each trait in the rows of a given category with one bincount.
+
+        Args:
+            category (str): The category for which to count traits.
+
+        Returns:
+            dict: A dictionary with traits as keys and their counts as values.
+        """
+        column = self.df[category]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes, traits = column.cat.codes.to_numpy(), column.cat.categories.tolist()
+        else:
+            codes, uniques = pd.factorize(column)
+            traits = uniques.tolist()
+
+        counts = np.bincount(codes[codes >= 0], minlength=len(traits))
+        return {trait: count for trait, count in zip(traits, counts.tolist()) if count}
 
     def get_category_trait_fprs(self, category: str) -> dict:
         """
@@ -0,0 +1,93 @@
+"""
+dataset_file_factory.py
+
+This module provides the `create_dataset_file` function, which picks the `DatasetFile`
+implementation matching an uploaded file. The format is recognised from the file's leading
+magic bytes, falling back to its extension, and CSV is assumed otherwise. The
+`estimate_dataset_memory` function estimates how much memory loading a file will take, before it is loaded.
+"""
+import os
+from typing import BinaryIO
+
+from backend.entities.dataset_files.arrow_file import ArrowFile
+from backend.entities.dataset_files.csv_file import CSVFile
+from backend.entities.dataset_files.dataset_file import DatasetFile
+from backend.entities.dataset_files.parquet_file import ParquetFile
+
+# Leading bytes of each binary format
+MAGIC_BYTES = {
+    b"PAR1": ParquetFile,
+    b"ARROW1": ArrowFile,
+    b"\xff\xff\xff\xff": ArrowFile,  # Arrow IPC stream continuation marker
+}
+
+EXTENSIONS = {
+    ".parquet": ParquetFile,
+    ".pq": ParquetFile,
+    ".arrow": ArrowFile,
+    ".arrows": ArrowFile,
+    ".feather": ArrowFile,
+    ".ipc": ArrowFile,
+    ".csv": CSVFile,
+}
+
+
+def get_dataset_file_class(file_address: str | BinaryIO, filename: str | None = None) -> type[DatasetFile]:
+    """
+    Determines which `DatasetFile` implementation can load a file.
+
+    Args:
+        file_address (BinaryIO): The file object or file-like object to inspect. A file object is
+            rewound to where it started.
+        filename (str | None): The original name of the file, used when the magic bytes are not recognised.
+
+    Returns:
+        type[DatasetFile]: The matching `DatasetFile` subclass, `CSVFile` if the format is not recognised.
+    """
+    if isinstance(file_address, str):
+        with open(file_address, "rb") as file:
+            header = file.read(8)
+        filename = filename or file_address
+    else:
+        position = file_address.tell()
+        header = file_address.read(8)
+        file_address.seek(position)
+
+    for magic, file_class in MAGIC_BYTES.items():
+        if header.startswith(magic):
+            return file_class
+
+    extension = os.path.splitext(filename or "")[1].lower()
+    return EXTENSIONS.get(extension, CSVFile)
+
+
+def create_dataset_file(file_address: str | BinaryIO, filename: str | None = None,
+                        chunk_size: int | None = None) -> DatasetFile:
+    """
+    Loads a file with the `DatasetFile` implementation matching its format.
+
+    Args:
+        file_address (BinaryIO): The file object or file-like object to load.
+        filename (str | None): The original name of the file, used when the magic bytes are not recognised.
+        chunk_size (int | None): The number of rows to load at a time, to stream large files with bounded memory.
+
+    Returns:
+        DatasetFile: The loaded dataset.
+    """
+    return get_dataset_file_class(file_address, filename)(file_address, chunk_size)
+
+
+def estimate_dataset_memory(file_address: str, filename: str | None = None, chunk_size: int | None = None) -> int:
+    """
+    Estimates the peak memory needed to load and process a file with the `DatasetFile` implementation matching
+    its format, without loading it.
+
+    Args:
+        file_address (str): The path of the file.
+        filename (str | None): The original name of the file, used when the magic bytes are not recognised.
+        chunk_size (int | None): The number of rows to load at a time, or None to load the whole file at once.
+
+    Returns:
+        int: The estimated number of bytes.
+    """
+    return get_dataset_file_class(file_address, filename).estimate_memory(file_address, chunk_size)
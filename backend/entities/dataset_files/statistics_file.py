@@ -0,0 +1,52 @@
+"""
+statistics_file.py
+
+This module defines the StatisticsFile class, a subclass of DatasetFile restored from stored
+per-value statistics instead of rows. It lets a dataset be scored again after the statistics of
+new rows have been merged into those of its earlier rows, without reading the earlier rows.
+"""
+import pandas as pd
+from backend.entities.dataset_files.dataset_file import DatasetFile
+from backend.entities.trait_statistics import TraitStatistics
+
+
+class StatisticsFile(DatasetFile):
+    """
+    A dataset made only of the per-value statistics of its categories, as if it had been loaded in chunks.
+
+    Numerical categories are binned from their per-value counts. Those with more than `NUMERIC_VALUE_LIMIT`
+    distinct values, or already coarsened, are reduced to at most that many ranges, as when loading in chunks.
+
+    Attributes:
+        numeric_categories (set): The categories holding numbers, which are grouped into ranges.
+    """
+
+    numeric_categories: set
+
+    def __init__(self, value_statistics: dict[str, TraitStatistics], numeric_categories: set,
+                 value_resolutions: dict[str, float] | None = None) -> None:
+        """
+        Initializes a StatisticsFile from the per-value statistics of its categories.
+
+        Args:
+            value_statistics (dict[str, TraitStatistics]): The per-value statistics of every category.
+            numeric_categories (set): The categories holding numbers.
+            value_resolutions (dict[str, float] | None): The width of the ranges that the statistics of
+                coarsened numerical categories stand for.
+        """
+        self.numeric_categories = numeric_categories
+        super().__init__(value_statistics)
+        self.value_resolutions.update(value_resolutions or {})
+        for category in numeric_categories & self.value_statistics.keys():
+            self.coarsen_value_statistics(category)
+
+    def load_file(self, value_statistics: dict[str, TraitStatistics]) -> None:
+        """
+        Sets the per-value statistics of the dataset and an empty header with a column per category.
+
+        Args:
+            value_statistics (dict[str, TraitStatistics]): The per-value statistics of every category.
+        """
+        self.df = pd.DataFrame({category: pd.Series(dtype=float if category in self.numeric_categories else object)
+                                for category in value_statistics})
+        self.value_statistics.update(value_statistics)
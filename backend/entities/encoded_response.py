@@ -0,0 +1,99 @@
+"""
+encoded_response.py
+
+This module defines the EncodedResponse class, which holds a result of the API already encoded
+for HTTP: its body in some media type, gzip and brotli compressions of that body, and a strong
+ETag derived from it. Results never change once stored, so they are encoded once and every later read only
+has to pick the encoding the client accepts.
+"""
+import gzip
+
+import brotli
+import xxhash
+
+
+class EncodedResponse:
+    """
+    Represents the encoded HTTP body of an immutable result.
+
+    Attributes:
+        body (bytes): The uncompressed body.
+        media_type (str): The media type of the body, such as "application/json".
+        encodings (dict[str, bytes]): The compressed bodies by content coding ("br", "gzip").
+        etag (str): The strong entity tag of the body, including its quotes.
+    """
+
+    body: bytes
+    media_type: str
+    encodings: dict[str, bytes]
+    etag: str
+
+    # Preferred content codings, best first
+    CODINGS = ("br", "gzip")
+
+    def __init__(self, body: bytes, media_type: str = "application/json") -> None:
+        """
+        Initializes an EncodedResponse by compressing a body and hashing it into an ETag.
+
+        Args:
+            body (bytes): The uncompressed body.
+            media_type (str): The media type of the body.
+        """
+        self.body = body
+        self.media_type = media_type
+        self.encodings = {
+            "br": brotli.compress(body, quality=5),
+            "gzip": gzip.compress(body, compresslevel=6, mtime=0),
+        }
+        self.etag = f'"{xxhash.xxh3_128_hexdigest(body)}"'
+
+    def get_size(self) -> int:
+        """
+        Computes the memory taken by the encoded bodies.
+
+        Returns:
+            int: The total size of the bodies in bytes.
+        """
+        return len(self.body) + sum(len(encoded) for encoded in self.encodings.values())
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """
+        Checks whether an `If-None-Match` request header names this response's ETag.
+
+        Args:
+            if_none_match (str | None): The header value, a list of ETags or "*".
+
+        Returns:
+            bool: True if the client already has this response and can be answered with 304 Not Modified.
+        """
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # If-None-Match uses weak comparison, so W/ prefixes added by proxies are ignored
+        return "*" in tags or any(tag.removeprefix("W/") == self.etag for tag in tags)
+
+    def select_encoding(self, accept_encoding: str | None) -> tuple[str | None, bytes]:
+        """
+        Picks the body to send for an `Accept-Encoding` request header.
+
+        Args:
+            accept_encoding (str | None): The header value, e.g. "gzip, deflate, br".
+
+        Returns:
+            tuple[str | None, bytes]: The content coding (None for the uncompressed body) and the body to send.
+        """
+        accepted = set()
+        for item in (accept_encoding or "").split(","):
+            coding, _, parameters = item.partition(";")
+            try:
+                quality = float(parameters.strip().removeprefix("q=")) if parameters.strip() else 1.0
+            except ValueError:
+                quality = 1.0
+            # A quality of 0 means the coding is refused
+            if coding.strip() and quality > 0:
+                accepted.add(coding.strip().lower())
+
+        for coding in self.CODINGS:
+            if coding in accepted or "*" in accepted:
+                return coding, self.encodings[coding]
+        return None, self.body
@@ -0,0 +1,71 @@
+"""
+histogram.py
+
+This module defines the Histogram class, which counts observed values, such as request latencies,
+into cumulative buckets as Prometheus histograms do.
+
+Observing a value costs a binary search over the bucket bounds, so histograms can be updated on
+every request.
+"""
+import bisect
+import math
+
+
+class Histogram:
+    """
+    Counts values into buckets bounded above by increasing limits.
+
+    Attributes:
+        bounds (tuple[float, ...]): The increasing upper bounds of the buckets, the last bucket being unbounded.
+        bucket_counts (list[int]): The number of values that fell in every bucket, not cumulated, with one more
+            entry than `bounds` for the unbounded bucket.
+        count (int): The number of observed values.
+        total (float): The sum of the observed values.
+    """
+
+    bounds: tuple[float, ...]
+    bucket_counts: list[int]
+    count: int
+    total: float
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """
+        Initializes an empty Histogram.
+
+        Args:
+            bounds (tuple[float, ...]): The increasing upper bounds of the buckets.
+
+        Raises:
+            ValueError: If the bounds are not increasing.
+        """
+        if any(lower >= upper for lower, upper in zip(bounds, bounds[1:])):
+            raise ValueError("Histogram bounds must be increasing.")
+        self.bounds = tuple(bounds)
+        self.bucket_counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Counts a value into the first bucket whose upper bound is at least the value.
+
+        Args:
+            value (float): The observed value.
+        """
+        self.bucket_counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def get_cumulative_counts(self) -> list[tuple[float, int]]:
+        """
+        Counts the values at most every bound, as Prometheus reports them.
+
+        Returns:
+            list[tuple[float, int]]: The upper bound of every bucket, infinity for the last one, with the number
+                of values at most that bound.
+        """
+        cumulative, counts = 0, []
+        for bound, bucket_count in zip((*self.bounds, math.inf), self.bucket_counts):
+            cumulative += bucket_count
+            counts.append((bound, cumulative))
+        return counts
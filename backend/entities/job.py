@@ -0,0 +1,79 @@
+"""
+job.py
+
+This module defines the Job class, which tracks a unit of work submitted to run in the background,
+such as processing an uploaded dataset. A job moves from queued to running and ends either done,
+with a result, or failed, with an error message.
+"""
+from concurrent.futures import Future
+
+
+class Job:
+    """
+    Represents a background job and its outcome.
+
+    Attributes:
+        id (str): The unique identifier of the job.
+        future (Future | None): The pending execution of the job, released once the job has finished.
+        result: The result of the job once it is done.
+        error (str | None): A description of the failure if the job failed.
+        details (dict): Information about how the job is run, reported along with its status.
+    """
+
+    id: str
+    future: Future | None
+    result: object
+    error: str | None
+    details: dict
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, id: str, future: Future | None) -> None:
+        """
+        Initializes a Job for a pending execution.
+
+        Args:
+            id (str): The unique identifier of the job.
+            future (Future | None): The pending execution of the job, or None for a job that is already
+                finished, whose outcome must then be recorded with `finish`.
+        """
+        self.id = id
+        self.future = future
+        self.result = None
+        self.error = None
+        self.details = {}
+
+    def finish(self, result: object = None, error: str | None = None) -> None:
+        """
+        Records the outcome of the job and releases its execution.
+
+        Args:
+            result: The result of the job, if it succeeded.
+            error (str | None): A description of the failure, if it failed.
+        """
+        self.result = result
+        self.error = error
+        self.future = None
+
+    def get_status(self) -> str:
+        """
+        Determines the current status of the job.
+
+        Returns:
+            str: One of `QUEUED`, `RUNNING`, `DONE` or `FAILED`.
+        """
+        if self.future is not None:
+            return self.RUNNING if self.future.running() else self.QUEUED
+        return self.FAILED if self.error is not None else self.DONE
+
+    def is_finished(self) -> bool:
+        """
+        Checks whether the job is done or has failed.
+
+        Returns:
+            bool: True if the job has finished, False if it is queued or running.
+        """
+        return self.future is None
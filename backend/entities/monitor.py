@@ -0,0 +1,143 @@
+"""
+monitor.py
+
+This module defines the Monitor class, which follows the fairness of a model in production over a stream
+of its scored predictions. Every prediction is an event with a timestamp, the "marked" and "actual"
+outcomes, and the protected attributes of the person it concerns. Events are folded into one or more
+`MonitoringWindow` objects, whose statistics can be scored like those of an uploaded dataset.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+from backend.entities.monitoring_window import MonitoringWindow
+from backend.entities.protected_classes import PROTECTED_CLASSES
+from backend.entities.trait_statistics import get_outcome_cells
+
+
+class Monitor:
+    """
+    Represents the monitoring of a stream of scored predictions over named time windows.
+
+    Attributes:
+        id (str): The unique identifier of the monitor.
+        windows (dict[str, MonitoringWindow]): The windows of the monitor by name.
+        numeric_categories (set): The categories whose first events held numbers, which are grouped into ranges.
+        text_categories (set): The categories whose first events held text.
+    """
+
+    id: str
+    windows: dict[str, MonitoringWindow]
+    numeric_categories: set
+    text_categories: set
+
+    # Column holding the time of every event, as seconds since the epoch or as an ISO 8601 date and time
+    TIMESTAMP_COLUMN = "timestamp"
+
+    def __init__(self, id: str, windows: dict[str, MonitoringWindow]) -> None:
+        """
+        Initializes a Monitor without any event.
+
+        Args:
+            id (str): The unique identifier of the monitor.
+            windows (dict[str, MonitoringWindow]): The windows of the monitor by name.
+
+        Raises:
+            ValueError: If no window is given.
+        """
+        if not windows:
+            raise ValueError("A monitor needs at least one window.")
+        self.id = id
+        self.windows = windows
+        self.numeric_categories = set()
+        self.text_categories = set()
+        self._lock = threading.Lock()
+
+    def ingest(self, events: pd.DataFrame) -> dict:
+        """
+        Adds a batch of events to every window of the monitor.
+
+        Columns other than the timestamp, the outcomes and the protected classes are ignored. A category keeps
+        the kind of values of its first events: later values of a numerical category that are not numbers are
+        ignored, as are missing values.
+
+        Args:
+            events (pd.DataFrame): The events, one per row.
+
+        Returns:
+            dict: The number of events in the batch under "ingested", and for every window the number of events
+                dropped so far for arriving after the window had moved past them, under "dropped".
+
+        Raises:
+            ValueError: If a required column is missing or holds invalid values.
+        """
+        missing = {self.TIMESTAMP_COLUMN, "marked", "actual"} - set(events.columns)
+        if missing:
+            raise ValueError(f"The events are missing the columns {', '.join(sorted(missing))}.")
+
+        timestamps = self.parse_timestamps(events[self.TIMESTAMP_COLUMN])
+        try:
+            marked, actual = events["marked"].to_numpy(dtype=float), events["actual"].to_numpy(dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError("The marked and actual outcomes of the events must be numbers.")
+        mismatches, cells = np.abs(marked - actual), get_outcome_cells(marked, actual)
+
+        with self._lock:
+            columns = {}
+            for category in [column for column in events.columns if column.lower() in PROTECTED_CLASSES]:
+                column = events[category]
+                if category not in self.numeric_categories | self.text_categories:
+                    is_numeric = pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column)
+                    (self.numeric_categories if is_numeric else self.text_categories).add(category)
+                if category in self.numeric_categories:
+                    column = pd.to_numeric(column, errors="coerce").astype(float)
+                columns[category] = column
+
+            for window in self.windows.values():
+                window.add(timestamps, columns, mismatches, cells, self.numeric_categories)
+            return {"ingested": len(events), "dropped": {name: window.dropped for name, window in self.windows.items()}}
+
+    def parse_timestamps(self, column: pd.Series) -> np.ndarray:
+        """
+        Converts the timestamps of events to whole seconds since the epoch.
+
+        Args:
+            column (pd.Series): Timestamps as numbers of seconds since the epoch or as ISO 8601 strings.
+
+        Returns:
+            np.ndarray: The timestamps in seconds since the epoch.
+
+        Raises:
+            ValueError: If a timestamp is missing or cannot be parsed.
+        """
+        try:
+            if not pd.api.types.is_numeric_dtype(column):
+                column = pd.to_datetime(column, utc=True, format="ISO8601")
+                column = (column - pd.Timestamp(0, tz="UTC")).dt.total_seconds()
+            seconds = column.to_numpy(dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError("The timestamps of the events must be numbers of seconds or ISO 8601 dates and times.")
+        if np.isnan(seconds).any():
+            raise ValueError("Every event needs a timestamp.")
+        return np.floor(seconds).astype(np.int64)
+
+    def get_windows(self) -> dict[str, dict]:
+        """
+        Takes a consistent view of every window of the monitor, while no batch of events is being added.
+
+        Returns:
+            dict[str, dict]: For every window by name, its "size" and "step", the "start" and "end" of the time it
+                covers (None before the first event), the number of events it holds under "count", the number of
+                events it dropped under "dropped", the per-value statistics of its categories under
+                "statistics", and the width of the ranges its numerical categories were coarsened into under
+                "resolutions".
+        """
+        with self._lock:
+            windows = {}
+            for name, window in self.windows.items():
+                start, end = window.get_bounds() or (None, None)
+                windows[name] = {"size": window.size, "step": window.step, "start": start, "end": end,
+                                 "count": window.get_count(), "dropped": window.dropped,
+                                 "statistics": window.get_statistics(),
+                                 "resolutions": dict(window.value_resolutions)}
+            return windows
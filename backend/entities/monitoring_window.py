@@ -0,0 +1,221 @@
+"""
+monitoring_window.py
+
+This module defines the MonitoringWindow class, which keeps the per-trait statistics of the most recent
+events of a stream, over a window of time that either slides by a fixed step or tumbles from one period
+to the next.
+
+The window is split into buckets of `step` seconds kept in a ring. Every event is folded into the
+statistics of its bucket, and a bucket is reused for a later period once it falls out of the window, so
+memory is bounded by the number of buckets times the number of traits, whatever the number of events.
+Numerical categories are coarsened into ranges once the buckets hold more than `NUMERIC_VALUE_LIMIT` of
+their values together, so that continuous attributes do not add a trait per event.
+"""
+import numpy as np
+import pandas as pd
+from backend.entities.trait_statistics import TraitStatistics, find_resolution
+
+
+class MonitoringWindow:
+    """
+    Represents a sliding or tumbling window of per-trait statistics over timestamped events.
+
+    A window of `size` seconds advancing by `step` seconds holds `size / step` buckets. When `step` equals
+    `size`, the window tumbles: it holds a single bucket, which starts over at the beginning of each period.
+    Time advances with the timestamps of the events, and events older than the window are dropped.
+
+    Attributes:
+        size (int): The length of the window in seconds.
+        step (int): The length of a bucket in seconds, by which the window advances.
+        latest (int): The index of the most recent bucket, counted in steps since the epoch, or -1 if the
+            window has not received any event.
+        dropped (int): The number of events dropped for arriving after their bucket left the window.
+        bucket_ids (np.ndarray): The index of the bucket held by every slot of the ring, or -1 for an unused slot.
+        bucket_counts (np.ndarray): The number of events held by every slot of the ring.
+        bucket_statistics (list[dict[str, TraitStatistics]]): The per-value statistics of every category held
+            by every slot of the ring.
+        value_resolutions (dict[str, float]): The width of the ranges that the values of numerical categories
+            are grouped into in every bucket, for those that were coarsened. Widths never shrink.
+    """
+
+    size: int
+    step: int
+    latest: int
+    dropped: int
+    bucket_ids: np.ndarray
+    bucket_counts: np.ndarray
+    bucket_statistics: list[dict[str, TraitStatistics]]
+    value_resolutions: dict[str, float]
+
+    # Number of distinct values a numerical category can have over all the buckets before it is coarsened
+    NUMERIC_VALUE_LIMIT = 10_000
+
+    def __init__(self, size: int, step: int | None = None) -> None:
+        """
+        Initializes an empty MonitoringWindow.
+
+        Args:
+            size (int): The length of the window in seconds.
+            step (int | None): The step of a sliding window in seconds, which must divide `size`. Defaults to
+                `size`, for a tumbling window.
+
+        Raises:
+            ValueError: If the size or the step is not positive, or the step does not divide the size.
+        """
+        step = size if step is None else step
+        if size <= 0 or step <= 0 or size % step:
+            raise ValueError("The window size and step must be positive, and the step must divide the size.")
+        self.size = size
+        self.step = step
+        self.latest = -1
+        self.dropped = 0
+        self.bucket_ids = np.full(size // step, -1, dtype=np.int64)
+        self.bucket_counts = np.zeros(size // step, dtype=np.int64)
+        self.bucket_statistics = [{} for _ in range(size // step)]
+        self.value_resolutions = {}
+
+    def add(self, timestamps: np.ndarray, columns: dict[str, pd.Series], mismatches: np.ndarray,
+            cells: np.ndarray | None = None, numeric_categories: set = frozenset()) -> None:
+        """
+        Adds a batch of events to the window.
+
+        The events are sorted by bucket once, and the events of each bucket are aggregated per trait in one
+        vectorized pass and merged into the bucket, so the cost is proportional to the number of events in the
+        batch plus the number of traits of the buckets it touches.
+
+        Args:
+            timestamps (np.ndarray): The time of every event in seconds since the epoch.
+            columns (dict[str, pd.Series]): The value of every event for each category, aligned with `timestamps`.
+            mismatches (np.ndarray): The |marked - actual| value of every event.
+            cells (np.ndarray | None): The confusion matrix column of every event, if the outcomes are binary.
+            numeric_categories (set): The categories holding numbers (as floats), which are coarsened into ranges
+                beyond `NUMERIC_VALUE_LIMIT` values over all the buckets.
+        """
+        buckets = np.floor_divide(np.asarray(timestamps, dtype=np.int64), self.step)
+        if not len(buckets):
+            return
+        self.latest = max(self.latest, int(buckets.max()))
+
+        late = buckets <= self.latest - len(self.bucket_ids)
+        self.dropped += int(late.sum())
+        order = np.flatnonzero(~late)
+        order = order[np.argsort(buckets[order], kind="stable")]
+        if not len(order):
+            return
+        bucket_ids, starts = np.unique(buckets[order], return_index=True)
+        bounds = np.append(starts, len(order))
+
+        mismatches = np.asarray(mismatches)[order]
+        cells = cells[order] if cells is not None else None
+        columns = {category: column.to_numpy()[order] for category, column in columns.items()}
+
+        for bucket, start, end in zip(bucket_ids.tolist(), bounds[:-1].tolist(), bounds[1:].tolist()):
+            statistics = self.get_bucket(bucket)
+            for category, column in columns.items():
+                column = column[start:end]
+                if category in numeric_categories:
+                    column = self.coarsen_column(category, column)
+                codes, uniques = pd.factorize(column)
+                values = TraitStatistics.from_codes(codes, uniques.tolist(), mismatches[start:end],
+                                                    cells[start:end] if cells is not None else None)
+                if category in statistics:
+                    values = statistics[category].merge(values)
+                statistics[category] = values
+            self.bucket_counts[bucket % len(self.bucket_ids)] += end - start
+
+        for category in numeric_categories & columns.keys():
+            self.coarsen_category(category)
+
+    def coarsen_column(self, category: str, column: np.ndarray) -> np.ndarray:
+        """
+        Groups the values of a numerical category into the ranges its buckets were coarsened into.
+
+        Args:
+            category (str): The numerical category.
+            column (np.ndarray): The values of the category.
+
+        Returns:
+            np.ndarray: The lower bound of the range of every value, or the values themselves if the category
+                has not been coarsened.
+        """
+        resolution = self.value_resolutions.get(category)
+        return np.floor(column / resolution) * resolution if resolution else column
+
+    def coarsen_category(self, category: str) -> None:
+        """
+        Coarsens the values of a numerical category into ranges of the same width in every bucket, the
+        narrowest leaving at most `NUMERIC_VALUE_LIMIT` traits over all the buckets, if they hold more.
+
+        Args:
+            category (str): The numerical category to coarsen.
+        """
+        buckets = [bucket for bucket in self.bucket_statistics if category in bucket]
+        if sum(len(bucket[category].traits) for bucket in buckets) <= self.NUMERIC_VALUE_LIMIT:
+            return
+
+        resolution = find_resolution([np.asarray(bucket[category].traits, dtype=float) for bucket in buckets],
+                                     self.NUMERIC_VALUE_LIMIT, self.value_resolutions.get(category, 0.0))
+        self.value_resolutions[category] = resolution
+        for bucket in buckets:
+            bucket[category], _ = bucket[category].coarsen(self.NUMERIC_VALUE_LIMIT, resolution)
+
+    def get_bucket(self, bucket: int) -> dict[str, TraitStatistics]:
+        """
+        Retrieves the statistics of a bucket, taking over the slot of the ring it maps to if that slot still
+        holds a bucket that has left the window.
+
+        Args:
+            bucket (int): The index of the bucket, counted in steps since the epoch.
+
+        Returns:
+            dict[str, TraitStatistics]: The per-value statistics of every category in the bucket.
+        """
+        slot = bucket % len(self.bucket_ids)
+        if self.bucket_ids[slot] != bucket:
+            self.bucket_ids[slot] = bucket
+            self.bucket_counts[slot] = 0
+            self.bucket_statistics[slot] = {}
+        return self.bucket_statistics[slot]
+
+    def get_live_slots(self) -> np.ndarray:
+        """
+        Finds the slots of the ring holding buckets that are within the window.
+
+        Returns:
+            np.ndarray: The indices of the live slots.
+        """
+        return np.flatnonzero((self.bucket_ids >= 0) & (self.bucket_ids > self.latest - len(self.bucket_ids)))
+
+    def get_count(self) -> int:
+        """
+        Counts the events within the window.
+
+        Returns:
+            int: The number of events within the window.
+        """
+        return int(self.bucket_counts[self.get_live_slots()].sum())
+
+    def get_bounds(self) -> tuple[int, int] | None:
+        """
+        Computes the time range covered by the window.
+
+        Returns:
+            tuple[int, int] | None: The start (inclusive) and end (exclusive) of the window in seconds since the
+                epoch, or None if the window has not received any event.
+        """
+        if self.latest < 0:
+            return None
+        return (self.latest + 1) * self.step - self.size, (self.latest + 1) * self.step
+
+    def get_statistics(self) -> dict[str, TraitStatistics]:
+        """
+        Combines the statistics of the buckets within the window.
+
+        Returns:
+            dict[str, TraitStatistics]: The per-value statistics of every category over the window.
+        """
+        statistics = {}
+        for slot in self.get_live_slots().tolist():
+            for category, values in self.bucket_statistics[slot].items():
+                statistics[category] = statistics[category].merge(values) if category in statistics else values
+        return statistics
@@ -0,0 +1,71 @@
+"""
+numeric_bins.py
+
+This module defines the NumericBins class, which represents the ranges a numerical category is
+grouped into. The bins are described by their sorted edges and a label for every range, and rows
+are assigned to ranges as compact integer codes instead of string labels.
+"""
+import numpy as np
+
+
+class NumericBins:
+    """
+    Represents the ranges of a binned numerical category.
+
+    A value `v` belongs to range `i` when `edges[i - 1] <= v < edges[i]`, so `n` edges describe
+    `n + 1` ranges, the first of which is open below and the last of which is open above.
+
+    Attributes:
+        edges (np.ndarray): The sorted boundaries between consecutive ranges.
+        labels (list[str]): The label of every range, one more than the number of edges.
+    """
+
+    edges: np.ndarray
+    labels: list[str]
+
+    def __init__(self, edges: np.ndarray, labels: list[str]) -> None:
+        """
+        Initializes a NumericBins instance from its edges and range labels.
+
+        Args:
+            edges (np.ndarray): The sorted boundaries between consecutive ranges.
+            labels (list[str]): The label of every range.
+
+        Raises:
+            ValueError: If the number of labels does not match the number of ranges.
+        """
+        if len(labels) != len(edges) + 1:
+            raise ValueError(f"Expected {len(edges) + 1} labels for {len(edges)} edges, got {len(labels)}.")
+        self.edges = edges
+        self.labels = labels
+
+    def assign(self, values: np.ndarray) -> np.ndarray:
+        """
+        Assigns every value to the code of the range it falls in.
+
+        Missing (NaN) values are given the code -1.
+
+        Args:
+            values (np.ndarray): The numerical values to assign.
+
+        Returns:
+            np.ndarray: The range code of every value.
+        """
+        values = np.asarray(values, dtype=float)
+        codes = np.searchsorted(self.edges, values, side="right")
+        codes[np.isnan(values)] = -1
+        return codes
+
+    def label(self, values: np.ndarray) -> np.ndarray:
+        """
+        Maps every value to the label of the range it falls in.
+
+        Args:
+            values (np.ndarray): The numerical values to label.
+
+        Returns:
+            np.ndarray: The range label of every value, or None for missing values.
+        """
+        codes = self.assign(values)
+        labels = np.array(self.labels + [None], dtype=object)
+        return labels[codes]
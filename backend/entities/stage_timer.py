@@ -0,0 +1,80 @@
+"""
+stage_timer.py
+
+This module defines the StageTimer class, which records how long each stage of handling a request
+took, such as parsing or scoring an uploaded dataset, and the size of what was processed.
+
+Timers are plain data, so the timer filled in by a worker process can be returned to the process
+serving the request and merged into its own timer.
+"""
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class StageTimer:
+    """
+    Records the duration of named stages, in the order they first ran, and named sizes.
+
+    Attributes:
+        durations (dict[str, float]): The total time spent in every stage, in seconds.
+        sizes (dict[str, int]): Sizes of the processed data, such as the number of rows, columns and traits.
+    """
+
+    durations: dict[str, float]
+    sizes: dict[str, int]
+
+    def __init__(self, durations: dict[str, float] | None = None, sizes: dict[str, int] | None = None) -> None:
+        """
+        Initializes a StageTimer.
+
+        Args:
+            durations (dict[str, float] | None): Durations already recorded, in seconds.
+            sizes (dict[str, int] | None): Sizes already recorded.
+        """
+        self.durations = dict(durations or {})
+        self.sizes = dict(sizes or {})
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Times the code run within the context as a stage. Running a stage again adds to its duration.
+
+        Args:
+            name (str): The name of the stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        Adds time to a stage.
+
+        Args:
+            name (str): The name of the stage.
+            seconds (float): The time to add, in seconds.
+        """
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def merge(self, other: "StageTimer") -> None:
+        """
+        Adds the durations and sizes recorded by another timer, such as one filled in by a worker process.
+
+        Args:
+            other (StageTimer): The other timer.
+        """
+        for name, seconds in other.durations.items():
+            self.add(name, seconds)
+        self.sizes.update(other.sizes)
+
+    def get_server_timing(self) -> str:
+        """
+        Formats the durations as the value of a `Server-Timing` HTTP header, in milliseconds.
+
+        Returns:
+            str: The header value, such as "parse;dur=12.3, process;dur=4.5".
+        """
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.durations.items())
@@ -0,0 +1,346 @@
+"""
+trait_statistics.py
+
+This module defines the TraitStatistics class, which holds the per-trait sufficient statistics
+of a single category: how many rows carry each trait and the summed mismatch between the
+"marked" and "actual" columns for those rows. When both columns hold binary outcomes, the
+confusion matrix of every trait (true and false positives and negatives) is kept as well.
+Error rates, false positive rates (FPRs) and the other rates of `METRICS`, as well as trait counts,
+can be derived from these totals without rescanning the dataset, and statistics computed over
+separate parts of a dataset can be merged into the statistics of the whole.
+"""
+import numpy as np
+
+# Columns of a confusion matrix, numbered 2 * marked + actual: rows neither marked nor actually positive,
+# actually positive but not marked, marked but actually negative, and both marked and actually positive
+TRUE_NEGATIVES, FALSE_NEGATIVES, FALSE_POSITIVES, TRUE_POSITIVES = range(4)
+
+# Rates that can be derived for every trait: the share of misclassified rows (the rate scores have always
+# been based on), the false positive rate, false negative rate, true positive rate and precision
+METRICS = ("error_rate", "fpr", "fnr", "tpr", "ppv")
+
+# Rates for which a higher value is better
+BENEFICIAL_METRICS = ("tpr", "ppv")
+
+# Power of two of the narrowest ranges numerical traits are coarsened into (see `TraitStatistics.coarsen`)
+MIN_RESOLUTION_EXPONENT = -30
+
+# Numerator and denominator columns of the rates derived from the confusion matrix
+METRIC_CELLS = {
+    "fpr": ((FALSE_POSITIVES,), (FALSE_POSITIVES, TRUE_NEGATIVES)),
+    "fnr": ((FALSE_NEGATIVES,), (FALSE_NEGATIVES, TRUE_POSITIVES)),
+    "tpr": ((TRUE_POSITIVES,), (TRUE_POSITIVES, FALSE_NEGATIVES)),
+    "ppv": ((TRUE_POSITIVES,), (TRUE_POSITIVES, FALSE_POSITIVES)),
+}
+
+
+def get_outcome_cells(marked: np.ndarray, actual: np.ndarray) -> np.ndarray | None:
+    """
+    Determines the confusion matrix column of every row from its "marked" and "actual" outcomes.
+
+    Args:
+        marked (np.ndarray): The "marked" value of every row.
+        actual (np.ndarray): The "actual" value of every row.
+
+    Returns:
+        np.ndarray | None: The column (`TRUE_NEGATIVES` to `TRUE_POSITIVES`) of every row, or None if an
+            outcome is not 0 or 1.
+    """
+    outcomes = []
+    for outcome in (np.asarray(marked), np.asarray(actual)):
+        if outcome.dtype.kind in "biu":
+            # A range check is much cheaper than comparing every value when the outcomes are integers
+            is_binary = not len(outcome) or (outcome.min() >= 0 and outcome.max() <= 1)
+        else:
+            is_binary = ((outcome == 0) | (outcome == 1)).all()
+        if not is_binary:
+            return None
+        outcomes.append(outcome.astype(np.int8))
+    return outcomes[0] * 2 + outcomes[1]
+
+
+def find_resolution(groups: list[np.ndarray], limit: int, resolution: float = 0.0) -> float:
+    """
+    Finds the narrowest power-of-two width, at least `resolution`, of ranges into which groups of numbers fall
+    in at most `limit` ranges in total, each group counting its own ranges.
+
+    Args:
+        groups (list[np.ndarray]): The numbers of every group.
+        limit (int): The number of ranges to allow at most, at least twice the number of groups.
+        resolution (float): The narrowest width to allow, or 0 for none.
+
+    Returns:
+        float: The width of the ranges.
+    """
+    groups = [group for group in groups if len(group)]
+    # Beyond the largest magnitude, every number falls in one of the two ranges around zero
+    lowest = round(np.log2(resolution)) if resolution else MIN_RESOLUTION_EXPONENT
+    highest = max([lowest] + [int(np.ceil(np.log2(np.abs(group).max() + 1))) + 1 for group in groups])
+    while lowest < highest:
+        middle = (lowest + highest) // 2
+        if sum(len(np.unique(np.floor(group / 2.0 ** middle))) for group in groups) <= limit:
+            highest = middle
+        else:
+            lowest = middle + 1
+    return 2.0 ** lowest
+
+
+class TraitStatistics:
+    """
+    Represents the per-trait row counts and mismatch totals for one category of a dataset.
+
+    The arrays are aligned with `traits`, so `counts[i]`, `mismatches[i]` and `confusion[i]` all describe
+    `traits[i]`.
+
+    Attributes:
+        traits (list): The unique traits of the category.
+        counts (np.ndarray): The number of rows for each trait.
+        mismatches (np.ndarray): The sum of |marked - actual| over the rows of each trait.
+        confusion (np.ndarray | None): The number of rows of each trait in every column of the confusion matrix
+            (`TRUE_NEGATIVES` to `TRUE_POSITIVES`), or None if the outcomes are not binary.
+    """
+
+    traits: list
+    counts: np.ndarray
+    mismatches: np.ndarray
+    confusion: np.ndarray | None
+
+    def __init__(self, traits: list, counts: np.ndarray, mismatches: np.ndarray,
+                 confusion: np.ndarray | None = None) -> None:
+        """
+        Initializes a TraitStatistics instance from aligned traits, counts and mismatch totals.
+
+        Args:
+            traits (list): The unique traits of the category.
+            counts (np.ndarray): The number of rows for each trait.
+            mismatches (np.ndarray): The sum of |marked - actual| over the rows of each trait.
+            confusion (np.ndarray | None): The confusion matrix of each trait, one row per trait.
+        """
+        self.traits = traits
+        self.counts = counts
+        self.mismatches = mismatches
+        self.confusion = confusion
+
+    @classmethod
+    def from_codes(cls, codes: np.ndarray, traits: list, mismatches: np.ndarray,
+                   cells: np.ndarray | None = None) -> "TraitStatistics":
+        """
+        Aggregates per-row trait codes and mismatches into per-trait statistics.
+
+        With the confusion matrix column of every row, the whole confusion matrix of every trait is counted
+        in a single `np.bincount` over combined trait and column codes, and the row counts and mismatch totals
+        are derived from it.
+
+        Rows with a negative code are ignored, and traits without any rows are dropped.
+
+        Args:
+            codes (np.ndarray): The trait code of every row.
+            traits (list): The traits the codes refer to.
+            mismatches (np.ndarray): The |marked - actual| value of every row.
+            cells (np.ndarray | None): The confusion matrix column of every row, from `get_outcome_cells`.
+
+        Returns:
+            TraitStatistics: The row count and mismatch total, and the confusion matrix if `cells` is given, of
+                every trait.
+        """
+        if len(codes) and codes.min() < 0:
+            valid = codes >= 0
+            codes, mismatches = codes[valid], mismatches[valid]
+            cells = cells[valid] if cells is not None else None
+
+        confusion = None
+        if cells is not None:
+            confusion = np.bincount(codes.astype(np.int64) * 4 + cells, minlength=4 * len(traits)).reshape(-1, 4)
+            counts = confusion.sum(axis=1)
+            totals = (confusion[:, FALSE_POSITIVES] + confusion[:, FALSE_NEGATIVES]).astype(float)
+        else:
+            counts = np.bincount(codes, minlength=len(traits))
+            totals = np.bincount(codes, weights=mismatches, minlength=len(traits))
+
+        present = np.flatnonzero(counts)
+        if len(present) < len(traits):
+            traits = [traits[i] for i in present]
+            counts, totals = counts[present], totals[present]
+            confusion = confusion[present] if confusion is not None else None
+
+        return cls(traits, counts, totals, confusion)
+
+    def merge(self, other: "TraitStatistics") -> "TraitStatistics":
+        """
+        Combines these statistics with statistics computed over other rows of the same category.
+
+        Traits present in both are summed; traits present in only one are kept as they are.
+
+        Args:
+            other (TraitStatistics): The statistics to combine with.
+
+        Returns:
+            TraitStatistics: The statistics of the rows covered by both.
+        """
+        positions = {trait: i for i, trait in enumerate(self.traits)}
+        traits = list(self.traits)
+        for trait in other.traits:
+            if trait not in positions:
+                positions[trait] = len(traits)
+                traits.append(trait)
+
+        counts = np.zeros(len(traits), dtype=np.int64)
+        totals = np.zeros(len(traits))
+        counts[:len(self.traits)] = self.counts
+        totals[:len(self.traits)] = self.mismatches
+
+        other_positions = [positions[trait] for trait in other.traits]
+        counts[other_positions] += other.counts
+        totals[other_positions] += other.mismatches
+
+        confusion = None
+        if self.confusion is not None and other.confusion is not None:
+            confusion = np.zeros((len(traits), 4), dtype=np.int64)
+            confusion[:len(self.traits)] = self.confusion
+            confusion[other_positions] += other.confusion
+
+        return TraitStatistics(traits, counts, totals, confusion)
+
+    def regroup(self, codes: np.ndarray, traits: list) -> "TraitStatistics":
+        """
+        Groups the current traits into coarser traits, such as numerical values into ranges.
+
+        Current traits with a negative code are dropped, and new traits without any rows are omitted.
+
+        Args:
+            codes (np.ndarray): The code of the new trait each current trait belongs to.
+            traits (list): The new traits the codes refer to.
+
+        Returns:
+            TraitStatistics: The row count and mismatch total of every new trait.
+        """
+        valid = codes >= 0
+        counts = np.bincount(codes[valid], weights=self.counts[valid], minlength=len(traits)).astype(np.int64)
+        totals = np.bincount(codes[valid], weights=self.mismatches[valid], minlength=len(traits))
+
+        present = np.flatnonzero(counts)
+        confusion = None
+        if self.confusion is not None:
+            confusion = np.stack([np.bincount(codes[valid], weights=self.confusion[valid, cell], minlength=len(traits))
+                                  for cell in range(4)], axis=1).astype(np.int64)[present]
+        return TraitStatistics([traits[i] for i in present], counts[present], totals[present], confusion)
+
+    def coarsen(self, limit: int, resolution: float = 0.0) -> tuple["TraitStatistics", float]:
+        """
+        Groups numerical traits into ranges of equal width, each represented by its lower bound, so that at
+        most `limit` traits are left.
+
+        Widths are powers of two, and the narrowest width (at least `resolution`) that leaves at most `limit`
+        traits is used. A range of one width is split exactly into ranges of every narrower width, so
+        coarsening statistics every time they are merged gives the same ranges as coarsening the statistics
+        of all the rows at once, however the rows were split.
+
+        Args:
+            limit (int): The number of traits to keep at most, at least 2.
+            resolution (float): The width of the ranges the traits already stand for, or 0 for exact values.
+
+        Returns:
+            tuple[TraitStatistics, float]: The coarsened statistics and the width of their ranges, or these
+                statistics and 0 if they are exact values within the limit.
+        """
+        values = np.asarray(self.traits, dtype=float)
+        if not resolution and len(values) <= limit:
+            return self, 0.0
+        if not len(values):
+            return self, resolution
+
+        width = find_resolution([values], limit, resolution)
+        uniques, codes = np.unique(np.floor(values / width) * width, return_inverse=True)
+        return self.regroup(codes, uniques.tolist()), width
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TraitStatistics":
+        """
+        Restores statistics saved with `to_dict`.
+
+        Args:
+            data (dict): The traits, counts and mismatch totals, and the confusion matrices if they were kept.
+
+        Returns:
+            TraitStatistics: The restored statistics.
+        """
+        confusion = data.get("confusion")
+        return cls(list(data["traits"]), np.array(data["counts"], dtype=np.int64),
+                   np.array(data["mismatches"], dtype=float),
+                   np.array(confusion, dtype=np.int64).reshape(-1, 4) if confusion is not None else None)
+
+    def to_dict(self) -> dict:
+        """
+        Converts the statistics to a JSON-serializable dictionary, to be stored and restored with `from_dict`.
+
+        Returns:
+            dict: The traits, counts, mismatch totals and confusion matrices (None if not kept) as lists.
+        """
+        return {"traits": list(self.traits), "counts": self.counts.tolist(), "mismatches": self.mismatches.tolist(),
+                "confusion": self.confusion.tolist() if self.confusion is not None else None}
+
+    def get_rates(self, metric: str = "error_rate") -> np.ndarray:
+        """
+        Calculates a rate of `METRICS` for every trait. Every rate takes time linear in the number of traits.
+
+        Args:
+            metric (str): The rate to calculate.
+
+        Returns:
+            np.ndarray: The rates, aligned with `traits`. A rate is NaN for a trait without any row in its
+                denominator, such as the FPR of a trait without actual negatives.
+
+        Raises:
+            ValueError: If the metric is unknown, or needs a confusion matrix that was not kept.
+        """
+        if metric == "error_rate":
+            return self.mismatches / self.counts
+        if metric not in METRIC_CELLS:
+            raise ValueError(f"Unknown metric: {metric}")
+        if self.confusion is None:
+            raise ValueError(f"The {metric} can only be calculated when every marked and actual outcome is 0 or 1.")
+
+        numerator, denominator = METRIC_CELLS[metric]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.confusion[:, numerator].sum(axis=1) / self.confusion[:, denominator].sum(axis=1)
+
+    def get_rate_map(self, metric: str = "error_rate") -> dict:
+        """
+        Generates a mapping of traits to a rate of `METRICS`.
+
+        Args:
+            metric (str): The rate to calculate.
+
+        Returns:
+            dict: A dictionary with traits as keys and their rates as values, None where a rate is undefined.
+        """
+        rates = self.get_rates(metric)
+        return dict(zip(self.traits, np.where(np.isnan(rates), None, rates).tolist()))
+
+    def get_fprs(self) -> np.ndarray:
+        """
+        Calculates the share of misclassified rows of every trait, which the scores are based on by default and
+        report as the false positive rate (FPR). See `get_rates` for the actual FPR and other rates.
+
+        Returns:
+            np.ndarray: The error rates, aligned with `traits`.
+        """
+        return self.get_rates("error_rate")
+
+    def get_fpr_map(self) -> dict:
+        """
+        Generates a mapping of traits to their error rates (see `get_fprs`).
+
+        Returns:
+            dict: A dictionary with traits as keys and their error rates as values.
+        """
+        return dict(zip(self.traits, self.get_fprs().tolist()))
+
+    def get_count_map(self) -> dict:
+        """
+        Generates a mapping of traits to their row counts.
+
+        Returns:
+            dict: A dictionary with traits as keys and their counts as values.
+        """
+        return dict(zip(self.traits, self.counts.tolist()))
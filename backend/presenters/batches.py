@@ -0,0 +1,296 @@
+"""
+batches.py
+
+This module provides functions for processing many dataset files uploaded together, such as the scored
+outputs of several model variants.
+
+A batch accepts any number of files, including ZIP and TAR archives whose files are processed one by
+one. Every file becomes a dataset job of the shared `job_runner`, so the files of a batch are processed
+in parallel by its worker processes. The jobs are fed to the runner as workers free up, never more at
+once than there are workers, so a large batch neither overflows the job queue nor holds up single
+uploads. Files that do not fit in the memory budget next to the jobs already running wait for memory to
+be released, instead of failing as single uploads do. The outcome of every file is available as soon as
+it is done, while the rest are processed.
+
+Archives are only extracted within bounds, at most `ARCHIVE_MAX_MEMBERS` entries each and `ARCHIVE_MAX_BYTES`
+of extracted files per batch, so that a small archive cannot expand to fill the disk (a "zip bomb").
+"""
+
+import asyncio
+import os
+import tarfile
+import uuid
+import zipfile
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from backend.entities.job import Job
+from backend.presenters.presenters import (
+    DUPLICATE_MODES,
+    copy_upload,
+    get_job,
+    get_upload_salt,
+    job_runner,
+    submit_upload,
+)
+from backend.use_cases.job_runners.job_runner import JobQueueFullError
+from backend.use_cases.memory_budgets.memory_budget import MemoryBudgetFullError
+from backend.use_cases.result_stores.result_store_factory import create_result_store
+
+
+class ArchiveTooLargeError(Exception):
+    """
+    Raised when an archive holds more entries, or the archives of a batch expand to more bytes, than allowed.
+    """
+
+
+# Batches by ID, each with the name of every file and the ID of its job once it has been submitted
+past_batches = create_result_store("batches")
+
+# Maximum number of files in a batch, archives included, set by the BATCH_MAX_FILES environment variable
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", 100))
+
+# Maximum number of entries of an archive, set by the ARCHIVE_MAX_MEMBERS environment variable
+ARCHIVE_MAX_MEMBERS = int(os.getenv("ARCHIVE_MAX_MEMBERS", 1000))
+
+# Maximum number of bytes extracted from the archives of a batch, set by the ARCHIVE_MAX_BYTES environment variable
+ARCHIVE_MAX_BYTES = int(os.getenv("ARCHIVE_MAX_BYTES", 2 * 1024 ** 3))
+
+# Seconds to wait before submitting again when the job queue is full of jobs from outside the batch
+RETRY_DELAY = 0.1
+
+# Extensions of the TAR archives whose files are processed one by one (ZIP archives are recognised by content)
+TAR_EXTENSIONS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+# Batches being submitted, kept so that their tasks are not garbage-collected before they are done
+running_batches = set()
+
+
+async def submit_batch(files: list[UploadFile], chunk_size: int | None = None, duplicates: str = "reuse",
+                       metric: str = "error_rate") -> dict:
+    """
+    Queues uploaded dataset files, and the files within uploaded archives, to be processed in parallel.
+
+    Args:
+        files (list[UploadFile]): The uploaded files.
+        chunk_size (int | None): The number of rows to read at a time, to stream large files with bounded memory.
+        duplicates (str): "reuse" or "alias", to answer files processed before as `submit_dataset` does.
+        metric (str): The rate of `METRICS` to base the scores of every file on.
+
+    Returns:
+        dict: The status of the batch (see `describe_batch`).
+
+    Raises:
+        ArchiveTooLargeError: If an archive holds more than `ARCHIVE_MAX_MEMBERS` entries, or the archives expand
+            to more than `ARCHIVE_MAX_BYTES` bytes.
+        ValueError: If the batch holds more than `BATCH_MAX_FILES` files or no file at all, or `duplicates` is
+            not one of `DUPLICATE_MODES`.
+    """
+    if duplicates not in DUPLICATE_MODES:
+        raise ValueError(f"Unknown duplicate mode: {duplicates}")
+
+    uploads = await run_in_threadpool(copy_batch, files, chunk_size, metric)
+    batch = {"id": str(uuid.uuid4()), "files": [{"name": name, "jobId": None} for name, _, _ in uploads]}
+    past_batches[batch["id"]] = batch
+
+    task = asyncio.create_task(feed_batch(batch, uploads, chunk_size, duplicates, metric))
+    running_batches.add(task)
+    task.add_done_callback(running_batches.discard)
+    return await describe_batch(batch)
+
+
+def copy_batch(files: list[UploadFile], chunk_size: int | None,
+               metric: str = "error_rate") -> list[tuple[str, str, str]]:
+    """
+    Copies the files of a batch to temporary files, extracting the files within archives.
+
+    The size of every file in an archive is checked against `ARCHIVE_MAX_BYTES` before it is extracted, from
+    the size recorded in the archive, which bounds the bytes that extraction produces.
+
+    Args:
+        files (list[UploadFile]): The uploaded files.
+        chunk_size (int | None): The number of rows to read at a time, part of the upload key of every file.
+        metric (str): The rate the scores are based on, also part of the upload key.
+
+    Returns:
+        list[tuple[str, str, str]]: The name, temporary path and upload key of every file.
+
+    Raises:
+        ArchiveTooLargeError: If an archive holds more than `ARCHIVE_MAX_MEMBERS` entries, or the archives expand
+            to more than `ARCHIVE_MAX_BYTES` bytes.
+        ValueError: If the batch holds more than `BATCH_MAX_FILES` files or no file at all.
+    """
+    uploads = []
+    extracted = 0
+    try:
+        for file in files:
+            for member in expand_upload(file):
+                if len(uploads) == BATCH_MAX_FILES:
+                    raise ValueError(f"A batch can hold at most {BATCH_MAX_FILES} files.")
+                if member is not file:
+                    extracted += member.size
+                    if extracted > ARCHIVE_MAX_BYTES:
+                        raise ArchiveTooLargeError(
+                            f"The archives of a batch can expand to at most {ARCHIVE_MAX_BYTES} bytes.")
+                salt = get_upload_salt(member.filename, chunk_size, metric)
+                uploads.append((member.filename, *copy_upload(member, salt)))
+    except BaseException:
+        for _, file_address, _ in uploads:
+            os.remove(file_address)
+        raise
+
+    if not uploads:
+        raise ValueError("A batch needs at least one file.")
+    return uploads
+
+
+def expand_upload(file: UploadFile) -> list[UploadFile]:
+    """
+    Lists the files within an uploaded archive, or the uploaded file itself if it is not an archive.
+
+    Directories and hidden files of archives (such as the `__MACOSX` metadata of archives made on macOS) are
+    skipped. Nothing is extracted yet: every file of an archive is read from the archive when it is copied.
+
+    Args:
+        file (UploadFile): The uploaded file.
+
+    Returns:
+        list[UploadFile]: The files to process, each readable from its `file` attribute. The `size` of the files
+            of an archive is the size recorded in the archive.
+
+    Raises:
+        ArchiveTooLargeError: If the archive holds more than `ARCHIVE_MAX_MEMBERS` entries.
+    """
+    filename = file.filename or ""
+    is_zip = zipfile.is_zipfile(file.file)
+    file.file.seek(0)
+    if is_zip:
+        archive = zipfile.ZipFile(file.file)
+        entries = archive.infolist()
+        if len(entries) > ARCHIVE_MAX_MEMBERS:
+            raise ArchiveTooLargeError(f"An archive can hold at most {ARCHIVE_MAX_MEMBERS} entries.")
+        # Reading a file of a ZIP archive stops at its recorded size, even if its data would expand further
+        members = [(entry.filename, entry.file_size, archive.open(entry)) for entry in entries if not entry.is_dir()]
+    elif filename.lower().endswith(TAR_EXTENSIONS):
+        archive = tarfile.open(fileobj=file.file, mode="r:*")
+        entries = []
+        # Entries are read one at a time, so that an archive of countless entries is not read to the end
+        for entry in archive:
+            if len(entries) == ARCHIVE_MAX_MEMBERS:
+                raise ArchiveTooLargeError(f"An archive can hold at most {ARCHIVE_MAX_MEMBERS} entries.")
+            entries.append(entry)
+        members = [(entry.name, entry.size, archive.extractfile(entry)) for entry in entries if entry.isfile()]
+    else:
+        return [file]
+
+    return [UploadFile(content, size=size, filename=name) for name, size, content in members if not is_hidden(name)]
+
+
+def is_hidden(path: str) -> bool:
+    """
+    Determines whether a path within an archive is hidden, i.e. whether any part of it starts with a dot or is
+    the `__MACOSX` metadata directory.
+
+    Args:
+        path (str): The path within the archive.
+
+    Returns:
+        bool: True if the path is hidden, False otherwise.
+    """
+    return any(part.startswith(".") or part == "__MACOSX" for part in path.split("/"))
+
+
+async def feed_batch(batch: dict, uploads: list[tuple[str, str, str]], chunk_size: int | None, duplicates: str,
+                     metric: str = "error_rate") -> None:
+    """
+    Submits the files of a batch to the job runner as its workers free up and the memory budget allows,
+    keeping at most one job of the batch per worker queued or running, and records the job of every file.
+
+    The copies of the files that were not handed over to `submit_upload`, such as when the batch is cancelled
+    on shutdown, are removed.
+
+    Args:
+        batch (dict): The batch, as stored in `past_batches`.
+        uploads (list[tuple[str, str, str]]): The name, temporary path and upload key of every file.
+        chunk_size (int | None): The number of rows to read at a time.
+        duplicates (str): "reuse" or "alias", to answer files processed before.
+        metric (str): The rate of `METRICS` to base the scores on.
+    """
+    running = set()
+    submitted = 0
+    try:
+        for entry, (name, file_address, upload_key) in zip(batch["files"], uploads):
+            while True:
+                if len(running) < job_runner.max_workers and job_runner.has_capacity():
+                    try:
+                        job = await submit_upload(file_address, upload_key, name, chunk_size, duplicates, metric,
+                                                  keep_when_full=True)
+                        entry["jobId"] = job.id
+                        running.add(asyncio.ensure_future(job_runner.wait(job)))
+                        break
+                    except (MemoryBudgetFullError, JobQueueFullError):
+                        # Wait for memory to be released, or for the queue filled by other requests while the
+                        # upload was admitted to drain, like for a worker to free up
+                        pass
+                    except Exception as error:
+                        entry["error"] = str(error) or type(error).__name__
+                        break
+                if running:
+                    _, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                else:
+                    await asyncio.sleep(RETRY_DELAY)
+            submitted += 1
+            past_batches[batch["id"]] = batch
+    finally:
+        for _, file_address, _ in uploads[submitted:]:
+            if os.path.exists(file_address):
+                os.remove(file_address)
+
+
+async def describe_batch(batch: dict) -> dict:
+    """
+    Generates the structured representation of a batch's status.
+
+    Args:
+        batch (dict): The batch, as stored in `past_batches`.
+
+    Returns:
+        dict: The batch's ID, the number of files that are "done" and have "failed", and every file with its
+            name, status and job ID once submitted, plus its dataset ID once it is done or its error if it failed.
+    """
+    files = []
+    for entry in batch["files"]:
+        if "error" in entry:
+            description = {"status": Job.FAILED, "error": entry["error"]}
+        elif entry["jobId"] is None:
+            description = {"status": Job.QUEUED}
+        else:
+            description = await get_job(entry["jobId"])
+            if description == "Missing":
+                description = {"id": entry["jobId"], "status": Job.FAILED, "error": "The job is no longer known."}
+            description = {"jobId": description["id"],
+                           **{key: value for key, value in description.items() if key != "id"}}
+        files.append({"name": entry["name"], **description})
+
+    return {
+        "id": batch["id"],
+        "done": sum(file["status"] == Job.DONE for file in files),
+        "failed": sum(file["status"] == Job.FAILED for file in files),
+        "files": files
+    }
+
+
+async def get_batch(id: str) -> str | dict:
+    """
+    Retrieves the status of a batch by its unique ID, with the outcome of every file processed so far.
+
+    Args:
+        id (str): The unique identifier of the batch.
+
+    Returns:
+        str | dict: The batch's status (see `describe_batch`), or "Missing" if the batch is unknown.
+    """
+    batch = past_batches.get(id)
+    if batch is None:
+        return "Missing"
+    return await describe_batch(batch)
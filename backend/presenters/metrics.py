@@ -0,0 +1,247 @@
+"""
+metrics.py
+
+This module provides the timing instrumentation of the API and renders its metrics in the Prometheus
+text format.
+
+It supports:
+- Timing the stages of handling a request (such as parsing, scoring and analyzing an uploaded dataset)
+  with the `StageTimer` of the request, which `TimingMiddleware` reports in a `Server-Timing` header.
+- Recording the duration of every stage and the size of every processed dataset in histograms, along
+  with the latency and status of every request and the lag of the event loop.
+- Rendering these metrics, the usage of the result stores, the number of pending jobs and the memory they
+  reserve for `/metrics`.
+
+Instrumentation is enabled by setting the METRICS_ENABLED environment variable to "1". Otherwise no
+timer is ever created, the middleware is not installed and `stage` returns a shared no-op context, so
+the hot path is left as it was. Metrics are kept per process, so every worker process reports its own.
+"""
+
+import asyncio
+import contextlib
+import os
+import threading
+from contextvars import ContextVar
+from typing import ContextManager, Iterator
+
+from backend.entities.histogram import Histogram
+from backend.entities.stage_timer import StageTimer
+
+# Whether requests are timed and metrics recorded, set by the METRICS_ENABLED environment variable
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "") in ("1", "true")
+
+# Timer of the request or job being handled, if instrumentation is enabled
+request_timer: ContextVar[StageTimer | None] = ContextVar("request_timer", default=None)
+
+# Upper bounds of the buckets of durations in seconds, and of dataset sizes
+SECONDS_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BOUNDS = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+# Seconds between two measurements of the event loop's lag
+LAG_INTERVAL = 0.5
+
+# Context of the stages of requests that are not timed
+NO_STAGE = contextlib.nullcontext()
+
+stage_seconds: dict[str, Histogram] = {}
+dataset_sizes: dict[str, Histogram] = {}
+request_seconds: dict[tuple[str, str], Histogram] = {}
+request_counts: dict[tuple[str, str, int], int] = {}
+event_loop_lag = Histogram(SECONDS_BOUNDS)
+
+# Event loops whose lag is being measured, kept so that their tasks are not garbage-collected
+watched_loops = {}
+
+# Guards the metrics, which are also recorded from the threads finishing jobs
+lock = threading.Lock()
+
+
+def stage(name: str) -> ContextManager:
+    """
+    Times the code run within the context as a stage of the current request, if it is timed.
+
+    Args:
+        name (str): The name of the stage.
+
+    Returns:
+        ContextManager: The context timing the stage, or a no-op context if the request is not timed.
+    """
+    timer = request_timer.get()
+    return timer.stage(name) if timer is not None else NO_STAGE
+
+
+@contextlib.contextmanager
+def timing(enabled: bool) -> Iterator[StageTimer | None]:
+    """
+    Makes a new timer the current one within the context, such as for a job run in a worker process.
+
+    Args:
+        enabled (bool): Whether to time the stages run within the context.
+
+    Yields:
+        StageTimer | None: The timer, or None if not enabled.
+    """
+    timer = StageTimer() if enabled else None
+    token = request_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        request_timer.reset(token)
+
+
+def record_timer(timer: StageTimer) -> None:
+    """
+    Records the stage durations and sizes of a processed dataset in their histograms.
+
+    Args:
+        timer (StageTimer): The timer of the processing.
+    """
+    with lock:
+        for name, seconds in timer.durations.items():
+            get_histogram(stage_seconds, name, SECONDS_BOUNDS).observe(seconds)
+        for name, size in timer.sizes.items():
+            get_histogram(dataset_sizes, name, SIZE_BOUNDS).observe(size)
+
+
+def record_request(method: str, path: str, status: int, seconds: float) -> None:
+    """
+    Records the outcome and latency of a request.
+
+    Args:
+        method (str): The HTTP method of the request.
+        path (str): The route of the request.
+        status (int): The status code of the response.
+        seconds (float): The time taken to answer the request.
+    """
+    with lock:
+        key = method, path, status
+        request_counts[key] = request_counts.get(key, 0) + 1
+        get_histogram(request_seconds, (method, path), SECONDS_BOUNDS).observe(seconds)
+
+
+def get_histogram(histograms: dict, key: object, bounds: tuple[float, ...]) -> Histogram:
+    """
+    Retrieves a histogram of a family by its labels, creating it on first use. The lock must be held.
+
+    Args:
+        histograms (dict): The histograms of the family by labels.
+        key (object): The labels of the histogram.
+        bounds (tuple[float, ...]): The bucket bounds of a new histogram.
+
+    Returns:
+        Histogram: The histogram.
+    """
+    histogram = histograms.get(key)
+    if histogram is None:
+        histogram = histograms[key] = Histogram(bounds)
+    return histogram
+
+
+def watch_event_loop() -> None:
+    """
+    Starts measuring the lag of the running event loop, unless it is measured already.
+
+    The lag is how late a task sleeping for `LAG_INTERVAL` seconds wakes up, i.e. how long the loop was
+    kept busy by other work.
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in watched_loops:
+        watched_loops[loop] = loop.create_task(measure_event_loop_lag())
+
+
+async def measure_event_loop_lag() -> None:
+    """
+    Measures the lag of the running event loop every `LAG_INTERVAL` seconds, forever.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_INTERVAL)
+            with lock:
+                event_loop_lag.observe(max(0.0, loop.time() - start - LAG_INTERVAL))
+    finally:
+        watched_loops.pop(loop, None)
+
+
+def format_labels(**labels: object) -> str:
+    """
+    Formats Prometheus labels, escaping their values.
+
+    Args:
+        **labels: The value of every label.
+
+    Returns:
+        str: The labels in braces, or an empty string if there are none.
+    """
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+def format_histogram(name: str, histogram: Histogram, **labels: object) -> list[str]:
+    """
+    Formats the samples of a histogram.
+
+    Args:
+        name (str): The name of the metric.
+        histogram (Histogram): The histogram.
+        **labels: The labels of the histogram.
+
+    Returns:
+        list[str]: The cumulative bucket counts, sum and count of the histogram, one sample per line.
+    """
+    lines = [f"{name}_bucket{format_labels(**labels, le='+Inf' if bound == float('inf') else f'{bound:g}')} {count}"
+             for bound, count in histogram.get_cumulative_counts()]
+    lines.append(f"{name}_sum{format_labels(**labels)} {histogram.total:.9g}")
+    lines.append(f"{name}_count{format_labels(**labels)} {histogram.count}")
+    return lines
+
+
+def render_metrics(store_statistics: dict, pending_jobs: int, reserved_memory: int) -> str:
+    """
+    Renders every metric in the Prometheus text exposition format.
+
+    Args:
+        store_statistics (dict): The usage counters of every result store by name, from `get_store_statistics`.
+        pending_jobs (int): The number of dataset jobs queued or running.
+        reserved_memory (int): The number of bytes of the memory budget reserved by these jobs.
+
+    Returns:
+        str: The metrics.
+    """
+    lines = []
+
+    def add(name: str, kind: str, description: str, samples: list[str]) -> None:
+        lines.extend([f"# HELP {name} {description}", f"# TYPE {name} {kind}", *samples])
+
+    with lock:
+        add("bias_stage_seconds", "histogram", "Time spent in each stage of processing a dataset.",
+            [line for name, histogram in sorted(stage_seconds.items())
+             for line in format_histogram("bias_stage_seconds", histogram, stage=name)])
+        for name, histogram in sorted(dataset_sizes.items()):
+            add(f"bias_dataset_{name}", "histogram", f"Number of {name} of every processed dataset.",
+                format_histogram(f"bias_dataset_{name}", histogram))
+        add("bias_http_requests_total", "counter", "Requests answered, by route and status.",
+            [f"bias_http_requests_total{format_labels(method=method, path=path, status=status)} {count}"
+             for (method, path, status), count in sorted(request_counts.items())])
+        add("bias_http_request_seconds", "histogram", "Time taken to answer requests, by route.",
+            [line for (method, path), histogram in sorted(request_seconds.items())
+             for line in format_histogram("bias_http_request_seconds", histogram, method=method, path=path)])
+        add("bias_event_loop_lag_seconds", "histogram", "Delay of the event loop in running ready tasks.",
+            format_histogram("bias_event_loop_lag_seconds", event_loop_lag))
+
+    add("bias_store_entries", "gauge", "Entries held by every result store.",
+        [f"bias_store_entries{format_labels(store=store)} {counters['entries']}"
+         for store, counters in store_statistics.items()])
+    for counter, description in (("hits", "Lookups of every result store that found an entry."),
+                                 ("misses", "Lookups of every result store that found no entry."),
+                                 ("evictions", "Entries removed from every result store to stay within its bounds.")):
+        add(f"bias_store_{counter}_total", "counter", description,
+            [f"bias_store_{counter}_total{format_labels(store=store)} {counters[counter]}"
+             for store, counters in store_statistics.items()])
+    add("bias_jobs_pending", "gauge", "Dataset jobs queued or running.", [f"bias_jobs_pending {pending_jobs}"])
+    add("bias_memory_reserved_bytes", "gauge", "Memory reserved by dataset jobs queued or running.",
+        [f"bias_memory_reserved_bytes {reserved_memory}"])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,137 @@
+"""
+monitoring.py
+
+This module provides functions for monitoring the fairness of a model in production, from a stream of its
+scored predictions rather than from uploaded files.
+
+It supports:
+- Creating monitors with sliding or tumbling time windows.
+- Ingesting batches of timestamped events into every window of a monitor.
+- Scoring every window with the bias calculators used for uploaded datasets, from the per-trait
+  statistics of the window alone.
+
+Monitors are kept in the memory of the process serving them, so the events and queries of a monitor must be
+sent to the same worker process (see the README).
+"""
+
+import os
+import uuid
+
+import pandas as pd
+from starlette.concurrency import run_in_threadpool
+from backend.entities.dataset_files.statistics_file import StatisticsFile
+from backend.entities.monitor import Monitor
+from backend.entities.monitoring_window import MonitoringWindow
+from backend.entities.trait_statistics import TraitStatistics
+from backend.use_cases.bias_calculators.calculator_pipeline import CalculatorPipeline
+from backend.use_cases.result_stores.memory_store import MemoryStore
+
+# Live monitors by ID, up to the number set by the MONITOR_MAX_COUNT environment variable. Monitors change as
+# events are ingested, so they are bounded by number; the memory of each is bounded by its windows (see
+# `MonitoringWindow`)
+monitors = MemoryStore(max_entries=int(os.getenv("MONITOR_MAX_COUNT", 100)))
+
+# Calculators scoring every window, the registered ones (see `REGISTERED_CALCULATORS`)
+monitor_pipeline = CalculatorPipeline()
+
+
+async def create_monitor(windows: dict[str, tuple[int, int | None]]) -> str:
+    """
+    Creates a monitor without any event.
+
+    Args:
+        windows (dict[str, tuple[int, int | None]]): The size and step in seconds of every window by name. A step
+            of None makes a tumbling window.
+
+    Returns:
+        str: The unique identifier of the monitor.
+
+    Raises:
+        ValueError: If no window is given, or the size or step of a window is invalid.
+    """
+    monitor = Monitor(str(uuid.uuid4()), {name: MonitoringWindow(size, step) for name, (size, step) in windows.items()})
+    monitors[monitor.id] = monitor
+    return monitor.id
+
+
+async def ingest_events(id: str, events: list[dict]) -> str | dict:
+    """
+    Adds a batch of events to every window of a monitor.
+
+    Args:
+        id (str): The unique identifier of the monitor.
+        events (list[dict]): The events, each with a "timestamp", the "marked" and "actual" outcomes and the
+            protected attributes of the person the prediction concerns.
+
+    Returns:
+        str | dict: The number of events ingested and dropped (see `Monitor.ingest`), or "Missing" if there is
+            no such monitor.
+
+    Raises:
+        ValueError: If the events lack a required field or hold invalid values.
+    """
+    monitor = monitors.get(id)
+    if monitor is None:
+        return "Missing"
+    return await run_in_threadpool(monitor.ingest, pd.DataFrame.from_records(events))
+
+
+async def get_monitor(id: str) -> str | dict:
+    """
+    Scores every window of a monitor.
+
+    Args:
+        id (str): The unique identifier of the monitor.
+
+    Returns:
+        str | dict: The ID of the monitor and its scored windows (see `score_window`), or "Missing" if there is
+            no such monitor.
+    """
+    monitor = monitors.get(id)
+    if monitor is None:
+        return "Missing"
+
+    windows = monitor.get_windows()
+    return {
+        "id": id,
+        "windows": [{"name": name, **await run_in_threadpool(score_window, window, monitor.numeric_categories)}
+                    for name, window in windows.items()]
+    }
+
+
+def score_window(window: dict, numeric_categories: set) -> dict:
+    """
+    Scores the events within a window with every calculator of `monitor_pipeline`.
+
+    The per-value statistics of the window are scored as a `StatisticsFile`, so numerical categories are
+    grouped into ranges from the values within the window, as for an uploaded dataset.
+
+    Args:
+        window (dict): A window described by `Monitor.get_windows`.
+        numeric_categories (set): The numerical categories of the monitor.
+
+    Returns:
+        dict: The "size", "step", "start", "end", "count" and "dropped" of the window, its overall "scores" by
+            calculator (None while it holds no events), and its "categories" with their scores and the count and
+            FPR of every trait.
+    """
+    statistics: dict[str, TraitStatistics] = window.pop("statistics")
+    resolutions: dict[str, float] = window.pop("resolutions")
+    if not window["count"]:
+        return {**window, "scores": None, "categories": []}
+
+    dataset_file = StatisticsFile(statistics, numeric_categories & set(statistics), resolutions)
+    scores = monitor_pipeline.process_dataset(dataset_file)
+    category_statistics = {category: dataset_file.get_category_statistics(category)
+                           for category in dataset_file.categories}
+
+    return {
+        **window,
+        "scores": scores["overall"],
+        "categories": [{
+            "name": category,
+            "scores": scores["categories"][category],
+            "traits": [{"name": trait, "count": count, "fpr": fpr}
+                       for trait, count, fpr in zip(values.traits, values.counts.tolist(), values.get_fprs().tolist())]
+        } for category, values in sorted(category_statistics.items())]
+    }
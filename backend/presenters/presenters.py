@@ -4,38 +4,335 @@ presenters.py
 This module provides functions for handling datasets and comparisons within the backend.
 
 It supports:
-- Storing and retrieving datasets and their comparisons.
-- Processing uploaded dataset files to calculate fairness metrics.
-- Generating structured representations of datasets with scores and analyses.
+- Storing and retrieving datasets and their comparisons. Comparisons can be stored as references to
+  two stored datasets, and are then assembled, with the differences between the datasets, when read.
+- Processing uploaded dataset files to calculate fairness metrics, as background jobs run in worker
+  processes so that the event loop keeps serving other requests meanwhile.
+- Recognizing repeated uploads of the same file by a hash of their content, to return the stored
+  dataset instead of processing the file again.
+- Appending new rows to a stored dataset by merging their per-value statistics into the stored ones,
+  so the cost of an update depends on the new rows only.
+- Generating structured representations of datasets with scores and analyses, optionally limited to the
+  top traits of every category with the others folded into one "other" trait.
+- Admitting uploads against a memory budget before they are parsed: an upload whose estimated memory does
+  not fit is streamed in chunks instead when that fits, and is otherwise rejected.
 
 Dependencies include modules for file handling, bias analysis, and bias calculations.
 """
 
+import json
+import os
+import tempfile
 import uuid
+from functools import partial
+
+import numpy as np
+import xxhash
 from fastapi import UploadFile
-from backend.entities.dataset_files.csv_file import CSVFile
+from starlette.concurrency import run_in_threadpool
+from backend.entities.encoded_response import EncodedResponse
+from backend.entities.job import Job
+from backend.entities.stage_timer import StageTimer
+from backend.presenters import metrics
+from backend.presenters.dataset_formats import ENCODERS, JSON, encode_json
+from backend.presenters.metrics import stage
+from backend.entities.dataset_files.dataset_file import DatasetFile
+from backend.entities.dataset_files.dataset_file_factory import create_dataset_file, estimate_dataset_memory
+from backend.entities.dataset_files.statistics_file import StatisticsFile
+from backend.entities.trait_statistics import TraitStatistics
 from backend.use_cases.bias_analyzers.simple_analyzer import SimpleAnalyzer
-from backend.use_cases.bias_calculators.variance_calculator import VarianceCalculator
+from backend.use_cases.bias_calculators.calculator_pipeline import CalculatorPipeline
+from backend.use_cases.job_runners.job_runner import JobQueueFullError, JobRunner
+from backend.use_cases.memory_budgets.memory_budget import MemoryBudget, MemoryBudgetFullError, get_budget_limit
+from backend.use_cases.statistics_engines.statistics_engine import StatisticsEngine
+from backend.use_cases.result_stores.result_store_factory import create_memory_store, create_result_store
+
+
+class DatasetJobError(RuntimeError):
+    """
+    Raised when a job processing an uploaded file fails, with the error of the job as its message.
+    """
+
+
+# Storage for datasets, comparisons and job statuses, configured by the STORE_* environment variables. Job
+# statuses are stored so that a job can be polled from any worker process when the storage is shared.
+past_datasets = create_result_store("datasets")
+past_comparisons = create_result_store("comparisons")
+past_jobs = create_result_store("jobs")
+
+# Per-value statistics of stored datasets by dataset ID, to append rows to them (see `collect_value_statistics`)
+past_statistics = create_result_store("statistics")
+
+# Dataset IDs by upload key (see `copy_upload`), and the datasets that aliased IDs refer to
+past_uploads = create_result_store("uploads")
+past_aliases = create_result_store("aliases")
+
+# HTTP-encoded responses of stored datasets and comparisons by "<kind>:<id>", in each worker process, so that
+# repeated reads skip JSON encoding and compression
+encoded_results = create_memory_store(EncodedResponse.get_size)
+
+# Assembled payloads of reference-based comparisons, cached by comparison ID in each worker process
+assembled_comparisons = create_memory_store(max_entries=1000)
+
+# Ways of answering a repeated upload: with the ID of the stored dataset, or with a new ID aliasing it
+DUPLICATE_MODES = ("reuse", "alias")
 
-# In-memory storage for datasets and comparisons
-past_datasets = {}
-past_comparisons = {}
+# Ways of choosing the traits kept when their number is limited: the most common ones, or those whose rate
+# deviates most from that of their whole category
+TRAIT_RANKINGS = ("count", "deviation")
+
+# Name of the trait the traits left out are folded into when their number is limited, which is told apart from a
+# real trait of the same name by its `aggregated` flag
+OTHER_TRAIT = "other"
+
+# Number of bytes copied and hashed at a time when receiving an upload
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Number of server processes (gunicorn workers, set by the WEB_CONCURRENCY environment variable) sharing the
+# machine, between which the job workers are divided by default
+SERVER_PROCESSES = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+
+# Worker processes for dataset generation, sized by the JOB_WORKERS and JOB_QUEUE_SIZE environment variables, with
+# the CPUs divided between the server processes by default
+job_runner = JobRunner(int(os.getenv("JOB_WORKERS", max(1, (os.cpu_count() or 1) // SERVER_PROCESSES))),
+                       int(os.getenv("JOB_QUEUE_SIZE", 16)))
+
+# Memory the dataset jobs of this process may reserve together, set in bytes by the MEMORY_BUDGET environment
+# variable ("0" for no limit), half of the memory of the container or machine divided between the server processes
+# otherwise
+memory_budget = MemoryBudget(get_budget_limit(os.getenv("MEMORY_BUDGET"), SERVER_PROCESSES))
+
+# Number of rows read at a time when an upload is streamed because loading it at once would not fit in the budget
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", 100_000))
 
 
 async def get_comparison(id: str) -> str | dict:
     """
     Retrieves a previously stored comparison by its unique ID.
 
+    Comparisons saved as references to datasets are returned in the same form as comparisons saved with
+    `save_comparison`: a JSON string with the two datasets, plus the metadata and differences of the
+    comparison.
+
     Args:
         id (str): The unique identifier for the comparison.
 
     Returns:
-        str | dict: The comparison data if found, or "Missing" if the ID is not in storage.
+        str | dict: The comparison data if found, or "Missing" if the ID or one of the datasets it refers to is
+            not in storage or has been evicted.
     """
-    if id not in past_comparisons:
+    comparison = find_comparison(id)
+    if comparison is None:
         return "Missing"
     else:
-        return past_comparisons[id]
+        return comparison
+
+
+def find_comparison(id: str) -> str | dict | None:
+    """
+    Retrieves a stored comparison by its ID, assembling it if it was saved as references to datasets.
+
+    Args:
+        id (str): The unique identifier for the comparison.
+
+    Returns:
+        str | dict | None: The comparison data, or None if the comparison or one of its datasets is not in storage.
+    """
+    comparison = past_comparisons.get(id)
+    if isinstance(comparison, dict) and "dataset1Id" in comparison:
+        return assemble_comparison(id, comparison)
+    return comparison
+
+
+def assemble_comparison(id: str, comparison: dict) -> str | None:
+    """
+    Assembles the payload of a comparison saved as references to datasets. The payload is cached.
+
+    Args:
+        id (str): The unique identifier for the comparison.
+        comparison (dict): The stored comparison, with the IDs of its datasets and its metadata.
+
+    Returns:
+        str | None: The comparison as a JSON string, or None if one of its datasets is not in storage.
+
+    Raises:
+        ValueError: If the scores of the datasets are based on different rates.
+    """
+    payload = assembled_comparisons.get(id)
+    if payload is not None:
+        return payload
+
+    dataset1 = find_dataset(comparison["dataset1Id"])
+    dataset2 = find_dataset(comparison["dataset2Id"])
+    if dataset1 is None or dataset2 is None:
+        return None
+
+    payload = json.dumps({
+        "dataset1": dataset1,
+        "dataset2": dataset2,
+        "metadata": comparison["metadata"],
+        "differences": compare_datasets(dataset1, dataset2)
+    })
+    assembled_comparisons[id] = payload
+    return payload
+
+
+def compare_datasets(dataset1: dict, dataset2: dict) -> dict:
+    """
+    Calculates how the scores of a dataset differ from those of another.
+
+    Args:
+        dataset1 (dict): The dataset compared against.
+        dataset2 (dict): The dataset compared.
+
+    Returns:
+        dict: The difference in overall score, and for every category of both datasets, the difference in
+            FPR score and in mean FPR of every trait of both (None where a rate is undefined in either).
+
+    Raises:
+        ValueError: If the scores of the datasets are based on different rates, which cannot be compared.
+    """
+    check_same_metric(dataset1, dataset2)
+    categories1 = {category["name"]: category for category in dataset1["categories"]}
+    differences = []
+    for category2 in dataset2["categories"]:
+        category1 = categories1.get(category2["name"])
+        if category1 is None:
+            continue
+
+        fprs1 = {trait["name"]: trait["fprMean"] for trait in category1["traits"]}
+        differences.append({
+            "name": category2["name"],
+            "fprScore": category2["fprScore"] - category1["fprScore"],
+            "traits": [{"name": trait["name"],
+                        "fprMean": None if None in (trait["fprMean"], fprs1[trait["name"]])
+                        else trait["fprMean"] - fprs1[trait["name"]]}
+                       for trait in category2["traits"] if trait["name"] in fprs1]
+        })
+
+    return {"score": dataset2["score"] - dataset1["score"], "categories": differences}
+
+
+def check_same_metric(dataset1: dict, dataset2: dict) -> None:
+    """
+    Checks that the scores of two datasets are based on the same rate. Datasets stored before the rate could
+    be chosen are based on the error rate.
+
+    Args:
+        dataset1 (dict): The first dataset.
+        dataset2 (dict): The second dataset.
+
+    Raises:
+        ValueError: If the datasets are based on different rates.
+    """
+    metric1 = dataset1.get("metric", "error_rate")
+    metric2 = dataset2.get("metric", "error_rate")
+    if metric1 != metric2:
+        raise ValueError(f"Datasets scored by {metric1} cannot be compared with datasets scored by {metric2}.")
+
+
+def limit_traits(dataset: dict, top_k: int | None, rank_by: str = "count") -> dict:
+    """
+    Limits every category of a dataset to its top traits, folding the others into one trait (see
+    `limit_category_traits`). Stored datasets keep every trait, so the full lists remain available.
+
+    Args:
+        dataset (dict): The structured representation of the dataset.
+        top_k (int | None): The number of traits to keep in every category, or None to keep them all.
+        rank_by (str): How to choose the traits kept, one of `TRAIT_RANKINGS`.
+
+    Returns:
+        dict: The dataset with limited categories, or the dataset itself if no category has more than `top_k`
+            traits.
+
+    Raises:
+        ValueError: If `top_k` is less than 1 or `rank_by` is not one of `TRAIT_RANKINGS`.
+    """
+    if top_k is None:
+        return dataset
+    if top_k < 1:
+        raise ValueError("At least one trait must be kept.")
+    if rank_by not in TRAIT_RANKINGS:
+        raise ValueError(f"Unknown trait ranking: {rank_by}")
+    if all(len(category["traits"]) <= top_k for category in dataset["categories"]):
+        return dataset
+    metric = dataset.get("metric", "error_rate")
+    return {**dataset, "categories": [limit_category_traits(category, top_k, rank_by, metric)
+                                      for category in dataset["categories"]]}
+
+
+def limit_category_traits(category: dict, top_k: int, rank_by: str = "count", metric: str = "error_rate") -> dict:
+    """
+    Keeps the top traits of a category, in their original order, followed by an `OTHER_TRAIT` trait
+    aggregating the others, flagged as `aggregated`.
+
+    The top traits are the most common ones, or those whose rate deviates most from the rate of the whole
+    category (traits without a rate coming last). They are found by partial selection, in time linear in the
+    number of traits. The aggregated trait counts the rows of the traits left out. For the error rate, its rate
+    is their mean rate weighted by their number of rows, which is exactly the error rate of their rows; the other
+    rates are relative to rows the category does not count (such as the actual negatives for the false positive
+    rate), so the rate of the aggregated trait is left undefined. The number of traits left out is reported as
+    `otherTraits`.
+
+    Args:
+        category (dict): The structured representation of the category, from `build_category`.
+        top_k (int): The number of traits to keep.
+        rank_by (str): How to choose the traits kept, one of `TRAIT_RANKINGS`.
+        metric (str): The rate of `METRICS` the rates of the traits are based on.
+
+    Returns:
+        dict: The category with at most `top_k` traits plus the aggregated one, or the category itself if it
+            has at most `top_k` traits.
+    """
+    traits = category["traits"]
+    if len(traits) <= top_k:
+        return category
+
+    counts = np.array([trait["count"] for trait in traits], dtype=float)
+    rates = np.array([np.nan if trait["fprMean"] is None else trait["fprMean"] for trait in traits], dtype=float)
+    defined = ~np.isnan(rates)
+    if rank_by == "count":
+        keys = counts
+    else:
+        mean = np.average(rates[defined], weights=counts[defined]) if counts[defined].sum() else 0.0
+        keys = np.where(defined, np.abs(rates - mean), -1.0)
+
+    kept = np.zeros(len(traits), dtype=bool)
+    kept[np.argpartition(-keys, top_k - 1)[:top_k]] = True
+    folded = ~kept & defined
+    other = {
+        "name": OTHER_TRAIT,
+        "count": int(counts[~kept].sum()),
+        "fprMean": float(np.average(rates[folded], weights=counts[folded]))
+        if metric == "error_rate" and counts[folded].sum() else None,
+        "aggregated": True
+    }
+    return {
+        **category,
+        "traits": [trait for trait, is_kept in zip(traits, kept) if is_kept] + [other],
+        "otherTraits": len(traits) - top_k
+    }
+
+
+def find_dataset(id: str) -> dict | None:
+    """
+    Retrieves a stored dataset by its ID or by an ID aliasing it.
+
+    Args:
+        id (str): The unique identifier for the dataset.
+
+    Returns:
+        dict | None: The dataset, with `id` set to the requested ID, or None if it is not in storage.
+    """
+    dataset = past_datasets.get(id)
+    if dataset is not None:
+        return dataset
+
+    original_id = past_aliases.get(id)
+    dataset = past_datasets.get(original_id) if original_id is not None else None
+    if dataset is None:
+        return None
+    return {**dataset, "id": id}
 
 
 async def get_dataset(id: str) -> str | dict:
@@ -46,12 +343,13 @@ async def get_dataset(id: str) -> str | dict:
         id (str): The unique identifier for the dataset.
 
     Returns:
-        str | dict: The dataset information if found, or "Missing" if the ID is not in storage.
+        str | dict: The dataset information if found, or "Missing" if the ID is not in storage or has been evicted.
     """
-    if id not in past_datasets:
+    dataset = find_dataset(id)
+    if dataset is None:
         return "Missing"
     else:
-        return past_datasets[id]
+        return dataset
 
 
 async def save_comparison(data) -> str:
@@ -66,49 +364,840 @@ async def save_comparison(data) -> str:
     """
     id = str(uuid.uuid4())
     past_comparisons[id] = data
+    encode_result("comparison", id, data)
     return id
 
 
-async def generate_dataset(file: UploadFile) -> dict:
+async def save_comparison_reference(dataset1_id: str, dataset2_id: str, metadata: dict | None = None) -> str:
     """
-    Processes an uploaded dataset file and generates a structured representation.
+    Saves a comparison between two stored datasets by reference, and generates a unique ID for it.
+
+    Only the IDs of the datasets and the metadata are stored; the comparison is assembled when it is read.
+
+    Args:
+        dataset1_id (str): The ID of the first dataset.
+        dataset2_id (str): The ID of the second dataset.
+        metadata (dict | None): Information about the comparison to return along with it.
+
+    Returns:
+        str: The unique identifier for the stored comparison, or "Missing" if one of the datasets is not in
+            storage.
+
+    Raises:
+        ValueError: If the scores of the datasets are based on different rates.
+    """
+    dataset1 = find_dataset(dataset1_id)
+    dataset2 = find_dataset(dataset2_id)
+    if dataset1 is None or dataset2 is None:
+        return "Missing"
+    check_same_metric(dataset1, dataset2)
+
+    id = str(uuid.uuid4())
+    past_comparisons[id] = {"dataset1Id": dataset1_id, "dataset2Id": dataset2_id, "metadata": metadata or {}}
+    return id
+
+
+def build_category(dataset_file: DatasetFile, category: str, scores: dict | None = None) -> dict:
+    """
+    Generates the structured representation of one category of a processed dataset.
+
+    The trait counts and FPRs of the category are looked up once, so building the category takes time
+    linear in its number of traits.
+
+    Args:
+        dataset_file (DatasetFile): The processed dataset the category belongs to.
+        category (str): The category to represent.
+        scores (dict | None): The scores of the category by calculator, from a `CalculatorPipeline`.
+
+    Returns:
+        dict: The category's name, FPR score, scores by calculator if given, and the count and mean FPR of each
+            of its traits.
+    """
+    trait_counts = dataset_file.get_category_trait_counts(category)
+    trait_fprs = dataset_file.get_category_trait_fprs(category)
+    return {
+        "name": category,
+        "fprScore": dataset_file.get_category_score(category),
+        **({"scores": scores} if scores is not None else {}),
+        "traits": [{"name": trait, "count": trait_counts[trait], "fprMean": fpr} for trait, fpr in trait_fprs.items()]
+    }
+
+
+def build_dataset(file_address: str, filename: str | None, chunk_size: int | None = None,
+                  metric: str = "error_rate", timed: bool = False) -> tuple[dict, dict, StageTimer | None]:
+    """
+    Processes a dataset file and generates a structured representation. This runs in a worker process.
 
     The function:
-    - Parses the file into a `DatasetFile` object.
+    - Parses the file into a `DatasetFile` object matching its format (CSV, Parquet or Arrow IPC).
     - Calculates bias metrics using `BiasCalculator`.
     - Analyzes dataset fairness using `BiasAnalyzer`.
     - Constructs a structured representation of the dataset including categories, scores, and descriptions.
 
     Args:
-        file (UploadFile): The uploaded file to process.
+        file_address (str): The path of a temporary copy of the file, which is deleted once it has been read.
+        filename (str | None): The original name of the file.
+        chunk_size (int | None): The number of rows to read at a time. When given, the file is streamed and
+            never held in memory as a whole.
+        metric (str): The rate of `METRICS` to base the scores on.
+        timed (bool): Whether to time every stage of the processing.
 
     Returns:
-        dict: A structured dataset representation containing its ID, name, categories, scores, and analysis.
+        tuple[dict, dict, StageTimer | None]: A structured dataset representation containing its ID, name,
+            categories, scores, and analysis, the per-value statistics of the dataset, and the timer of the
+            processing if timed.
+    """
+    with metrics.timing(timed) as timer:
+        try:
+            with stage("parse"):
+                dataset_file = create_dataset_file(file_address, filename, chunk_size)
+        finally:
+            os.remove(file_address)
+
+        dataset = summarize_dataset(dataset_file, filename, metric)
+        with stage("statistics"):
+            statistics = collect_value_statistics(dataset_file)
+    if timer is not None:
+        measure_dataset(timer, dataset, statistics)
+    return dataset, statistics, timer
+
+
+def append_to_dataset(file_address: str, filename: str | None, chunk_size: int | None, name: str,
+                      statistics: dict, metric: str = "error_rate",
+                      timed: bool = False) -> tuple[dict, dict, StageTimer | None]:
+    """
+    Processes new rows of a dataset together with the per-value statistics of its earlier rows, and
+    generates the structured representation of all the rows. This runs in a worker process.
+
+    Only the new rows are read: their per-value statistics are merged into the earlier ones, and the
+    scores and analysis are computed from the merged statistics.
+
+    Args:
+        file_address (str): The path of a temporary copy of the file with the new rows, which is deleted once
+            it has been read.
+        filename (str | None): The original name of the file with the new rows.
+        chunk_size (int | None): The number of rows to read at a time.
+        name (str): The name of the dataset.
+        statistics (dict): The per-value statistics of the earlier rows, from `collect_value_statistics`.
+        metric (str): The rate of `METRICS` to base the scores on.
+        timed (bool): Whether to time every stage of the processing.
+
+    Returns:
+        tuple[dict, dict, StageTimer | None]: The structured representation of the dataset with a new ID, its
+            merged per-value statistics, and the timer of the processing if timed.
+
+    Raises:
+        ValueError: If a category holds numbers in some rows and text in others, or the metric needs binary
+            outcomes and some rows' are not.
+    """
+    with metrics.timing(timed) as timer:
+        try:
+            with stage("parse"):
+                new_rows = create_dataset_file(file_address, filename, chunk_size)
+        finally:
+            os.remove(file_address)
+
+        with stage("statistics"):
+            statistics = merge_value_statistics(statistics, collect_value_statistics(new_rows))
+            dataset_file = StatisticsFile({category: TraitStatistics.from_dict(values)
+                                           for category, values in statistics["categories"].items()},
+                                          set(statistics["numeric"]), statistics["resolutions"])
+        dataset = summarize_dataset(dataset_file, name, metric)
+    if timer is not None:
+        measure_dataset(timer, dataset, statistics)
+    return dataset, statistics, timer
+
+
+def summarize_dataset(dataset_file: DatasetFile, name: str | None, metric: str = "error_rate") -> dict:
+    """
+    Scores and analyzes a dataset, and generates its structured representation with a new ID.
+
+    The dataset is scored by every calculator of a `CalculatorPipeline` from one set of per-trait statistics,
+    and its own scores are those of the first one (`VarianceCalculator`). Every rate of `METRICS` is derived
+    from the same statistics, so neither the choice of metric nor the number of calculators changes the
+    number of passes over the rows.
+
+    Args:
+        dataset_file (DatasetFile): The loaded dataset.
+        name (str | None): The name of the dataset.
+        metric (str): The rate of `METRICS` to base the scores on, reported in place of the FPRs.
+
+    Returns:
+        dict: A structured dataset representation containing its ID, name, metric, categories, scores (also by
+            calculator), and analysis.
+
+    Raises:
+        ValueError: If the metric is unknown, or needs binary outcomes and the dataset's are not.
     """
-    calculator = VarianceCalculator()
-    dataset_file = CSVFile(file.file)
-    calculator.process_dataset(dataset_file)
-    analyzer = SimpleAnalyzer(dataset_file)
-    categories = list(
-        map(lambda category: {
-            "name": category,
-            "fprScore": dataset_file.get_category_score(category),
-            "traits": list(
-                map(lambda trait: {
-                    "name": trait,
-                    "count": dataset_file.get_category_trait_counts(category)[trait],
-                    "fprMean": dataset_file.get_category_trait_fprs(category)[trait]
-                }, dataset_file.get_category_traits(category))
-            )
-        }, dataset_file.categories)
-    )
-
-    dataset = {
+    with stage("process"):
+        scores = CalculatorPipeline(metric).process_dataset(dataset_file)
+    with stage("analyze"):
+        description = SimpleAnalyzer(dataset_file).get_overall_analysis()
+    with stage("build"):
+        categories = [build_category(dataset_file, category, scores["categories"][category])
+                      for category in dataset_file.categories]
+
+    return {
         "id": str(uuid.uuid4()),
-        "name": file.filename,
+        "name": name,
+        "metric": metric,
         "categories": categories,
         "score": dataset_file.get_overall_score(),
-        "description": analyzer.get_overall_analysis()
+        "scores": scores["overall"],
+        "description": description
     }
+
+
+def measure_dataset(timer: StageTimer, dataset: dict, statistics: dict) -> None:
+    """
+    Records the size of a processed dataset on the timer of its processing.
+
+    Args:
+        timer (StageTimer): The timer of the processing.
+        dataset (dict): The structured representation of the dataset.
+        statistics (dict): The per-value statistics of the dataset, from `collect_value_statistics`.
+    """
+    timer.sizes["rows"] = max((sum(values["counts"]) for values in statistics["categories"].values()), default=0)
+    timer.sizes["columns"] = len(dataset["categories"])
+    timer.sizes["traits"] = sum(len(category["traits"]) for category in dataset["categories"])
+
+
+def collect_value_statistics(dataset_file: DatasetFile) -> dict:
+    """
+    Gathers the per-value statistics of every category of a dataset, with one trait per distinct value.
+
+    Statistics accumulated while loading the dataset in chunks are reused, and the others are computed
+    from the dataset's rows. Numerical categories with more than `DatasetFile.NUMERIC_VALUE_LIMIT` distinct
+    values are coarsened into ranges (see `TraitStatistics.coarsen`), so the statistics stored for later
+    appends, and sent to the worker appending to them, do not grow with the number of rows.
+
+    Args:
+        dataset_file (DatasetFile): The loaded dataset.
+
+    Returns:
+        dict: The sorted names of the numerical categories under "numeric", the per-value statistics of
+            every category under "categories", as saved by `TraitStatistics.to_dict`, and the width of the
+            ranges of numerical categories coarsened into ranges under "resolutions".
+    """
+    missing = {category for category in dataset_file.categories
+               if dataset_file.get_value_statistics(category) is None}
+    statistics = StatisticsEngine().compute_values(dataset_file.df, missing) if missing else {}
+    for category in dataset_file.categories - missing:
+        statistics[category] = dataset_file.get_value_statistics(category)
+
+    numeric = sorted(category for category in dataset_file.categories if dataset_file.is_numeric_category(category))
+    resolutions = {}
+    for category in numeric:
+        statistics[category], resolutions[category] = statistics[category].coarsen(
+            dataset_file.NUMERIC_VALUE_LIMIT, dataset_file.get_value_resolution(category))
+
+    return {
+        "numeric": numeric,
+        "categories": {category: values.to_dict() for category, values in statistics.items()},
+        "resolutions": {category: resolution for category, resolution in resolutions.items() if resolution}
+    }
+
+
+def merge_value_statistics(statistics: dict, other: dict) -> dict:
+    """
+    Combines the per-value statistics of two sets of rows of the same dataset.
+
+    Numerical categories coarsened into ranges in either set are coarsened into ranges at least as wide in
+    the combined statistics, and any numerical category exceeding `DatasetFile.NUMERIC_VALUE_LIMIT` traits
+    once combined is coarsened as well.
+
+    Args:
+        statistics (dict): The statistics of the first rows, from `collect_value_statistics`.
+        other (dict): The statistics of the other rows, from `collect_value_statistics`.
+
+    Returns:
+        dict: The statistics of both sets of rows, in the same form.
+
+    Raises:
+        ValueError: If the two sets of rows do not have the same protected classes, or a category holds numbers in
+            one set of rows and text in the other.
+    """
+    if set(statistics["categories"]) != set(other["categories"]):
+        raise ValueError(f"The new rows have the protected classes {sorted(other['categories'])}, but the dataset "
+                         f"has {sorted(statistics['categories'])}.")
+
+    numeric, other_numeric = set(statistics["numeric"]), set(other["numeric"])
+    categories, resolutions = {}, {}
+    for category, values in other["categories"].items():
+        if (category in numeric) != (category in other_numeric):
+            raise ValueError(f"The category {category} holds numbers in some rows and text in others.")
+        values = TraitStatistics.from_dict(statistics["categories"][category]).merge(TraitStatistics.from_dict(values))
+        if category in numeric:
+            resolution = max(statistics.get("resolutions", {}).get(category, 0.0),
+                             other.get("resolutions", {}).get(category, 0.0))
+            values, resolutions[category] = values.coarsen(DatasetFile.NUMERIC_VALUE_LIMIT, resolution)
+        categories[category] = values.to_dict()
+
+    return {"numeric": sorted(numeric), "categories": categories,
+            "resolutions": {category: resolution for category, resolution in resolutions.items() if resolution}}
+
+
+def get_upload_salt(filename: str | None, chunk_size: int | None, metric: str = "error_rate") -> bytes:
+    """
+    Generates the bytes hashed ahead of an upload's content to form its upload key.
+
+    Besides the content, the result of an upload depends on the versions of the calculators and analyzer,
+    the name of the file (part of the dataset), whether it is streamed in chunks and the metric it is scored by.
+
+    Args:
+        filename (str | None): The original name of the file.
+        chunk_size (int | None): The number of rows to read at a time, if the file is streamed.
+        metric (str): The rate of `METRICS` the scores are based on.
+
+    Returns:
+        bytes: The salt of the upload key.
+    """
+    return json.dumps([CalculatorPipeline(metric).get_versions(), SimpleAnalyzer.__name__, SimpleAnalyzer.VERSION,
+                       filename, chunk_size is not None, metric]).encode()
+
+
+def copy_upload(file: UploadFile, salt: bytes) -> tuple[str, str]:
+    """
+    Copies an uploaded file to a temporary file that worker processes can open, hashing it on the way.
+
+    The upload key is a 128-bit xxHash (XXH3) of the salt followed by the content, so uploads of the same
+    file processed the same way have the same key.
+
+    Args:
+        file (UploadFile): The uploaded file to copy.
+        salt (bytes): The bytes to hash ahead of the content, from `get_upload_salt`.
+
+    Returns:
+        tuple[str, str]: The path of the copy and the upload key.
+    """
+    hasher = xxhash.xxh3_128(salt)
+    extension = os.path.splitext(file.filename or "")[1]
+    with tempfile.NamedTemporaryFile(suffix=extension, delete=False) as copy:
+        while chunk := file.file.read(COPY_BUFFER_SIZE):
+            hasher.update(chunk)
+            copy.write(chunk)
+    return copy.name, hasher.hexdigest()
+
+
+def find_duplicate(upload_key: str, duplicates: str) -> str | None:
+    """
+    Looks up the dataset generated by an earlier upload with the same key.
+
+    Args:
+        upload_key (str): The upload key of the file.
+        duplicates (str): "reuse" to answer with the ID of the stored dataset, or "alias" to answer with a new
+            ID referring to it.
+
+    Returns:
+        str | None: The ID to answer with, or None if the file has not been processed before or its dataset
+            has been evicted.
+
+    Raises:
+        ValueError: If `duplicates` is not one of `DUPLICATE_MODES`.
+    """
+    if duplicates not in DUPLICATE_MODES:
+        raise ValueError(f"Unknown duplicate mode: {duplicates}")
+
+    dataset_id = past_uploads.get(upload_key)
+    if dataset_id is None or dataset_id not in past_datasets:
+        return None
+    if duplicates == "alias":
+        alias = str(uuid.uuid4())
+        past_aliases[alias] = dataset_id
+        return alias
+    return dataset_id
+
+
+def save_built_dataset(built: tuple[dict, dict, StageTimer | None], upload_key: str | None = None,
+                       timer: StageTimer | None = None) -> str:
+    """
+    Stores a dataset generated by `build_dataset` or `append_to_dataset`, with its per-value statistics.
+
+    If the processing was timed, its stage durations and sizes are recorded in the metrics, and added to
+    the timer of the request that submitted it.
+
+    Args:
+        built (tuple[dict, dict, StageTimer | None]): The dataset, its per-value statistics and the timer of its
+            processing, if timed.
+        upload_key (str | None): The upload key of the file the dataset was generated from.
+        timer (StageTimer | None): The timer of the request that submitted the dataset, if timed.
+
+    Returns:
+        str: The ID of the stored dataset.
+    """
+    dataset, statistics, built_timer = built
+    with built_timer.stage("store") if built_timer is not None else metrics.NO_STAGE:
+        past_statistics[dataset["id"]] = statistics
+        dataset_id = save_dataset(dataset, upload_key)
+    if built_timer is not None:
+        metrics.record_timer(built_timer)
+        if timer is not None:
+            timer.merge(built_timer)
+    return dataset_id
+
+
+def save_dataset(dataset: dict, upload_key: str | None = None) -> str:
+    """
+    Stores a generated dataset under its ID.
+
+    Args:
+        dataset (dict): The dataset to store.
+        upload_key (str | None): The upload key of the file the dataset was generated from, to recognize
+            later uploads of the same file.
+
+    Returns:
+        str: The ID of the stored dataset.
+    """
     past_datasets[dataset["id"]] = dataset
+    encode_result("dataset", dataset["id"], dataset)
+    if upload_key is not None:
+        past_uploads[upload_key] = dataset["id"]
+    return dataset["id"]
+
+
+async def submit_dataset(file: UploadFile, chunk_size: int | None = None, duplicates: str = "reuse",
+                         metric: str = "error_rate") -> Job:
+    """
+    Queues an uploaded dataset file to be processed in a worker process.
+
+    Once the job is done, the dataset is stored and its ID is the job's result. If the same file has already
+    been processed, the job is done at once with the stored dataset, without parsing the file again.
+
+    Args:
+        file (UploadFile): The uploaded file to process.
+        chunk_size (int | None): The number of rows to read at a time, to stream large files with bounded memory.
+        duplicates (str): For a file processed before, "reuse" to answer with the ID of the stored dataset, or
+            "alias" to answer with a new ID referring to it.
+        metric (str): The rate of `METRICS` to base the scores on.
+
+    Returns:
+        Job: The queued job.
+
+    Raises:
+        JobQueueFullError: If too many datasets are already being processed.
+        MemoryBudgetExceededError: If processing the file needs more memory than the whole budget.
+        MemoryBudgetFullError: If processing the file needs more memory than is left in the budget.
+        ValueError: If `duplicates` is not one of `DUPLICATE_MODES`.
+    """
+    salt = get_upload_salt(file.filename, chunk_size, metric)
+    with stage("copy"):
+        file_address, upload_key = await run_in_threadpool(copy_upload, file, salt)
+    return await submit_upload(file_address, upload_key, file.filename, chunk_size, duplicates, metric)
+
+
+async def submit_upload(file_address: str, upload_key: str, filename: str | None, chunk_size: int | None = None,
+                        duplicates: str = "reuse", metric: str = "error_rate", keep_when_full: bool = False) -> Job:
+    """
+    Queues a copied upload to be processed in a worker process, unless the same file has already been processed.
+
+    The upload is admitted against `memory_budget` before it is queued (see `admit_upload`), and the memory
+    reserved for it is released once its job has finished. An upload streamed only to fit in the budget is not
+    recorded under its upload key, which stands for the file loaded at once, and its job reports the number of
+    rows read at a time as its `chunkSize`.
+
+    Args:
+        file_address (str): The path of the copy made by `copy_upload`, which is deleted once it has been read,
+            or at once if the upload is not processed.
+        upload_key (str): The upload key of the file.
+        filename (str | None): The original name of the file.
+        chunk_size (int | None): The number of rows to read at a time, to stream large files with bounded memory.
+        duplicates (str): "reuse" or "alias", as for `submit_dataset`.
+        metric (str): The rate of `METRICS` to base the scores on.
+        keep_when_full (bool): Whether to keep the copy if the memory budget or the job queue is full, to submit it
+            again later.
+
+    Returns:
+        Job: The queued job, or a finished job with the stored dataset.
+
+    Raises:
+        JobQueueFullError: If too many datasets are already being processed.
+        MemoryBudgetExceededError: If processing the file needs more memory than the whole budget.
+        MemoryBudgetFullError: If processing the file needs more memory than is left by the datasets already
+            being processed.
+        ValueError: If `duplicates` is not one of `DUPLICATE_MODES`.
+    """
+    reserved = 0
+    try:
+        dataset_id = find_duplicate(upload_key, duplicates)
+        if dataset_id is not None:
+            os.remove(file_address)
+            return job_runner.record(dataset_id, on_change=save_job)
+
+        admitted_chunk_size, reserved = await admit_upload(file_address, filename, chunk_size)
+        job = job_runner.submit(build_dataset, file_address, filename, admitted_chunk_size, metric,
+                                metrics.METRICS_ENABLED,
+                                callback=partial(save_built_dataset,
+                                                 upload_key=upload_key if admitted_chunk_size == chunk_size else None,
+                                                 timer=metrics.request_timer.get()),
+                                on_change=partial(save_admitted_job, reserved=reserved))
+    except BaseException as error:
+        memory_budget.release(reserved)
+        full = isinstance(error, (MemoryBudgetFullError, JobQueueFullError))
+        if os.path.exists(file_address) and not (keep_when_full and full):
+            os.remove(file_address)
+        raise
+
+    if admitted_chunk_size != chunk_size:
+        job.details["chunkSize"] = admitted_chunk_size
+        save_job(job)
+    return job
+
+
+async def admit_upload(file_address: str, filename: str | None, chunk_size: int | None) -> tuple[int | None, int]:
+    """
+    Reserves memory in `memory_budget` to process an upload, before it is parsed.
+
+    The memory is estimated in a thread (see `estimate_admission`), since sampling the file reads from disk,
+    and reserved once the estimate is known.
+
+    Args:
+        file_address (str): The path of the copy made by `copy_upload`.
+        filename (str | None): The original name of the file.
+        chunk_size (int | None): The number of rows to read at a time requested for the upload.
+
+    Returns:
+        tuple[int | None, int]: The number of rows to read at a time to process the upload with, and the number
+            of bytes reserved for it.
+
+    Raises:
+        MemoryBudgetExceededError: If processing the file needs more memory than the whole budget.
+        MemoryBudgetFullError: If processing the file needs more memory than is left in the budget.
+    """
+    if memory_budget.limit is None:
+        return chunk_size, 0
+
+    with stage("admission"):
+        chunk_size, estimate = await run_in_threadpool(estimate_admission, file_address, filename, chunk_size)
+        memory_budget.reserve(estimate)
+    return chunk_size, estimate
+
+
+def estimate_admission(file_address: str, filename: str | None, chunk_size: int | None) -> tuple[int | None, int]:
+    """
+    Estimates the memory needed to process an upload, and how to read it to fit in `memory_budget`.
+
+    The memory is estimated from the size of the file and its first rows or metadata (see
+    `estimate_dataset_memory`). If loading the file at once does not fit in the budget but streaming it in
+    chunks of `STREAM_CHUNK_SIZE` rows takes less memory, the upload is streamed instead. A file that cannot be
+    sampled is assumed to take as much memory as its size, and fails once processed as it would have.
+
+    Args:
+        file_address (str): The path of the copy made by `copy_upload`.
+        filename (str | None): The original name of the file.
+        chunk_size (int | None): The number of rows to read at a time requested for the upload.
+
+    Returns:
+        tuple[int | None, int]: The number of rows to read at a time to process the upload with, and the
+            estimated number of bytes.
+    """
+    estimate = estimate_upload_memory(file_address, filename, chunk_size)
+    if chunk_size is None and not memory_budget.has_room(estimate):
+        streamed_estimate = estimate_upload_memory(file_address, filename, STREAM_CHUNK_SIZE)
+        if streamed_estimate < estimate:
+            return STREAM_CHUNK_SIZE, streamed_estimate
+    return chunk_size, estimate
+
+
+def estimate_upload_memory(file_address: str, filename: str | None, chunk_size: int | None) -> int:
+    """
+    Estimates the peak memory needed to process an upload, or takes its size if it cannot be sampled.
+
+    Args:
+        file_address (str): The path of the copy made by `copy_upload`.
+        filename (str | None): The original name of the file.
+        chunk_size (int | None): The number of rows to read at a time, or None to read the whole file at once.
+
+    Returns:
+        int: The estimated number of bytes.
+    """
+    try:
+        return estimate_dataset_memory(file_address, filename, chunk_size)
+    except Exception:
+        return os.path.getsize(file_address)
+
+
+def describe_job(job: Job) -> dict:
+    """
+    Generates the structured representation of a dataset job's status.
+
+    Args:
+        job (Job): The job to describe.
+
+    Returns:
+        dict: The job's ID and status and its details, plus the dataset ID once it is done or the error if it
+            failed.
+    """
+    description = {"id": job.id, "status": job.get_status(), **job.details}
+    if job.get_status() == Job.DONE:
+        description["datasetId"] = job.result
+    elif job.get_status() == Job.FAILED:
+        description["error"] = job.error
+    return description
+
+
+def save_job(job: Job) -> None:
+    """
+    Stores the status of a dataset job, so that it can be polled from other worker processes.
+
+    Args:
+        job (Job): The job to store the status of.
+    """
+    past_jobs[job.id] = describe_job(job)
+
+
+def save_admitted_job(job: Job, reserved: int) -> None:
+    """
+    Stores the status of a dataset job admitted by `admit_upload`, and releases the memory reserved for it once
+    it has finished.
+
+    Args:
+        job (Job): The job to store the status of.
+        reserved (int): The number of bytes reserved for the job.
+    """
+    save_job(job)
+    if job.is_finished():
+        memory_budget.release(reserved)
+
+
+async def get_job(id: str) -> str | dict:
+    """
+    Retrieves the status of a dataset job by its unique ID.
+
+    Jobs running in this process report their current status; jobs submitted to other worker processes
+    report their last stored status.
+
+    Args:
+        id (str): The unique identifier for the job.
+
+    Returns:
+        str | dict: The job's status, or "Missing" if the job is unknown.
+    """
+    job = job_runner.get_job(id)
+    if job is not None:
+        return describe_job(job)
+
+    description = past_jobs.get(id)
+    if description is None:
+        return "Missing"
+    return description
+
+
+async def get_job_result(id: str) -> str | dict:
+    """
+    Retrieves the dataset generated by a job.
+
+    Args:
+        id (str): The unique identifier for the job.
+
+    Returns:
+        str | dict: The dataset if the job is done, "Pending" if it is queued or running, "Failed" if it
+            failed, or "Missing" if the job is unknown.
+    """
+    description = await get_job(id)
+    if description == "Missing":
+        return "Missing"
+    elif description["status"] == Job.FAILED:
+        return "Failed"
+    elif description["status"] != Job.DONE:
+        return "Pending"
+    else:
+        return await get_dataset(description["datasetId"])
+
+
+async def generate_dataset(file: UploadFile, chunk_size: int | None = None, duplicates: str = "reuse",
+                           metric: str = "error_rate") -> dict:
+    """
+    Processes an uploaded dataset file and generates a structured representation.
+
+    The file is processed by `build_dataset` in a worker process, and the event loop is free to serve
+    other requests until it is done. If the same file has already been processed, the stored dataset is
+    returned without processing it again.
+
+    Args:
+        file (UploadFile): The uploaded file to process.
+        chunk_size (int | None): The number of rows to read at a time. When given, the file is streamed and
+            never held in memory as a whole.
+        duplicates (str): For a file processed before, "reuse" to answer with the stored dataset, or "alias" to
+            answer with it under a new ID.
+        metric (str): The rate of `METRICS` to base the scores on.
+
+    Returns:
+        dict: A structured dataset representation containing its ID, name, categories, scores, and analysis.
+
+    Raises:
+        ValueError: If `duplicates` is not one of `DUPLICATE_MODES`.
+        JobQueueFullError: If too many datasets are already being processed.
+        MemoryBudgetExceededError: If processing the file needs more memory than the whole budget.
+        MemoryBudgetFullError: If processing the file needs more memory than is left in the budget.
+        DatasetJobError: If the dataset could not be processed.
+        RuntimeError: If the dataset was evicted from storage.
+    """
+    return await wait_for_dataset(await submit_dataset(file, chunk_size, duplicates, metric))
+
+
+async def append_dataset(id: str, file: UploadFile, chunk_size: int | None = None) -> str | dict:
+    """
+    Adds new rows to a stored dataset and generates the structured representation of all its rows.
+
+    The new rows are processed by `append_to_dataset` in a worker process, which merges their per-value
+    statistics into the stored statistics of the dataset, so the cost depends on the number of new rows
+    and not on the number of earlier rows. Stored datasets never change: the updated dataset is stored
+    under a new ID, to which later rows can be appended in turn.
+
+    Args:
+        id (str): The unique identifier of the dataset to append rows to.
+        file (UploadFile): The uploaded file with the new rows only, in the same columns as the dataset.
+        chunk_size (int | None): The number of rows to read at a time, to stream large files with bounded memory.
+
+    Returns:
+        str | dict: The updated dataset, or "Missing" if the dataset or its statistics are not in storage.
+
+    Raises:
+        JobQueueFullError: If too many datasets are already being processed.
+        MemoryBudgetExceededError: If processing the rows needs more memory than the whole budget.
+        MemoryBudgetFullError: If processing the rows needs more memory than is left in the budget.
+        DatasetJobError: If the rows could not be processed or appended to the dataset.
+        RuntimeError: If the dataset was evicted from storage.
+    """
+    dataset = find_dataset(id)
+    statistics = past_statistics.get(id)
+    if statistics is None and id in past_aliases:
+        statistics = past_statistics.get(past_aliases[id])
+    if dataset is None or statistics is None:
+        return "Missing"
+
+    with stage("copy"):
+        file_address, _ = await run_in_threadpool(copy_upload, file, b"")
+    reserved = 0
+    try:
+        chunk_size, reserved = await admit_upload(file_address, file.filename, chunk_size)
+        job = job_runner.submit(append_to_dataset, file_address, file.filename, chunk_size, dataset["name"],
+                                statistics, dataset.get("metric", "error_rate"), metrics.METRICS_ENABLED,
+                                callback=partial(save_built_dataset, timer=metrics.request_timer.get()),
+                                on_change=partial(save_admitted_job, reserved=reserved))
+    except BaseException:
+        memory_budget.release(reserved)
+        os.remove(file_address)
+        raise
+    return await wait_for_dataset(job)
+
+
+async def wait_for_dataset(job: Job) -> dict:
+    """
+    Waits for a dataset job to finish and retrieves the dataset it generated.
+
+    Args:
+        job (Job): The job generating the dataset.
+
+    Returns:
+        dict: The generated dataset.
+
+    Raises:
+        DatasetJobError: If the job failed, such as for a file that cannot be parsed or rows that cannot be
+            appended to the dataset.
+        RuntimeError: If the dataset was evicted from storage.
+    """
+    with stage("job"):
+        job = await job_runner.wait(job)
+    if job.get_status() == Job.FAILED:
+        raise DatasetJobError(job.error)
+
+    dataset = find_dataset(job.result)
+    if dataset is None:
+        raise RuntimeError("The dataset was evicted from storage before it could be returned.")
     return dataset
+
+
+def get_encoded_result(kind: str, id: str, media_type: str = JSON, top_k: int | None = None,
+                       rank_by: str = "count") -> EncodedResponse | None:
+    """
+    Retrieves the HTTP-encoded response of a stored dataset or comparison, if it has been encoded already.
+
+    Args:
+        kind (str): "dataset" or "comparison".
+        id (str): The unique identifier for the result.
+        media_type (str): The media type of the response. Datasets support every format of `ENCODERS`, and
+            comparisons only JSON.
+        top_k (int | None): The number of traits kept in every category of a dataset (see `limit_traits`), or
+            None for all of them.
+        rank_by (str): How the traits kept are chosen, one of `TRAIT_RANKINGS`.
+
+    Returns:
+        EncodedResponse | None: The encoded response, or None if it is not cached.
+    """
+    return encoded_results.get(get_encoded_key(kind, id, media_type, top_k, rank_by))
+
+
+def encode_result(kind: str, id: str, content: object | None = None, media_type: str = JSON,
+                  top_k: int | None = None, rank_by: str = "count") -> EncodedResponse | None:
+    """
+    Encodes the HTTP response of a stored dataset or comparison once, and caches it.
+
+    Args:
+        kind (str): "dataset" or "comparison".
+        id (str): The unique identifier for the result.
+        content (object | None): The result, or None to look it up in storage.
+        media_type (str): The media type of the response. Datasets support every format of `ENCODERS`, and
+            comparisons only JSON.
+        top_k (int | None): The number of traits to keep in every category of a dataset (see `limit_traits`), or
+            None to keep them all.
+        rank_by (str): How to choose the traits kept, one of `TRAIT_RANKINGS`.
+
+    Returns:
+        EncodedResponse | None: The encoded response, or None if the result is not in storage or cannot be
+            assembled or encoded, for the API to answer.
+    """
+    try:
+        if content is None:
+            content = find_dataset(id) if kind == "dataset" else find_comparison(id)
+            if content is None:
+                return None
+        if kind == "dataset":
+            encoded = EncodedResponse(ENCODERS[media_type](limit_traits(content, top_k, rank_by)), media_type)
+        else:
+            encoded = EncodedResponse(encode_json(content), media_type)
+    except (TypeError, ValueError):
+        return None
+    encoded_results[get_encoded_key(kind, id, media_type, top_k, rank_by)] = encoded
+    return encoded
+
+
+def get_encoded_key(kind: str, id: str, media_type: str, top_k: int | None, rank_by: str) -> str:
+    """
+    Generates the key under which the HTTP-encoded response of a stored result is cached.
+
+    Args:
+        kind (str): "dataset" or "comparison".
+        id (str): The unique identifier for the result.
+        media_type (str): The media type of the response.
+        top_k (int | None): The number of traits kept in every category of a dataset, or None for all of them.
+        rank_by (str): How the traits kept are chosen.
+
+    Returns:
+        str: The key, "<kind>:<id>:<media type>" followed by ":<top_k>:<rank_by>" if the traits are limited.
+    """
+    key = f"{kind}:{id}:{media_type}"
+    return key if top_k is None else f"{key}:{top_k}:{rank_by}"
+
+
+async def get_store_statistics() -> dict:
+    """
+    Retrieves the usage counters of the dataset and comparison stores, to tune their bounds.
+
+    Returns:
+        dict: The number of entries, hits, misses and evictions of each store, and of the cache of encoded
+            responses.
+    """
+    return {"datasets": past_datasets.get_statistics(), "comparisons": past_comparisons.get_statistics(),
+            "encodedResponses": encoded_results.get_statistics()}
+
+
+async def get_metrics() -> str:
+    """
+    Renders the metrics of this process in the Prometheus text format (see `metrics`).
+
+    Returns:
+        str: The stage, dataset size, request and event loop metrics, with the usage of the result stores, the
+            number of pending dataset jobs and the memory they reserve.
+    """
+    return metrics.render_metrics(await get_store_statistics(), job_runner.count_pending(), memory_budget.reserved)
@@ -26,3 +26,11 @@ def test_calculate_overall_score(test_dataset, test_calculator):
 
 def test_calculate_score(test_dataset, test_calculator):
     assert round(test_calculator.calculate_score(test_dataset.df, "age"), 3) == 5.417
+
+
+def test_selected_metric(test_dataset):
+    statistics = AccuracyCalculator().engine.compute_category(test_dataset.df, "sex")
+    assert AccuracyCalculator(metric="fpr").calculate_statistics_score(statistics) == pytest.approx(3.75)
+    assert AccuracyCalculator(metric="ppv").calculate_statistics_score(statistics) == pytest.approx(3)
+    with pytest.raises(ValueError):
+        AccuracyCalculator(metric="accuracy")
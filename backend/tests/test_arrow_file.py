@@ -0,0 +1,59 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from backend.entities.dataset_files.arrow_file import ArrowFile
+from backend.entities.dataset_files.csv_file import CSVFile
+from backend.use_cases.bias_calculators.variance_calculator import VarianceCalculator
+
+
+@pytest.fixture
+def table():
+    df = pd.read_csv("backend/tests/test_data.csv")
+    df["feature"] = 0.5
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+@pytest.fixture
+def arrow_path(tmp_path, table):
+    path = tmp_path / "test_data.arrow"
+    with pa.ipc.new_file(str(path), table.schema) as writer:
+        writer.write_table(table, max_chunksize=4)
+    return str(path)
+
+
+@pytest.fixture
+def stream_path(tmp_path, table):
+    path = tmp_path / "test_data.arrows"
+    with pa.ipc.new_stream(str(path), table.schema) as writer:
+        writer.write_table(table, max_chunksize=4)
+    return str(path)
+
+
+def test_load_file_reads_used_columns(arrow_path):
+    dataset = ArrowFile(arrow_path)
+    assert set(dataset.df.columns) == {"citizenship", "sex", "age", "marked", "actual"}
+    assert dataset.df["citizenship"].dtype == "category"
+    assert len(dataset.df) == 10
+
+
+def test_load_stream_from_file_object(stream_path):
+    with open(stream_path, "rb") as file:
+        dataset = ArrowFile(file)
+    assert len(dataset.df) == 10
+
+
+def test_process_dataset_matches_csv(arrow_path, stream_path):
+    calculator = VarianceCalculator()
+    datasets = [CSVFile("backend/tests/test_data.csv"), ArrowFile(arrow_path), ArrowFile(stream_path, 3)]
+    for dataset in datasets:
+        calculator.process_dataset(dataset)
+    assert datasets[1].get_overall_score() == datasets[0].get_overall_score()
+    assert datasets[2].get_category_trait_fprs("age") == datasets[0].get_category_trait_fprs("age")
+
+
+def test_estimate_memory(arrow_path, stream_path):
+    # Ten rows in batches of four, with five used columns
+    for path in (arrow_path, stream_path):
+        assert ArrowFile.estimate_memory(path) == 10 * 5 * ArrowFile.CONVERTED_VALUE_BYTES
+        assert ArrowFile.estimate_memory(path, chunk_size=2) == 4 * 5 * ArrowFile.CONVERTED_VALUE_BYTES
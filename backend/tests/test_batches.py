@@ -0,0 +1,85 @@
+import asyncio
+import io
+import os
+import zipfile
+
+import pytest
+from fastapi import UploadFile
+
+from backend.entities.job import Job
+from backend.presenters import batches
+from backend.presenters.batches import get_batch, submit_batch
+from backend.presenters.presenters import get_dataset
+
+
+async def wait_for_batch(id):
+    for _ in range(600):
+        batch = await get_batch(id)
+        if batch["done"] + batch["failed"] == len(batch["files"]):
+            return batch
+        await asyncio.sleep(0.05)
+    raise AssertionError("The batch did not finish.")
+
+
+@pytest.mark.asyncio
+async def test_batch_of_files_and_archive():
+    with open("backend/tests/test_data.csv", "rb") as file:
+        content = file.read()
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("variants/b.csv", content.replace(b"Male", b"Man"))
+        zip_file.writestr("variants/broken.csv", b"sex,marked\nMale,1\n")
+        zip_file.writestr("__MACOSX/variants/._b.csv", b"")
+
+    batch = await submit_batch([UploadFile(io.BytesIO(content), filename="a.csv"),
+                                UploadFile(io.BytesIO(archive.getvalue()), filename="variants.zip")])
+    assert [file["name"] for file in batch["files"]] == ["a.csv", "variants/b.csv", "variants/broken.csv"]
+
+    files = (await wait_for_batch(batch["id"]))["files"]
+    assert [file["status"] for file in files] == [Job.DONE, Job.DONE, Job.FAILED]
+    assert (await get_dataset(files[0]["datasetId"]))["name"] == "a.csv"
+    assert (await get_dataset(files[1]["datasetId"]))["name"] == "variants/b.csv"
+    assert files[2]["error"]
+
+
+@pytest.mark.asyncio
+async def test_batch_size_is_limited(monkeypatch):
+    monkeypatch.setattr(batches, "BATCH_MAX_FILES", 1)
+    files = [UploadFile(io.BytesIO(b"sex,marked,actual\nMale,1,0\n"), filename=f"{i}.csv") for i in range(2)]
+    with pytest.raises(ValueError):
+        await submit_batch(files)
+    with pytest.raises(ValueError):
+        await submit_batch([])
+    assert await get_batch("unknown") == "Missing"
+
+
+@pytest.mark.asyncio
+async def test_archive_size_is_limited(monkeypatch):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr("a.csv", b"sex,marked,actual\n" + b"Male,1,0\n" * 10_000)
+        zip_file.writestr("b.csv", b"sex,marked,actual\nMale,1,0\n")
+
+    monkeypatch.setattr(batches, "ARCHIVE_MAX_MEMBERS", 1)
+    with pytest.raises(batches.ArchiveTooLargeError):
+        await submit_batch([UploadFile(io.BytesIO(archive.getvalue()), filename="a.zip")])
+
+    monkeypatch.setattr(batches, "ARCHIVE_MAX_MEMBERS", 2)
+    monkeypatch.setattr(batches, "ARCHIVE_MAX_BYTES", 50_000)
+    with pytest.raises(batches.ArchiveTooLargeError):
+        await submit_batch([UploadFile(io.BytesIO(archive.getvalue()), filename="a.zip")])
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_removes_its_copies(monkeypatch):
+    monkeypatch.setattr(batches.job_runner, "has_capacity", lambda: False)
+    files = [UploadFile(io.BytesIO(b"sex,marked,actual\nMale,1,0\n"), filename=f"{i}.csv") for i in range(2)]
+    uploads = batches.copy_batch(files, None)
+    batch = {"id": "cancelled", "files": [{"name": name, "jobId": None} for name, _, _ in uploads]}
+
+    task = asyncio.create_task(batches.feed_batch(batch, uploads, None, "reuse"))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert not any(os.path.exists(file_address) for _, file_address, _ in uploads)
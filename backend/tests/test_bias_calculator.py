@@ -29,3 +29,16 @@ def test_obtain_fpr_map(test_dataset, test_calculator):
 def test_update_number_kinds_by_irq(test_dataset, test_calculator):
     assert (test_calculator.update_number_kinds_by_irq(test_dataset.df, "age")["age"].tolist()
             == ['0-16', '39+', '0-16', '17-25', '17-25', '26-38', '39+', '39+', '0-16', '39+'])
+
+
+def test_obtain_dataset_statistics_reuses_cache(test_dataset, test_calculator):
+    first = test_calculator.obtain_dataset_statistics(test_dataset)
+    second = test_calculator.obtain_dataset_statistics(test_dataset)
+    assert first["sex"] is second["sex"]
+    assert first["sex"].get_fpr_map() == {"Female": 0.4, "Male": 0.4}
+
+
+def test_process_dataset_keeps_numeric_column(test_dataset, test_calculator):
+    test_calculator.obtain_dataset_statistics(test_dataset)
+    assert test_dataset.df["age"].tolist()[:3] == [11, 39, 16]
+    assert test_dataset.get_numeric_bins("age").labels == ["0-16", "17-25", "26-38", "39+"]
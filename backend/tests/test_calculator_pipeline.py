@@ -0,0 +1,45 @@
+import pytest
+
+from backend.entities.dataset_files.csv_file import CSVFile
+from backend.use_cases.bias_calculators.accuracy_calculator import AccuracyCalculator
+from backend.use_cases.bias_calculators.calculator_pipeline import CalculatorPipeline, register_calculator
+from backend.use_cases.bias_calculators.variance_calculator import VarianceCalculator
+from backend.use_cases.statistics_engines.statistics_engine import StatisticsEngine
+
+
+class CountingEngine(StatisticsEngine):
+    def __init__(self):
+        super().__init__()
+        self.passes = 0
+
+    def compute(self, df, categories, numeric_bins=None):
+        self.passes += 1
+        return super().compute(df, categories, numeric_bins)
+
+
+@pytest.fixture
+def test_dataset():
+    return CSVFile("backend/tests/test_data.csv")
+
+
+def test_scores_match_separate_calculators(test_dataset):
+    engine = CountingEngine()
+    scores = CalculatorPipeline(engine=engine).process_dataset(test_dataset)
+    assert engine.passes == 1
+
+    for name, calculator_class in (("variance", VarianceCalculator), ("accuracy", AccuracyCalculator)):
+        dataset = CSVFile("backend/tests/test_data.csv")
+        calculator_class().process_dataset(dataset)
+        assert scores["overall"][name] == pytest.approx(dataset.get_overall_score())
+        for category in dataset.categories:
+            assert scores["categories"][category][name] == pytest.approx(dataset.get_category_score(category))
+
+    assert test_dataset.get_overall_score() == scores["overall"]["variance"]
+
+
+def test_register_calculator():
+    register_calculator("variance", VarianceCalculator)
+    with pytest.raises(ValueError):
+        register_calculator("variance", AccuracyCalculator)
+    with pytest.raises(ValueError):
+        CalculatorPipeline(calculators={})
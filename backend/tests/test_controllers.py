@@ -1,8 +1,13 @@
+import io
+
 import pytest
+from fastapi import HTTPException, UploadFile
 
 from backend.controllers.controllers import save_comparison_endpoint, get_comparison_endpoint, get_dataset_endpoint, \
-    Comparison
+    generate_dataset_endpoint, append_dataset_endpoint, Comparison
+from backend.presenters import presenters
 from backend.presenters.presenters import past_comparisons, past_datasets
+from backend.use_cases.memory_budgets.memory_budget import MemoryBudget
 
 
 @pytest.mark.asyncio
@@ -22,3 +27,23 @@ async def test_get_comparison():
 async def test_get_dataset():
     past_datasets["123"] = "456"
     assert await get_dataset_endpoint("123") == "456"
+
+
+@pytest.mark.asyncio
+async def test_upload_larger_than_memory_budget(monkeypatch):
+    monkeypatch.setattr(presenters, "memory_budget", MemoryBudget(1))
+    with open("backend/tests/test_data.csv", "rb") as file:
+        with pytest.raises(HTTPException) as error:
+            await generate_dataset_endpoint(UploadFile(file, filename="too_large.csv"))
+    assert error.value.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_append_rows_with_other_columns():
+    with open("backend/tests/test_data.csv", "rb") as file:
+        dataset = await generate_dataset_endpoint(UploadFile(file, filename="base.csv"))
+    rows = UploadFile(io.BytesIO(b"sex,marked,actual\nFemale,1,0\n"), filename="other_columns.csv")
+    with pytest.raises(HTTPException) as error:
+        await append_dataset_endpoint(dataset["id"], rows)
+    assert error.value.status_code == 422
+    assert "protected classes" in error.value.detail
@@ -19,3 +19,45 @@ def test_load_file_has_sex_column(dataset):
 
 def test_load_file_row_count(dataset):
     assert len(dataset.df) == 10
+
+
+def test_load_file_in_chunks():
+    dataset = CSVFile("backend/tests/test_data.csv", chunk_size=3)
+    assert len(dataset.df) == 0
+    assert dataset.categories == {"citizenship", "sex", "age"}
+    assert dataset.get_value_statistics("sex").get_count_map() == {"Female": 5, "Male": 5}
+
+
+def test_load_file_skips_unused_columns(tmp_path):
+    path = tmp_path / "wide.csv"
+    path.write_text("feature,sex,marked,actual\n0.5,Female,1,0\n0.25,Male,0,0\n")
+    dataset = CSVFile(str(path))
+    assert list(dataset.df.columns) == ["sex", "marked", "actual"]
+    assert dataset.df["sex"].dtype == "category"
+    assert dataset.df["marked"].dtype == "int8"
+
+
+def test_load_file_with_blank_outcome_after_sample(tmp_path):
+    path = tmp_path / "late_blank.csv"
+    rows = ["Female,1,0"] * (CSVFile.SAMPLE_ROWS + 100) + ["Male,1,"]
+    path.write_text("sex,marked,actual\n" + "\n".join(rows) + "\n")
+    dataset = CSVFile(str(path))
+    assert dataset.df["marked"].dtype == "int8"
+    assert dataset.df["actual"].isna().sum() == 1
+    streamed = CSVFile(str(path), chunk_size=500)
+    assert streamed.get_value_statistics("sex").get_count_map() == {"Female": CSVFile.SAMPLE_ROWS + 100, "Male": 1}
+
+
+def test_load_file_rewinds_file_object():
+    with open("backend/tests/test_data.csv", "rb") as file:
+        dataset = CSVFile(file)
+    assert len(dataset.df) == 10
+
+
+def test_estimate_memory(tmp_path):
+    path = tmp_path / "large.csv"
+    path.write_text("feature,sex,marked,actual\n" + "0.5,Female,1,0\n" * 100_000)
+    estimate = CSVFile.estimate_memory(str(path))
+    # Three used columns, the sampled rows taking a little more than the minimum per value
+    assert 0.95 * 100_000 * 3 * CSVFile.PARSED_VALUE_BYTES <= estimate <= 1.5 * 100_000 * 3 * CSVFile.PARSED_VALUE_BYTES
+    assert CSVFile.estimate_memory(str(path), chunk_size=1000) <= estimate / 95
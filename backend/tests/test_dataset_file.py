@@ -1,6 +1,9 @@
+import numpy as np
+import pandas as pd
 import pytest
 
 from backend.entities.dataset_files.csv_file import CSVFile
+from backend.use_cases.bias_calculators.variance_calculator import VarianceCalculator
 
 
 @pytest.fixture
@@ -34,3 +37,53 @@ def test_get_category_trait_fprs(test_dataset):
     }
 
     assert test_dataset.get_category_trait_fprs("sex") == {"Male": 0.15, "Female": 0.25}
+
+
+def test_invalidate_statistics(test_dataset):
+    VarianceCalculator().process_dataset(test_dataset)
+    assert test_dataset.get_category_statistics("sex") is not None
+
+    test_dataset.invalidate_statistics()
+    assert test_dataset.get_category_statistics("sex") is None
+    assert not test_dataset.is_processed
+
+
+def test_text_categories_are_dictionary_encoded(test_dataset):
+    assert isinstance(test_dataset.df["sex"].dtype, pd.CategoricalDtype)
+    assert not isinstance(test_dataset.df["age"].dtype, pd.CategoricalDtype)
+
+
+def test_trait_counts_are_cached_until_processed(test_dataset):
+    counts = test_dataset.get_category_trait_counts("age")
+    assert test_dataset.get_category_trait_counts("age") is counts
+
+    # Processing groups the ages into ranges, which replaces the cached raw values
+    VarianceCalculator().process_dataset(test_dataset)
+    assert test_dataset.get_category_trait_counts("age") == test_dataset.get_category_statistics("age").get_count_map()
+    assert test_dataset.get_category_traits("age") == set(test_dataset.get_category_statistics("age").traits)
+
+
+def test_coarsened_chunked_loading(monkeypatch):
+    monkeypatch.setattr(CSVFile, "NUMERIC_VALUE_LIMIT", 3)
+    datasets = [CSVFile("backend/tests/test_data.csv", chunk_size=chunk_size) for chunk_size in (2, 4, 7)]
+    for dataset in datasets:
+        assert dataset.get_value_resolution("age") > 1
+        assert len(dataset.get_value_statistics("age").traits) <= 3
+        assert sum(dataset.get_value_statistics("age").counts) == 10
+    edges = [VarianceCalculator().obtain_numeric_bins(dataset, "age").edges.tolist() for dataset in datasets]
+    assert edges[0] == edges[1] == edges[2]
+
+
+def test_coarsening_bounds_wide_ranges(tmp_path, monkeypatch):
+    monkeypatch.setattr(CSVFile, "NUMERIC_VALUE_LIMIT", 100)
+    rng = np.random.default_rng(207)
+    path = tmp_path / "wide.csv"
+    pd.DataFrame({"age": rng.integers(0, 10 ** 9, 5000), "marked": rng.integers(0, 2, 5000),
+                  "actual": rng.integers(0, 2, 5000)}).to_csv(path, index=False)
+
+    assert CSVFile(str(path), chunk_size=5000).get_value_resolution("age") > 0
+    statistics = [CSVFile(str(path), chunk_size=chunk_size).get_value_statistics("age")
+                  for chunk_size in (300, 1024, 5000)]
+    assert len(statistics[0].traits) <= 100
+    counts = [dict(zip(values.traits, values.counts.tolist())) for values in statistics]
+    assert counts[0] == counts[1] == counts[2]
@@ -0,0 +1,26 @@
+import io
+
+import pandas as pd
+
+from backend.entities.dataset_files.arrow_file import ArrowFile
+from backend.entities.dataset_files.csv_file import CSVFile
+from backend.entities.dataset_files.dataset_file_factory import create_dataset_file, get_dataset_file_class
+from backend.entities.dataset_files.parquet_file import ParquetFile
+
+
+def test_detects_parquet_from_magic_bytes():
+    buffer = io.BytesIO()
+    pd.read_csv("backend/tests/test_data.csv").to_parquet(buffer)
+    buffer.seek(0)
+    assert get_dataset_file_class(buffer, "upload") is ParquetFile
+    assert buffer.tell() == 0
+
+
+def test_detects_arrow_from_extension():
+    assert get_dataset_file_class(io.BytesIO(b"????"), "predictions.feather") is ArrowFile
+
+
+def test_defaults_to_csv():
+    dataset = create_dataset_file("backend/tests/test_data.csv")
+    assert isinstance(dataset, CSVFile)
+    assert len(dataset.df) == 10
@@ -0,0 +1,57 @@
+import json
+
+import msgpack
+import orjson
+import pyarrow as pa
+
+from backend.presenters.dataset_formats import ARROW, COLUMNAR_JSON, JSON, MSGPACK, encode_arrow, \
+    encode_columnar_json, encode_json, encode_msgpack, negotiate_format
+
+DATASET = {
+    "id": "1",
+    "name": "test.csv",
+    "categories": [
+        {"name": "sex", "fprScore": 8.0, "traits": [
+            {"name": "Male", "count": 5, "fprMean": 0.2},
+            {"name": "Female", "count": 5, "fprMean": 0.4}
+        ]},
+        {"name": "age", "fprScore": 6.5, "traits": [{"name": "0-24", "count": 10, "fprMean": 0.3}]}
+    ],
+    "score": 7.25,
+    "description": "Low."
+}
+
+COLUMNAR_SEX = {"name": "sex", "fprScore": 8.0, "traits": {"name": ["Male", "Female"], "count": [5, 5],
+                                                           "fprMean": [0.2, 0.4]}}
+
+
+def test_negotiate_format():
+    assert negotiate_format(None) == JSON
+    assert negotiate_format("*/*") == JSON
+    assert negotiate_format("text/html, application/json") == JSON
+    assert negotiate_format("application/x-msgpack") == MSGPACK
+    assert negotiate_format(f"application/json;q=0.5, {ARROW}") == ARROW
+    assert negotiate_format(f"{COLUMNAR_JSON}, {MSGPACK}") == COLUMNAR_JSON
+
+
+def test_json_formats():
+    assert json.loads(encode_json(DATASET)) == DATASET
+    columnar = orjson.loads(encode_columnar_json(DATASET))
+    assert columnar["categories"][0] == COLUMNAR_SEX
+    assert columnar["score"] == 7.25
+
+
+def test_msgpack_format():
+    assert msgpack.unpackb(encode_msgpack(DATASET))["categories"][0] == COLUMNAR_SEX
+
+
+def test_arrow_format():
+    table = pa.ipc.open_stream(encode_arrow(DATASET)).read_all()
+    assert table.column("category").to_pylist() == ["sex", "sex", "age"]
+    assert table.column("name").to_pylist() == ["Male", "Female", "0-24"]
+    assert table.column("count").to_pylist() == [5, 5, 10]
+    assert table.column("fprMean").to_pylist() == [0.2, 0.4, 0.3]
+
+    header = json.loads(table.schema.metadata[b"dataset"])
+    assert header["categories"] == [{"name": "sex", "fprScore": 8.0}, {"name": "age", "fprScore": 6.5}]
+    assert header["description"] == "Low."
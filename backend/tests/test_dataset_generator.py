@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from backend.benchmarks import dataset_generator
+from backend.benchmarks.dataset_generator import generate_dataset, get_trait_probabilities
+from backend.benchmarks.pipeline_benchmark import benchmark_file, compare, STAGES
+from backend.entities.dataset_files.dataset_file_factory import create_dataset_file
+from backend.use_cases.bias_calculators.variance_calculator import VarianceCalculator
+
+
+def test_generate_dataset_is_deterministic_across_formats(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_generator, "BLOCK_SIZE", 300)
+    csv_path, parquet_path, other_path = (str(tmp_path / name) for name in ("a.csv", "a.parquet", "b.csv"))
+    generate_dataset(csv_path, 1000, columns=2, cardinality=5, seed=1)
+    generate_dataset(parquet_path, 1000, columns=2, cardinality=5, seed=1)
+    generate_dataset(other_path, 1000, columns=2, cardinality=5, seed=2)
+
+    csv_df, parquet_df = pd.read_csv(csv_path), pd.read_parquet(parquet_path)
+    assert list(csv_df.columns) == ["citizenship", "sex", "age", "marked", "actual"]
+    assert len(csv_df) == 1000
+    pd.testing.assert_frame_equal(csv_df, parquet_df.astype({"citizenship": str, "sex": str}))
+    assert open(csv_path).read() == open(generate_dataset(str(tmp_path / "c.csv"), 1000, 2, 5, seed=1)).read()
+    assert open(csv_path).read() != open(other_path).read()
+
+
+def test_generate_dataset_injects_bias(tmp_path):
+    calculator = VarianceCalculator()
+    scores = []
+    for bias in (0, 0.5):
+        dataset = create_dataset_file(generate_dataset(str(tmp_path / f"{bias}.parquet"), 20_000, bias=bias))
+        calculator.process_dataset(dataset)
+        scores.append(dataset.get_category_score("citizenship"))
+        fprs = dataset.get_category_trait_fprs("citizenship")
+        assert fprs["citizenship-9"] - fprs["citizenship-0"] == pytest.approx(bias, abs=0.1)
+    assert scores[1] < scores[0]
+
+
+def test_get_trait_probabilities_skew():
+    assert get_trait_probabilities(4, 0).tolist() == [0.25] * 4
+    probabilities = get_trait_probabilities(4, 2)
+    assert probabilities.sum() == pytest.approx(1)
+    assert probabilities[0] == pytest.approx(16 * probabilities[3])
+
+
+def test_generate_dataset_rejects_invalid_settings(tmp_path):
+    with pytest.raises(ValueError):
+        generate_dataset(str(tmp_path / "a.json"), 10)
+    with pytest.raises(ValueError):
+        generate_dataset(str(tmp_path / "a.csv"), 10, bias=1)
+
+
+def test_benchmark_file_compares_with_baseline(tmp_path):
+    path = generate_dataset(str(tmp_path / "a.csv"), 1000)
+    results = {"csv-1000": benchmark_file(path, None, "error_rate", 1)}
+    assert set(results["csv-1000"]) == set(STAGES)
+    assert compare(results, results, 0.2) == []
+
+    faster = {"csv-1000": {stage: {**result, "seconds": result["seconds"] / 10}
+                           for stage, result in results["csv-1000"].items()}}
+    assert len(compare(results, faster, 0.2, noise=0)) == len(STAGES)
@@ -0,0 +1,107 @@
+import gzip
+import json
+
+import brotli
+import msgpack
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.controllers import controllers
+from backend.controllers.http_cache_middleware import HttpCacheMiddleware
+from backend.presenters.dataset_formats import MSGPACK
+from backend.presenters.presenters import past_comparisons, save_dataset, save_comparison
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(HttpCacheMiddleware)
+    app.include_router(controllers.router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def dataset():
+    dataset = {"id": "cached", "name": "Années.csv", "categories": [], "score": 2.5, "description": "Low."}
+    save_dataset(dataset)
+    return dataset
+
+
+def test_cached_response_matches_api(client, dataset):
+    response = client.get("/api/getDataset", params={"id": "cached"}, headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.json() == dataset
+    assert response.headers["cache-control"] == HttpCacheMiddleware.CACHE_CONTROL
+    assert response.headers["etag"].startswith('"')
+    assert "content-encoding" not in response.headers
+
+    # The body is encoded exactly as the API encodes it
+    assert response.content == json.dumps(dataset, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def test_compressed_responses(client, dataset):
+    response = client.get("/api/getDataset", params={"id": "cached"}, headers={"Accept-Encoding": "br, gzip"})
+    assert response.headers["content-encoding"] == "br"
+
+    with client.stream("GET", "/api/getDataset", params={"id": "cached"},
+                       headers={"Accept-Encoding": "gzip, br;q=0"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert json.loads(gzip.decompress(b"".join(response.iter_raw()))) == dataset
+
+    with client.stream("GET", "/api/getDataset", params={"id": "cached"},
+                       headers={"Accept-Encoding": "br"}) as response:
+        assert json.loads(brotli.decompress(b"".join(response.iter_raw()))) == dataset
+
+
+def test_not_modified(client, dataset):
+    etag = client.get("/api/getDataset", params={"id": "cached"}).headers["etag"]
+    response = client.get("/api/getDataset", params={"id": "cached"}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_comparisons_and_missing_results(client):
+    id = await save_comparison("456")
+    assert client.get("/api/getComparison", params={"id": id}).json() == "456"
+    assert client.get("/api/getComparison", params={"id": "unknown"}).json() == "Missing"
+    assert "etag" not in client.get("/api/getDataset", params={"id": "unknown"}).headers
+
+
+def test_negotiated_format(client, dataset):
+    response = client.get("/api/getDataset", params={"id": "cached"}, headers={"Accept": MSGPACK})
+    assert response.headers["content-type"] == MSGPACK
+    assert msgpack.unpackb(response.content)["score"] == dataset["score"]
+    assert response.headers["etag"] != client.get("/api/getDataset", params={"id": "cached"}).headers["etag"]
+
+
+def test_top_traits_are_cached_separately(client):
+    traits = [{"name": name, "count": count, "fprMean": 0.5} for name, count in (("a", 1), ("b", 5), ("c", 3))]
+    category = {"name": "ancestry", "fprScore": 0.0, "traits": traits}
+    save_dataset({"id": "wide", "name": "wide.csv", "categories": [category], "score": 0.0})
+
+    limited = client.get("/api/getDataset", params={"id": "wide", "top_k": 1}).json()
+    assert [trait["name"] for trait in limited["categories"][0]["traits"]] == ["b", "other"]
+    full = client.get("/api/getDataset", params={"id": "wide"}).json()
+    assert full["categories"][0]["traits"] == traits
+
+    # Invalid views are left to the API to reject
+    assert client.get("/api/getDataset", params={"id": "wide", "top_k": 0}).status_code == 422
+    assert client.get("/api/getDataset", params={"id": "wide", "rank_by": "name"}).status_code == 422
+
+
+def test_chunk_size_must_be_positive(client):
+    for endpoint in ("/api/generateDataset", "/api/submitDataset"):
+        with open("backend/tests/test_data.csv", "rb") as file:
+            response = client.post(endpoint, params={"chunk_size": 0}, files={"file": ("data.csv", file)})
+        assert response.status_code == 422
+
+
+def test_comparisons_that_cannot_be_assembled(client):
+    save_dataset({"id": "scored", "name": "a.csv", "categories": [], "score": 1.0, "metric": "error_rate"})
+    save_dataset({"id": "scored-fpr", "name": "b.csv", "categories": [], "score": 1.0, "metric": "fpr"})
+    past_comparisons["mixed"] = {"dataset1Id": "scored", "dataset2Id": "scored-fpr", "metadata": {}}
+
+    assert client.get("/api/getComparison", params={"id": "mixed"}).status_code == 400
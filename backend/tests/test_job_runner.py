@@ -0,0 +1,66 @@
+import os
+import time
+
+import pytest
+
+from backend.entities.job import Job
+from backend.use_cases.job_runners.job_runner import BROKEN_POOL_ERROR, JobQueueFullError, JobRunner
+
+
+def wait_and_double(seconds, value):
+    time.sleep(seconds)
+    return value * 2
+
+
+def fail(message):
+    raise ValueError(message)
+
+
+def crash():
+    os._exit(1)
+
+
+@pytest.fixture
+def job_runner():
+    job_runner = JobRunner(max_workers=1, max_queue=1)
+    yield job_runner
+    job_runner.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_job_result(job_runner):
+    job = await job_runner.wait(job_runner.submit(wait_and_double, 0, 21, callback=str))
+    assert job.get_status() == Job.DONE
+    assert job.result == "42"
+    assert job_runner.get_job(job.id) is job
+
+
+@pytest.mark.asyncio
+async def test_failed_job(job_runner):
+    job = await job_runner.wait(job_runner.submit(fail, "bad row"))
+    assert job.get_status() == Job.FAILED
+    assert job.error == "bad row"
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected(job_runner):
+    running = job_runner.submit(wait_and_double, 1, 1)
+    queued = job_runner.submit(wait_and_double, 0, 2)
+    assert not job_runner.has_capacity()
+    with pytest.raises(JobQueueFullError):
+        job_runner.submit(wait_and_double, 0, 3)
+
+    await job_runner.wait(running)
+    await job_runner.wait(queued)
+    assert job_runner.has_capacity()
+    assert (await job_runner.wait(job_runner.submit(wait_and_double, 0, 4))).result == 8
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_again_after_a_worker_dies(job_runner):
+    crashed = await job_runner.wait(job_runner.submit(crash))
+    assert crashed.get_status() == Job.FAILED
+    assert crashed.error == BROKEN_POOL_ERROR
+    assert job_runner.has_capacity()
+
+    assert (await job_runner.wait(job_runner.submit(wait_and_double, 0, 5))).result == 10
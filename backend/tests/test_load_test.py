@@ -0,0 +1,31 @@
+import argparse
+
+import httpx
+import pytest
+
+from backend.benchmarks.load_test import compare_summaries, make_uploads, parse_mix, run_load
+from main import app
+
+
+def test_parse_mix():
+    assert parse_mix("upload=1, read=8") == {"upload": 1, "read": 8}
+    for mix in ("upload=1,delete=1", "read=0", "read"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_mix(mix)
+
+
+@pytest.mark.asyncio
+async def test_run_load_in_process():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        summary = await run_load(client, make_uploads(2, 100), parse_mix("upload=1,read=2,compare=1"), 3, 30, None)
+
+    operations = summary["operations"]
+    assert operations["all"]["requests"] == 30
+    assert operations["all"]["errors"] == 0
+    assert sum(operations[name]["requests"] for name in ("upload", "read", "compare")) == 30
+    assert operations["all"]["p50Ms"] <= operations["all"]["p99Ms"] <= operations["all"]["maxMs"]
+
+    assert compare_summaries(summary, summary, 0.2) == []
+    slower = {"operations": {name: {**result, "p99Ms": result["p99Ms"] and result["p99Ms"] * 2, "errorRate": 0.5}
+                             for name, result in operations.items()}}
+    assert len(compare_summaries(slower, summary, 0.2)) == 2 * len(operations)
@@ -0,0 +1,34 @@
+import pytest
+
+from backend.use_cases.memory_budgets.memory_budget import MemoryBudget, MemoryBudgetExceededError, \
+    MemoryBudgetFullError, get_budget_limit
+
+
+def test_reserve_and_release():
+    budget = MemoryBudget(100)
+    budget.reserve(60)
+    assert budget.has_room(40)
+    assert not budget.has_room(41)
+
+    with pytest.raises(MemoryBudgetFullError):
+        budget.reserve(41)
+    budget.release(60)
+    budget.reserve(100)
+    assert budget.reserved == 100
+
+
+def test_reservation_larger_than_budget():
+    budget = MemoryBudget(100)
+    with pytest.raises(MemoryBudgetExceededError):
+        budget.reserve(101)
+    assert budget.reserved == 0
+
+
+def test_budget_limit_setting():
+    assert get_budget_limit("1000") == 1000
+    assert get_budget_limit("1000", processes=4) == 1000
+    assert get_budget_limit(None, processes=4) in (None, get_budget_limit(None) // 4)
+    assert get_budget_limit("0") is None
+    unlimited = MemoryBudget(get_budget_limit("0"))
+    unlimited.reserve(10 ** 15)
+    assert unlimited.has_room(10 ** 15)
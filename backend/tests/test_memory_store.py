@@ -0,0 +1,71 @@
+import pytest
+
+from backend.use_cases.result_stores.memory_store import MemoryStore
+from backend.use_cases.result_stores.store_budget import StoreBudget
+
+
+def test_get_and_put():
+    store = MemoryStore()
+    store["a"] = {"score": 1}
+    assert store.get("a") == {"score": 1}
+    assert store.get("b") is None
+    with pytest.raises(KeyError):
+        store["b"]
+    assert store.get_statistics() == {"entries": 1, "hits": 1, "misses": 2, "evictions": 0}
+
+
+def test_least_recently_used_entry_is_evicted():
+    store = MemoryStore(max_entries=2)
+    store["a"] = 1
+    store["b"] = 2
+    store.get("a")
+    store["c"] = 3
+    assert "a" in store and "c" in store
+    assert "b" not in store
+    assert store.evictions == 1
+
+
+def test_byte_budget():
+    store = MemoryStore(max_bytes=20)
+    store["a"] = "x" * 8
+    store["b"] = "y" * 8
+    assert store.size == 20
+    store["c"] = "z"
+    assert "a" not in store
+    assert store.size == 13
+
+    # An entry larger than the whole budget is not stored
+    store["d"] = "w" * 30
+    assert "d" not in store
+    assert store.evictions == 2
+
+
+def test_entries_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("backend.use_cases.result_stores.memory_store.time.monotonic", lambda: now[0])
+    store = MemoryStore(ttl=10)
+    store["a"] = 1
+    store.put("b", 2, ttl=60)
+
+    now[0] += 30
+    assert store.get("a") is None
+    assert store.get("b") == 2
+    assert store.evictions == 1
+    assert len(store) == 1
+
+
+def test_shared_byte_budget():
+    budget = StoreBudget(25)
+    datasets = MemoryStore(budget=budget)
+    jobs = MemoryStore(budget=budget)
+    datasets["a"] = "x" * 8
+    jobs["b"] = "y" * 8
+    datasets.get("a")
+    datasets["c"] = "z" * 8
+    # The least recently used entry of either store is evicted
+    assert "b" not in jobs and "a" in datasets and "c" in datasets
+    assert budget.size == datasets.size == 20
+    assert jobs.evictions == 1
+
+    jobs["d"] = "w" * 40
+    assert "d" not in jobs
@@ -0,0 +1,54 @@
+import math
+
+import pytest
+
+from backend.entities.histogram import Histogram
+from backend.entities.stage_timer import StageTimer
+from backend.presenters import metrics
+
+
+def test_histogram_counts_values_into_cumulative_buckets():
+    histogram = Histogram((1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+    assert histogram.get_cumulative_counts() == [(1, 2), (10, 3), (math.inf, 4)]
+    assert (histogram.count, histogram.total) == (4, 56.5)
+    with pytest.raises(ValueError):
+        Histogram((1, 1))
+
+
+def test_stage_timer_merges_worker_timings():
+    timer = StageTimer()
+    with timer.stage("copy"):
+        pass
+    timer.merge(StageTimer({"parse": 0.25, "copy": 0.5}, {"rows": 10}))
+    assert list(timer.durations) == ["copy", "parse"]
+    assert timer.durations["copy"] >= 0.5
+    assert timer.sizes == {"rows": 10}
+    assert timer.get_server_timing().endswith(", parse;dur=250.0")
+
+
+def test_stage_is_a_no_op_without_a_timer():
+    assert metrics.stage("parse") is metrics.NO_STAGE
+    with metrics.timing(True) as timer:
+        with metrics.stage("parse"):
+            pass
+    assert list(timer.durations) == ["parse"]
+    assert metrics.request_timer.get() is None
+
+
+def test_render_metrics():
+    metrics.record_timer(StageTimer({"parse": 0.002}, {"rows": 500}))
+    metrics.record_request("GET", '/api/"quoted"', 200, 0.003)
+    text = metrics.render_metrics({"datasets": {"entries": 3, "hits": 2, "misses": 1, "evictions": 0}}, 4, 1024)
+
+    assert '# TYPE bias_stage_seconds histogram' in text
+    assert 'bias_stage_seconds_bucket{stage="parse",le="0.001"} 0' in text
+    assert 'bias_stage_seconds_bucket{stage="parse",le="+Inf"}' in text
+    assert 'bias_dataset_rows_bucket{le="1000"}' in text
+    assert 'bias_http_requests_total{method="GET",path="/api/\\"quoted\\"",status="200"} 1' in text
+    assert 'bias_store_entries{store="datasets"} 3' in text
+    assert 'bias_store_misses_total{store="datasets"} 1' in text
+    assert "bias_jobs_pending 4" in text
+    assert "bias_memory_reserved_bytes 1024" in text
+    assert text.endswith("\n")
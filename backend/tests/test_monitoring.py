@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from backend.entities.dataset_files.csv_file import CSVFile
+from backend.presenters.monitoring import create_monitor, get_monitor, ingest_events
+from backend.use_cases.bias_calculators.accuracy_calculator import AccuracyCalculator
+from backend.use_cases.bias_calculators.variance_calculator import VarianceCalculator
+
+
+@pytest.mark.asyncio
+async def test_window_scores_match_dataset_scores():
+    events = pd.read_csv("backend/tests/test_data.csv")
+    events["timestamp"] = pd.date_range("2024-01-01", periods=len(events), freq="min").strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    id = await create_monitor({"hour": (3600, 600), "minute": (60, None)})
+    assert await ingest_events(id, events.to_dict("records")) == {"ingested": 10, "dropped": {"hour": 0, "minute": 9}}
+
+    windows = {window["name"]: window for window in (await get_monitor(id))["windows"]}
+    dataset = CSVFile("backend/tests/test_data.csv")
+    VarianceCalculator().process_dataset(dataset)
+    assert windows["hour"]["count"] == 10
+    assert windows["hour"]["scores"]["variance"] == pytest.approx(dataset.get_overall_score())
+    accuracy = AccuracyCalculator().calculate_overall_statistics_score(dataset.category_statistics)
+    assert windows["hour"]["scores"]["accuracy"] == pytest.approx(accuracy)
+
+    assert windows["minute"]["count"] == 1
+    assert windows["minute"]["end"] - windows["minute"]["start"] == 60
+
+
+@pytest.mark.asyncio
+async def test_missing_monitor():
+    assert await ingest_events("unknown", []) == "Missing"
+    assert await get_monitor("unknown") == "Missing"
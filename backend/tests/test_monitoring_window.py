@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.entities.monitoring_window import MonitoringWindow
+
+
+def add(window, timestamps, traits, mismatches):
+    window.add(np.array(timestamps), {"sex": pd.Series(traits)}, np.array(mismatches, dtype=float))
+
+
+def test_sliding_window_expires_old_buckets():
+    window = MonitoringWindow(30, 10)
+    add(window, [0, 5, 12], ["Male", "Female", "Male"], [1, 0, 0])
+    assert window.get_statistics()["sex"].get_count_map() == {"Male": 2, "Female": 1}
+    assert window.get_bounds() == (-10, 20)
+
+    add(window, [35], ["Female"], [1])
+    assert window.get_bounds() == (10, 40)
+    assert window.get_count() == 2
+    assert window.get_statistics()["sex"].get_fpr_map() == {"Male": 0.0, "Female": 1.0}
+
+
+def test_tumbling_window_starts_over():
+    window = MonitoringWindow(60)
+    add(window, [0, 59], ["Male", "Female"], [1, 0])
+    add(window, [61], ["Male"], [0])
+    assert window.get_count() == 1
+    assert window.get_statistics()["sex"].get_count_map() == {"Male": 1}
+
+
+def test_late_events_are_dropped():
+    window = MonitoringWindow(20, 10)
+    add(window, [100], ["Male"], [0])
+    add(window, [95, 85], ["Female", "Female"], [1, 1])
+    assert window.dropped == 1
+    assert window.get_statistics()["sex"].get_count_map() == {"Male": 1, "Female": 1}
+
+
+def test_memory_is_bounded_by_buckets():
+    window = MonitoringWindow(50, 10)
+    for start in range(0, 10_000, 10):
+        add(window, [start, start + 1], ["Male", "Female"], [0, 1])
+    assert len(window.bucket_statistics) == 5
+    assert window.get_count() == 10
+
+
+def test_numeric_values_are_coarsened():
+    window = MonitoringWindow(60, 10)
+    ages = np.random.default_rng(207).uniform(0, 100, 50_000)
+    timestamps = np.arange(50_000) % 60
+    window.add(timestamps, {"age": pd.Series(ages)}, np.zeros(50_000), numeric_categories={"age"})
+    window.add(timestamps[:10], {"age": pd.Series(ages[:10])}, np.zeros(10), numeric_categories={"age"})
+
+    resolution = window.value_resolutions["age"]
+    assert sum(len(bucket["age"].traits) for bucket in window.bucket_statistics) <= MonitoringWindow.NUMERIC_VALUE_LIMIT
+    for bucket in window.bucket_statistics:
+        assert np.all(np.mod(bucket["age"].traits, resolution) == 0)
+    assert window.get_count() == 50_010
+    assert window.get_statistics()["age"].counts.sum() == 50_010
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        MonitoringWindow(30, 7)
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.entities.dataset_files.csv_file import CSVFile
+from backend.use_cases.numeric_binners.edge_binner import EdgeBinner
+from backend.use_cases.numeric_binners.fixed_width_binner import FixedWidthBinner
+from backend.use_cases.numeric_binners.quantile_binner import QuantileBinner
+
+
+@pytest.fixture
+def test_dataset():
+    return CSVFile("backend/tests/test_data.csv")
+
+
+def test_quantile_binner(test_dataset):
+    bins = QuantileBinner().compute_bins(test_dataset.df["age"])
+    assert bins.edges.tolist() == [17, 26, 39]
+    assert bins.labels == ["0-16", "17-25", "26-38", "39+"]
+    assert bins.assign(test_dataset.df["age"]).tolist() == [0, 3, 0, 1, 1, 2, 3, 3, 0, 3]
+
+
+def test_fixed_width_binner(test_dataset):
+    bins = FixedWidthBinner(20).compute_bins(test_dataset.df["age"])
+    assert bins.labels == ["0-19", "20-39", "40+"]
+
+
+def test_edge_binner(test_dataset):
+    bins = EdgeBinner([18, 65], ["minor", "adult", "senior"]).compute_bins(test_dataset.df["age"])
+    assert bins.label(test_dataset.df["age"]).tolist()[:3] == ["minor", "adult", "minor"]
+
+
+def test_edge_binner_requires_labels_for_fractional_edges(test_dataset):
+    with pytest.raises(ValueError):
+        EdgeBinner([17.5]).compute_bins(test_dataset.df["age"])
+
+
+def test_quantile_binner_from_counts(test_dataset):
+    value_counts = test_dataset.df["age"].value_counts()
+    edges = QuantileBinner().compute_edges_from_counts(value_counts.index.to_numpy(), value_counts.to_numpy())
+    assert edges.tolist() == QuantileBinner().compute_edges(test_dataset.df["age"]).tolist()
+
+
+def test_quantile_binner_rounds_halves_despite_float_error():
+    column = pd.Series(np.arange(10) * 5)
+    binner = QuantileBinner((0.3,))
+    assert column.quantile(0.3) != 13.5
+    assert binner.compute_edges(column).tolist() == [14]
+    assert binner.compute_edges_from_counts(column.to_numpy(), np.ones(10)).tolist() == [14]
+
+
+def test_quantile_binner_without_values():
+    bins = QuantileBinner().compute_bins(pd.Series([], dtype=float))
+    assert bins.edges.tolist() == []
+    assert bins.labels == ["0+"]
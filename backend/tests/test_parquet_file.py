@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from backend.entities.dataset_files.csv_file import CSVFile
+from backend.entities.dataset_files.parquet_file import ParquetFile
+from backend.use_cases.bias_calculators.variance_calculator import VarianceCalculator
+
+
+@pytest.fixture
+def parquet_path(tmp_path):
+    path = tmp_path / "test_data.parquet"
+    df = pd.read_csv("backend/tests/test_data.csv")
+    df["feature"] = 0.5
+    df.to_parquet(path, row_group_size=4)
+    return str(path)
+
+
+def test_load_file_reads_used_columns(parquet_path):
+    dataset = ParquetFile(parquet_path)
+    assert set(dataset.df.columns) == {"citizenship", "sex", "age", "marked", "actual"}
+    assert dataset.df["sex"].dtype == "category"
+    assert len(dataset.df) == 10
+
+
+def test_load_file_from_file_object(parquet_path):
+    with open(parquet_path, "rb") as file:
+        dataset = ParquetFile(file)
+    assert dataset.categories == {"citizenship", "sex", "age"}
+
+
+def test_process_dataset_matches_csv(parquet_path):
+    calculator = VarianceCalculator()
+    csv_dataset, parquet_dataset, streamed_dataset = (CSVFile("backend/tests/test_data.csv"),
+                                                      ParquetFile(parquet_path), ParquetFile(parquet_path, 3))
+    for dataset in (csv_dataset, parquet_dataset, streamed_dataset):
+        calculator.process_dataset(dataset)
+    assert parquet_dataset.get_overall_score() == csv_dataset.get_overall_score()
+    assert streamed_dataset.get_category_trait_fprs("age") == csv_dataset.get_category_trait_fprs("age")
+
+
+def test_estimate_memory(parquet_path):
+    # Ten rows in row groups of four, with five used columns
+    assert ParquetFile.estimate_memory(parquet_path) == 10 * 5 * ParquetFile.DECODED_VALUE_BYTES
+    assert ParquetFile.estimate_memory(parquet_path, chunk_size=2) == 4 * 5 * ParquetFile.DECODED_VALUE_BYTES
+
+
+def test_load_empty_file_in_chunks(tmp_path):
+    path = tmp_path / "empty.parquet"
+    pd.read_csv("backend/tests/test_data.csv").iloc[:0].to_parquet(path)
+    dataset = ParquetFile(str(path), 3)
+    VarianceCalculator().process_dataset(dataset)
+    assert dataset.categories == {"citizenship", "sex", "age"}
+    assert len(dataset.df) == 0
@@ -1,6 +1,20 @@
+import io
+import json
+import os
+
 import pytest
+from fastapi import UploadFile
 
-from backend.presenters.presenters import save_comparison, get_comparison, past_comparisons, past_datasets, get_dataset
+from backend.entities.dataset_files.csv_file import CSVFile
+from backend.entities.dataset_files.dataset_file import DatasetFile
+from backend.entities.job import Job
+from backend.presenters import presenters
+from backend.presenters.presenters import save_comparison, get_comparison, past_comparisons, past_datasets, \
+    get_dataset, submit_dataset, get_job, get_job_result, job_runner, past_jobs, \
+    generate_dataset, save_comparison_reference, append_dataset, past_uploads, copy_upload, get_upload_salt, \
+    limit_category_traits, limit_traits, OTHER_TRAIT, collect_value_statistics, merge_value_statistics, describe_job, \
+    wait_for_dataset
+from backend.use_cases.memory_budgets.memory_budget import MemoryBudget, MemoryBudgetExceededError
 
 
 @pytest.mark.asyncio
@@ -20,3 +34,197 @@ async def test_get_comparison():
 async def test_get_dataset():
     past_datasets["123"] = "456"
     assert await get_dataset("123") == "456"
+
+
+@pytest.mark.asyncio
+async def test_submit_dataset():
+    with open("backend/tests/test_data.csv", "rb") as file:
+        job = await submit_dataset(UploadFile(file, filename="test_data.csv"))
+    assert (await get_job(job.id))["status"] in (Job.QUEUED, Job.RUNNING)
+
+    await job_runner.wait(job)
+    status = await get_job(job.id)
+    assert status["status"] == Job.DONE
+    dataset = await get_job_result(job.id)
+    assert dataset["id"] == status["datasetId"]
+    assert await get_dataset(dataset["id"]) == dataset
+    assert {category["name"] for category in dataset["categories"]} == {"citizenship", "sex", "age"}
+
+
+@pytest.mark.asyncio
+async def test_get_missing_job():
+    assert await get_job("123") == "Missing"
+    assert await get_job_result("123") == "Missing"
+
+
+@pytest.mark.asyncio
+async def test_get_job_from_another_worker():
+    # Jobs submitted to another worker process are only known through the job store
+    past_jobs["789"] = {"id": "789", "status": Job.DONE, "datasetId": "123"}
+    past_datasets["123"] = "456"
+    assert (await get_job("789"))["status"] == Job.DONE
+    assert await get_job_result("789") == "456"
+
+
+@pytest.mark.asyncio
+async def test_repeated_upload_is_not_processed_again(monkeypatch):
+    with open("backend/tests/test_data.csv", "rb") as file:
+        dataset = await generate_dataset(UploadFile(file, filename="dedup.csv"))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The file should not be processed again.")
+
+    monkeypatch.setattr(job_runner, "submit", fail)
+    with open("backend/tests/test_data.csv", "rb") as file:
+        assert await generate_dataset(UploadFile(file, filename="dedup.csv")) == dataset
+
+    with open("backend/tests/test_data.csv", "rb") as file:
+        aliased = await generate_dataset(UploadFile(file, filename="dedup.csv"), duplicates="alias")
+    assert aliased["id"] != dataset["id"]
+    assert {**aliased, "id": dataset["id"]} == dataset
+    assert await get_dataset(aliased["id"]) == aliased
+
+
+@pytest.mark.asyncio
+async def test_comparison_reference():
+    past_datasets["d1"] = {"id": "d1", "score": 4.0, "categories": [
+        {"name": "sex", "fprScore": 6.0, "traits": [{"name": "Male", "count": 5, "fprMean": 0.5}]}]}
+    past_datasets["d2"] = {"id": "d2", "score": 5.0, "categories": [
+        {"name": "sex", "fprScore": 8.0, "traits": [{"name": "Male", "count": 5, "fprMean": 0.25}]}]}
+
+    id = await save_comparison_reference("d1", "d2", {"title": "Before and after"})
+    assert past_comparisons[id] == {"dataset1Id": "d1", "dataset2Id": "d2", "metadata": {"title": "Before and after"}}
+
+    comparison = json.loads(await get_comparison(id))
+    assert comparison["dataset1"] == past_datasets["d1"]
+    assert comparison["dataset2"] == past_datasets["d2"]
+    assert comparison["metadata"] == {"title": "Before and after"}
+    assert comparison["differences"] == {"score": 1.0, "categories": [
+        {"name": "sex", "fprScore": 2.0, "traits": [{"name": "Male", "fprMean": -0.25}]}]}
+
+    assert await save_comparison_reference("d1", "unknown") == "Missing"
+
+    past_datasets["d3"] = {**past_datasets["d2"], "id": "d3", "metric": "fnr"}
+    with pytest.raises(ValueError):
+        await save_comparison_reference("d1", "d3")
+
+
+@pytest.mark.asyncio
+async def test_append_dataset_matches_full_upload():
+    with open("backend/tests/test_data.csv", "rb") as file:
+        lines = file.readlines()
+    first, second = lines[0] + b"".join(lines[1:6]), lines[0] + b"".join(lines[6:])
+
+    full = await generate_dataset(UploadFile(io.BytesIO(b"".join(lines)), filename="full.csv"))
+    base = await generate_dataset(UploadFile(io.BytesIO(first), filename="base.csv"))
+    appended = await append_dataset(base["id"], UploadFile(io.BytesIO(second), filename="more.csv"))
+
+    assert appended["id"] != base["id"]
+    assert appended["name"] == "base.csv"
+    assert appended["score"] == pytest.approx(full["score"])
+    expected_categories = {category["name"]: category for category in full["categories"]}
+    assert {category["name"] for category in appended["categories"]} == expected_categories.keys()
+    for category in appended["categories"]:
+        expected = expected_categories[category["name"]]
+        assert category["fprScore"] == pytest.approx(expected["fprScore"])
+        assert {trait["name"]: trait["count"] for trait in category["traits"]} == \
+            {trait["name"]: trait["count"] for trait in expected["traits"]}
+    assert await get_dataset(base["id"]) == base
+
+    assert await append_dataset("unknown", UploadFile(io.BytesIO(second), filename="more.csv")) == "Missing"
+
+
+def test_stored_statistics_are_coarsened(monkeypatch):
+    monkeypatch.setattr(DatasetFile, "NUMERIC_VALUE_LIMIT", 4)
+    statistics = collect_value_statistics(CSVFile("backend/tests/test_data.csv"))
+    assert len(statistics["categories"]["age"]["traits"]) <= 4
+    assert sum(statistics["categories"]["age"]["counts"]) == 10
+    assert statistics["resolutions"]["age"] > 0
+
+    merged = merge_value_statistics(statistics, statistics)
+    assert len(merged["categories"]["age"]["traits"]) <= 4
+    assert sum(merged["categories"]["age"]["counts"]) == 20
+
+
+def test_append_rejects_other_protected_classes():
+    statistics = collect_value_statistics(CSVFile("backend/tests/test_data.csv"))
+    other = {**statistics, "categories": {"sex": statistics["categories"]["sex"]}}
+    with pytest.raises(ValueError, match="protected classes"):
+        merge_value_statistics(statistics, other)
+
+
+@pytest.mark.asyncio
+async def test_generate_dataset_with_metric():
+    with open("backend/tests/test_data.csv", "rb") as file:
+        dataset = await generate_dataset(UploadFile(file, filename="metric.csv"), metric="fnr")
+    assert dataset["metric"] == "fnr"
+    assert set(dataset["scores"]) == {"variance", "accuracy"}
+    assert dataset["scores"]["variance"] == dataset["score"]
+    sex = next(category for category in dataset["categories"] if category["name"] == "sex")
+    assert {trait["name"]: trait["fprMean"] for trait in sex["traits"]} == {"Female": 1.0, "Male": 0.0}
+
+
+@pytest.mark.asyncio
+async def test_upload_streamed_to_fit_memory_budget(monkeypatch):
+    monkeypatch.setattr(presenters, "STREAM_CHUNK_SIZE", 2)
+    streamed = CSVFile.estimate_memory("backend/tests/test_data.csv", chunk_size=2)
+    assert streamed < CSVFile.estimate_memory("backend/tests/test_data.csv")
+    budget = MemoryBudget(streamed)
+    monkeypatch.setattr(presenters, "memory_budget", budget)
+
+    with open("backend/tests/test_data.csv", "rb") as file:
+        dataset = await generate_dataset(UploadFile(file, filename="streamed.csv"))
+    assert {category["name"] for category in dataset["categories"]} == {"citizenship", "sex", "age"}
+    assert budget.reserved == 0
+    with open("backend/tests/test_data.csv", "rb") as file:
+        job = await submit_dataset(UploadFile(file, filename="reported.csv"))
+    assert describe_job(job)["chunkSize"] == 2
+    await wait_for_dataset(job)
+    # Later uploads of the file, loaded at once, are not answered with the streamed dataset
+    with open("backend/tests/test_data.csv", "rb") as file:
+        file_address, upload_key = copy_upload(UploadFile(file), get_upload_salt("streamed.csv", None))
+    os.remove(file_address)
+    assert upload_key not in past_uploads
+
+
+@pytest.mark.asyncio
+async def test_upload_larger_than_memory_budget(monkeypatch):
+    monkeypatch.setattr(presenters, "STREAM_CHUNK_SIZE", 2)
+    budget = MemoryBudget(CSVFile.estimate_memory("backend/tests/test_data.csv", chunk_size=2) - 1)
+    monkeypatch.setattr(presenters, "memory_budget", budget)
+
+    with open("backend/tests/test_data.csv", "rb") as file:
+        with pytest.raises(MemoryBudgetExceededError):
+            await submit_dataset(UploadFile(file, filename="too_large.csv"))
+    assert budget.reserved == 0
+
+
+def test_limit_category_traits():
+    category = {"name": "ancestry", "fprScore": 0.1, "traits": [
+        {"name": "a", "count": 10, "fprMean": 0.1},
+        {"name": "b", "count": 1, "fprMean": 0.9},
+        {"name": "c", "count": 30, "fprMean": 0.2},
+        {"name": "d", "count": 3, "fprMean": None},
+        {"name": "e", "count": 6, "fprMean": 0.3},
+    ]}
+
+    by_count = limit_category_traits(category, 2)
+    assert [trait["name"] for trait in by_count["traits"]] == ["a", "c", OTHER_TRAIT]
+    assert by_count["traits"][-1]["count"] == 10
+    # Weighted by rows, among the traits left out that have a rate
+    assert by_count["traits"][-1]["fprMean"] == pytest.approx((0.9 + 6 * 0.3) / 7)
+    assert by_count["otherTraits"] == 3
+    assert by_count["traits"][-1]["aggregated"]
+    assert not any("aggregated" in trait for trait in by_count["traits"][:-1])
+    # The rows of the traits left out are not known for rates of other metrics
+    assert limit_category_traits(category, 2, metric="fpr")["traits"][-1]["fprMean"] is None
+
+    by_deviation = limit_category_traits(category, 1, "deviation")
+    assert [trait["name"] for trait in by_deviation["traits"]] == ["b", OTHER_TRAIT]
+    assert by_deviation["traits"][-1]["count"] == 49
+
+    assert limit_category_traits(category, 5) is category
+    dataset = {"categories": [category]}
+    assert limit_traits(dataset, None) is dataset
+    with pytest.raises(ValueError):
+        limit_traits(dataset, 2, "name")
@@ -0,0 +1,79 @@
+import multiprocessing
+
+import pytest
+
+from backend.use_cases.result_stores.sqlite_store import SqliteStore
+
+
+def write_entries(path, worker):
+    store = SqliteStore(path, "datasets")
+    for i in range(50):
+        store[f"{worker}-{i}"] = {"worker": worker, "index": i}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "results.db")
+
+
+def test_get_and_put(path):
+    store = SqliteStore(path)
+    store["a"] = {"score": 1.5, "categories": [{"name": "age"}]}
+    assert store.get("a") == {"score": 1.5, "categories": [{"name": "age"}]}
+    assert store.get("b") is None
+    assert store.get_statistics() == {"entries": 1, "hits": 1, "misses": 1, "evictions": 0}
+
+    del store["a"]
+    assert "a" not in store
+
+
+def test_entries_survive_reopening(path):
+    SqliteStore(path, "datasets")["a"] = "456"
+    store = SqliteStore(path, "datasets")
+    assert store["a"] == "456"
+    # Stores in other namespaces do not see the entry
+    assert "a" not in SqliteStore(path, "comparisons")
+
+
+def test_entries_expire(path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("backend.use_cases.result_stores.sqlite_store.time.time", lambda: now[0])
+    store = SqliteStore(path, ttl=10)
+    store["a"] = 1
+    store.put("b", 2, ttl=60)
+
+    now[0] += 30
+    assert "a" not in store
+    assert store.get("a") is None
+    assert store.get("b") == 2
+    assert store.evictions == 1
+
+
+def test_concurrent_writers(path):
+    SqliteStore(path, "datasets")
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=write_entries, args=(path, worker)) for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    store = SqliteStore(path, "datasets")
+    assert len(store) == 200
+    assert store["3-49"] == {"worker": 3, "index": 49}
+
+
+def test_oldest_entries_are_evicted_beyond_max_entries(path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("backend.use_cases.result_stores.sqlite_store.time.time", lambda: now[0])
+    store = SqliteStore(path, "datasets", max_entries=2)
+    for key in ("a", "b", "c"):
+        store[key] = key
+        now[0] += 1
+    assert "a" not in store
+    assert store["b"] == "b" and store["c"] == "c"
+    assert len(store) == 2
+    assert store.evictions == 1
+    # The bound applies to each namespace
+    SqliteStore(path, "comparisons", max_entries=2)["a"] = "a"
+    assert len(store) == 2
@@ -0,0 +1,61 @@
+import pytest
+
+from backend.entities.dataset_files.csv_file import CSVFile
+from backend.entities.trait_statistics import TraitStatistics
+from backend.use_cases.statistics_engines.statistics_engine import StatisticsEngine
+
+
+@pytest.fixture
+def test_dataset():
+    return CSVFile("backend/tests/test_data.csv")
+
+
+@pytest.fixture
+def test_engine():
+    return StatisticsEngine()
+
+
+def test_compute_category(test_dataset, test_engine):
+    statistics = test_engine.compute_category(test_dataset.df, "sex")
+    assert statistics.get_count_map() == {"Female": 5, "Male": 5}
+    assert statistics.get_fpr_map() == {"Female": 0.4, "Male": 0.4}
+
+
+def test_compute_numeric_category(test_dataset, test_engine):
+    statistics = test_engine.compute_category(test_dataset.df, "age")
+    assert statistics.get_count_map() == {"0-16": 3, "17-25": 2, "26-38": 1, "39+": 4}
+    assert test_dataset.df["age"].tolist()[:3] == [11, 39, 16]
+
+
+def test_compute(test_dataset, test_engine):
+    statistics = test_engine.compute(test_dataset.df, test_dataset.categories)
+    assert set(statistics) == {"citizenship", "sex", "age"}
+    assert sum(statistics["citizenship"].counts) == 10
+
+
+def test_compute_values(test_dataset, test_engine):
+    statistics = test_engine.compute_values(test_dataset.df, {"age", "sex"})
+    assert sum(statistics["age"].counts) == 10
+    assert 11.0 in statistics["age"].traits
+    restored = TraitStatistics.from_dict(statistics["sex"].to_dict())
+    assert restored.get_fpr_map() == statistics["sex"].get_fpr_map() == {"Female": 0.4, "Male": 0.4}
+
+
+def test_compute_confusion_matrix(test_dataset, test_engine):
+    statistics = test_engine.compute_category(test_dataset.df, "sex")
+    confusion = dict(zip(statistics.traits, statistics.confusion.tolist()))
+    assert confusion == {"Female": [3, 1, 1, 0], "Male": [0, 0, 2, 3]}
+    assert statistics.get_rate_map("error_rate") == statistics.get_fpr_map()
+    assert statistics.get_rate_map("fpr") == {"Female": 0.25, "Male": 1.0}
+    assert statistics.get_rate_map("fnr") == {"Female": 1.0, "Male": 0.0}
+    assert statistics.get_rate_map("tpr") == {"Female": 0.0, "Male": 1.0}
+    assert statistics.get_rate_map("ppv") == {"Female": 0.0, "Male": 0.6}
+
+
+def test_rates_need_binary_outcomes(test_dataset, test_engine):
+    df = test_dataset.df.assign(marked=test_dataset.df["marked"] * 0.5)
+    statistics = test_engine.compute_category(df, "sex")
+    assert statistics.confusion is None
+    assert statistics.get_fpr_map() == {"Female": 0.3, "Male": 0.5}
+    with pytest.raises(ValueError):
+        statistics.get_rates("fpr")
@@ -0,0 +1,48 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.controllers import controllers
+from backend.controllers.http_cache_middleware import HttpCacheMiddleware
+from backend.controllers.timing_middleware import TimingMiddleware
+from backend.presenters import metrics
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", True)
+    app = FastAPI()
+    app.add_middleware(HttpCacheMiddleware)
+    app.add_middleware(TimingMiddleware)
+    app.include_router(controllers.router)
+    return TestClient(app)
+
+
+def test_upload_reports_stage_timings(client):
+    with open("backend/tests/test_data.csv", "rb") as file:
+        response = client.post("/api/generateDataset", params={"duplicates": "alias"},
+                               files={"file": ("timed.csv", file)})
+    assert response.status_code == 200
+    stages = [entry.split(";")[0] for entry in response.headers["server-timing"].split(", ")]
+    assert stages == ["copy", "admission", "parse", "process", "analyze", "build", "statistics", "store", "job",
+                      "total"]
+
+    read = client.get("/api/getDataset", params={"id": response.json()["id"]})
+    assert read.headers["server-timing"].startswith("total;dur=")
+
+    text = client.get("/metrics").text
+    assert 'bias_stage_seconds_count{stage="parse"}' in text
+    assert 'bias_http_requests_total{method="POST",path="/api/generateDataset",status="200"}' in text
+    assert "bias_dataset_rows_sum" in text
+
+
+def test_unknown_paths_share_a_series(client):
+    client.get("/api/unknown")
+    assert 'bias_http_requests_total{method="GET",path="other",status="404"}' in client.get("/metrics").text
+
+
+def test_metrics_disabled(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", False)
+    app = FastAPI()
+    app.include_router(controllers.router)
+    assert TestClient(app).get("/metrics").status_code == 404
@@ -26,3 +26,11 @@ def test_calculate_overall_score(test_dataset, test_calculator):
 
 def test_calculate_score(test_dataset, test_calculator):
     assert round(test_calculator.calculate_score(test_dataset.df, "age"), 3) == 4.792
+
+
+def test_process_dataset_in_chunks(test_dataset, test_calculator):
+    streamed_dataset = CSVFile("backend/tests/test_data.csv", chunk_size=3)
+    test_calculator.process_dataset(test_dataset)
+    test_calculator.process_dataset(streamed_dataset)
+    assert streamed_dataset.get_overall_score() == test_dataset.get_overall_score()
+    assert streamed_dataset.get_category_trait_fprs("age") == test_dataset.get_category_trait_fprs("age")
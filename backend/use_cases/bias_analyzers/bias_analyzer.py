@@ -23,6 +23,10 @@ class BiasAnalyzer:
 
     dataset: DatasetFile
 
+    # Version of the analysis logic, part of the key under which results of uploads are cached. It must be
+    # increased whenever a change alters the analysis generated for the same dataset.
+    VERSION = 1
+
     def __init__(self, dataset: DatasetFile):
         """
         Initializes the BiasAnalyzer with a given dataset.
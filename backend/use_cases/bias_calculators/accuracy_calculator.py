@@ -8,6 +8,7 @@ The `AccuracyCalculator` evaluates dataset bias by:
 - Mapping the mean FPR to a bias score, scaled between 0 and 10.
 """
 
+from backend.entities.trait_statistics import BENEFICIAL_METRICS, TraitStatistics
 from backend.use_cases.bias_calculators.bias_calculator import BiasCalculator
 import numpy as np
 
@@ -31,15 +32,25 @@ class AccuracyCalculator(BiasCalculator):
         Returns:
             float: The overall bias score, scaled between 0 and 10.
         """
-        ave_score = 0
-        for category in categories:
-            ave_score += self.calculate_score(df, category)
-        return ave_score / len(categories)
+        return self.calculate_overall_statistics_score(self.engine.compute(df, categories))
 
     def calculate_score(self, df, category: str) -> float:
         """
         Calculates the bias score for a specific category based on the mean FPR.
 
+        Args:
+            df (pd.DataFrame): The dataset as a pandas DataFrame.
+            category (str): The category to calculate the bias score for.
+
+        Returns:
+            float: The calculated bias score for the category.
+        """
+        return self.calculate_statistics_score(self.engine.compute_category(df, category))
+
+    def calculate_statistics_score(self, statistics: TraitStatistics) -> float:
+        """
+        Calculates the bias score for a specific category based on the mean FPR.
+
         The score is determined by:
         - Calculating the mean FPR for the traits in the category.
         - Scaling and inverting the mean FPR to a score between 0 (high bias) and 10 (low bias).
@@ -49,16 +60,23 @@ class AccuracyCalculator(BiasCalculator):
         2. Define a maximum threshold for average FPRs (`max_fpr_threshold = 1.0`).
         3. Scale and invert the mean FPR to produce a score in the range [0, 10].
 
+        The FPRs are the rates of the calculator's `metric` (see `obtain_rates`).
+
         Args:
-            df (pd.DataFrame): The dataset as a pandas DataFrame.
-            category (str): The category to calculate the bias score for.
+            statistics (TraitStatistics): The per-trait statistics of the category.
 
         Returns:
             float: The calculated bias score for the category.
         """
         # Step 1: Calculate the mean of FPRs
-        kind_fprs = self.obtain_fpr_set(df, category)
+        kind_fprs = self.obtain_rates(statistics)
+        if not len(kind_fprs):
+            # No trait has a defined rate, so there is nothing to penalize
+            return 10
         ave_fpr = np.mean(kind_fprs)
+        if self.metric in BENEFICIAL_METRICS:
+            # A high rate is good for these metrics, so the shortfall from a perfect rate is scored instead
+            ave_fpr = 1 - ave_fpr
 
         # Step 2: Define a maximum threshold for average FPRs
         max_fpr_threshold = 1.0  # As FPRs range between 0 and 1
@@ -6,13 +6,19 @@ This module defines the `BiasCalculator` class, which provides methods to calcul
 The `BiasCalculator` is responsible for:
 - Calculating overall dataset bias scores.
 - Determining bias scores for individual categories.
-- Processing false positive rates (FPRs) for category-specific traits.
-- Categorizing numerical data into quartile-based ranges for FPR calculation.
+- Processing false positive rates (FPRs) for category-specific traits, using the per-trait statistics
+  produced by a `StatisticsEngine`. The rate the scores are based on is selectable among `METRICS`,
+  and defaults to the share of misclassified rows.
+- Grouping numerical data into ranges (quartile-based by default) for FPR calculation.
 """
 
 import numpy as np
 import pandas as pd
 from backend.entities.dataset_files.dataset_file import DatasetFile
+from backend.entities.numeric_bins import NumericBins
+from backend.entities.trait_statistics import METRICS, TraitStatistics
+from backend.use_cases.numeric_binners.quantile_binner import QuantileBinner
+from backend.use_cases.statistics_engines.statistics_engine import StatisticsEngine
 
 
 class BiasCalculator:
@@ -22,9 +28,38 @@ class BiasCalculator:
     This class provides methods for processing datasets, calculating overall and category-specific
     scores, and analyzing false positive rates (FPRs) for different traits.
 
-    Methods `calculate_overall_score` and `calculate_score` must be implemented by subclasses.
+    Methods `calculate_overall_score`, `calculate_score` and `calculate_statistics_score` must be implemented
+    by subclasses.
+
+    Attributes:
+        engine (StatisticsEngine): The engine used to compute per-trait statistics.
+        metric (str): The rate of `METRICS` the scores are based on.
     """
 
+    engine: StatisticsEngine
+    metric: str
+
+    # Version of the scoring logic, part of the key under which results of uploads are cached. It must be
+    # increased whenever a change alters the scores calculated for the same file.
+    VERSION = 1
+
+    def __init__(self, engine: StatisticsEngine | None = None, metric: str = "error_rate") -> None:
+        """
+        Initializes the BiasCalculator with the engine used to compute per-trait statistics.
+
+        Args:
+            engine (StatisticsEngine | None): The statistics engine to use. Defaults to a new `StatisticsEngine`.
+            metric (str): The rate of `METRICS` to base the scores on. Defaults to the share of misclassified
+                rows, which the scores have always been based on.
+
+        Raises:
+            ValueError: If the metric is unknown.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        self.engine = engine if engine is not None else StatisticsEngine()
+        self.metric = metric
+
     def calculate_overall_score(self, df: pd.DataFrame, categories: set) -> float:
         """
         Calculates the overall bias score for the dataset.
@@ -61,30 +96,143 @@ class BiasCalculator:
         """
         raise NotImplementedError
 
+    def calculate_statistics_score(self, statistics: TraitStatistics) -> float:
+        """
+        Calculates the bias score for a category from its per-trait statistics.
+
+        This method must be implemented by subclasses.
+
+        Args:
+            statistics (TraitStatistics): The per-trait statistics of the category.
+
+        Returns:
+            float: The bias score for the category.
+
+        Raises:
+            NotImplementedError: If not implemented in a subclass.
+        """
+        raise NotImplementedError
+
+    def calculate_overall_statistics_score(self, category_statistics: dict[str, TraitStatistics]) -> float:
+        """
+        Calculates the overall bias score for the dataset from the per-trait statistics of its categories.
+
+        The overall score is the average of the individual category scores.
+
+        Args:
+            category_statistics (dict[str, TraitStatistics]): The per-trait statistics of each category.
+
+        Returns:
+            float: The overall bias score.
+        """
+        return sum(self.calculate_statistics_score(statistics)
+                   for statistics in category_statistics.values()) / len(category_statistics)
+
     def process_dataset(self, dataset: DatasetFile) -> None:
         """
         Processes the dataset to calculate bias scores and false positive rates (FPRs).
 
+        The overall score, the category scores and the FPR maps are all derived from the per-trait
+        statistics cached on the dataset, so each category is scanned at most once.
+
         Args:
             dataset (DatasetFile): The dataset object to process.
 
         Updates:
             - Calculates and assigns the overall dataset score.
             - Calculates and assigns scores for individual categories.
-            - Generates FPR maps for traits in each category.
+            - Generates maps of the selected rate for traits in each category.
             - Marks the dataset as processed.
         """
-        dataset.score = self.calculate_overall_score(dataset.df, dataset.categories)
-        dataset.category_scores = {category: self.calculate_score(dataset.df, category)
-                                   for category in dataset.categories}
-        dataset.category_fprs = {category: self.obtain_fpr_map(dataset.df, category) for category in dataset.categories}
+        category_statistics = self.obtain_dataset_statistics(dataset)
+        dataset.score = self.calculate_overall_statistics_score(category_statistics)
+        dataset.category_scores = {category: self.calculate_statistics_score(statistics)
+                                   for category, statistics in category_statistics.items()}
+        dataset.category_fprs = {category: statistics.get_rate_map(self.metric)
+                                 for category, statistics in category_statistics.items()}
         dataset.is_processed = True
 
+    def obtain_rates(self, statistics: TraitStatistics) -> np.ndarray:
+        """
+        Derives the selected rate of every trait of a category from its statistics, leaving out traits for which
+        the rate is undefined (such as the FPR of a trait without actual negatives).
+
+        Args:
+            statistics (TraitStatistics): The per-trait statistics of the category.
+
+        Returns:
+            np.ndarray: The defined rates of the traits.
+
+        Raises:
+            ValueError: If the rate needs binary outcomes and the dataset's are not.
+        """
+        rates = statistics.get_rates(self.metric)
+        return rates[~np.isnan(rates)]
+
+    def obtain_dataset_statistics(self, dataset: DatasetFile) -> dict[str, TraitStatistics]:
+        """
+        Retrieves the per-trait statistics of every category in the dataset.
+
+        Statistics already cached on the dataset are reused. Categories loaded in chunks are derived from
+        their per-value statistics, and the remaining categories are computed together in one engine pass.
+        All of them are cached on the dataset, along with the bins of numerical categories.
+
+        Args:
+            dataset (DatasetFile): The dataset to obtain statistics for.
+
+        Returns:
+            dict[str, TraitStatistics]: A dictionary mapping each category to its trait statistics.
+        """
+        missing = {category for category in dataset.categories if dataset.get_category_statistics(category) is None}
+
+        for category in [category for category in missing if dataset.get_value_statistics(category) is not None]:
+            statistics = dataset.get_value_statistics(category)
+            if dataset.is_numeric_category(category):
+                bins = self.obtain_numeric_bins(dataset, category)
+                statistics = statistics.regroup(bins.assign(np.array(statistics.traits, dtype=float)), bins.labels)
+            dataset.set_category_statistics(category, statistics)
+            missing.remove(category)
+
+        if missing:
+            numeric_bins = {category: self.obtain_numeric_bins(dataset, category)
+                            for category in missing if dataset.is_numeric_category(category)}
+            for category, statistics in self.engine.compute(dataset.df, missing, numeric_bins).items():
+                dataset.set_category_statistics(category, statistics)
+
+        return {category: dataset.get_category_statistics(category) for category in dataset.categories}
+
+    def obtain_numeric_bins(self, dataset: DatasetFile, category: str) -> NumericBins:
+        """
+        Retrieves the bins of a numerical category, computing and caching them on the dataset if needed.
+
+        Categories loaded in chunks are binned from their merged per-value counts, so their bins do not
+        depend on how the file was split into chunks.
+
+        Args:
+            dataset (DatasetFile): The dataset the category belongs to.
+            category (str): The numerical category to obtain bins for.
+
+        Returns:
+            NumericBins: The ranges the category is grouped into.
+        """
+        bins = dataset.get_numeric_bins(category)
+        if bins is None:
+            value_statistics = dataset.get_value_statistics(category)
+            if value_statistics is not None:
+                bins = self.engine.binner.compute_bins_from_counts(
+                    np.array(value_statistics.traits, dtype=float), value_statistics.counts)
+            else:
+                bins = self.engine.binner.compute_bins(dataset.df[category])
+            dataset.set_numeric_bins(category, bins)
+        return bins
+
     def calculate_fpr(self, df: pd.DataFrame) -> float:
         """
-        Calculates the false positive rate (FPR) for a subset of the dataset.
+        Calculates the share of misclassified rows for a subset of the dataset, historically reported as its
+        false positive rate (FPR).
 
-        The FPR is calculated as the proportion of mismatches between "marked" and "actual" values.
+        The rate is calculated as the proportion of mismatches between "marked" and "actual" values. See
+        `TraitStatistics.get_rates` for the actual FPR and the other rates of `METRICS`.
 
         Args:
             df (pd.DataFrame): The subset of the dataset to analyze.
@@ -106,17 +254,7 @@ class BiasCalculator:
         Returns:
             list[float]: A list of FPRs for each trait in the category.
         """
-        if np.issubdtype(df[category].dtype, np.number):
-            df = self.update_number_kinds_by_irq(df, category)
-
-        kinds = set(df[category])
-        kind_fprs = []
-
-        for kind in kinds:
-            kind_fpr = self.calculate_fpr(df[df[category] == kind])
-            kind_fprs.append(kind_fpr)
-
-        return kind_fprs
+        return self.engine.compute_category(df, category).get_fprs().tolist()
 
     def obtain_fpr_map(self, df: pd.DataFrame, category: str) -> dict[str, float]:
         """
@@ -129,44 +267,22 @@ class BiasCalculator:
         Returns:
             dict[str, float]: A dictionary mapping traits to their FPRs.
         """
-        if np.issubdtype(df[category].dtype, np.number):
-            df = self.update_number_kinds_by_irq(df, category)
-
-        kinds = set(df[category])
-        result = {}
-
-        for kind in kinds:
-            kind_fpr = self.calculate_fpr(df[df[category] == kind])
-            result[kind] = kind_fpr
-
-        return result
+        return self.engine.compute_category(df, category).get_fpr_map()
 
     def update_number_kinds_by_irq(self, df: pd.DataFrame, column: str) -> pd.DataFrame:
         """
         Converts a numerical column into quartile-based ranges for categorical analysis.
 
-        The numerical values are replaced with range labels based on interquartile range (IQR).
+        The numerical values are replaced with range labels based on interquartile range (IQR) in a copy
+        of the dataset; the given DataFrame is left unchanged. The bias calculations themselves do not
+        use this method, they assign compact range codes through a `NumericBinner` instead.
 
         Args:
             df (pd.DataFrame): The dataset as a pandas DataFrame.
             column (str): The numerical column to process.
 
         Returns:
-            pd.DataFrame: The dataset with the updated column.
+            pd.DataFrame: A copy of the dataset with the updated column.
         """
-        q1 = round(df[column].quantile(0.25))
-        q2 = round(df[column].quantile(0.50))
-        q3 = round(df[column].quantile(0.75))
-
-        conditions = [
-            (df[column] < q1),
-            (df[column] >= q1) & (df[column] < q2),
-            (df[column] >= q2) & (df[column] < q3),
-            (df[column] >= q3)
-        ]
-
-        choices = [f"0-{q1 - 1}", f"{q1}-{q2 - 1}", f"{q2}-{q3 - 1}", f"{q3}+"]
-
-        df[column] = np.select(conditions, choices)
-
-        return df
+        bins = QuantileBinner().compute_bins(df[column])
+        return df.assign(**{column: bins.label(df[column].to_numpy())})
@@ -0,0 +1,119 @@
+"""
+calculator_pipeline.py
+
+This module defines the `CalculatorPipeline` class, which scores a dataset with every registered
+`BiasCalculator` at once.
+
+The per-trait statistics of the dataset are computed once, by the first calculator, and every
+calculator then scores the same statistics. Each additional calculator therefore costs time linear in
+the number of traits, not in the number of rows.
+"""
+
+from backend.entities.dataset_files.dataset_file import DatasetFile
+from backend.entities.trait_statistics import TraitStatistics
+from backend.use_cases.bias_calculators.accuracy_calculator import AccuracyCalculator
+from backend.use_cases.bias_calculators.bias_calculator import BiasCalculator
+from backend.use_cases.bias_calculators.variance_calculator import VarianceCalculator
+from backend.use_cases.statistics_engines.statistics_engine import StatisticsEngine
+
+# Calculators run by default, by the name under which their scores are reported. The first one also sets the
+# scores of the dataset itself. Calculators must be registered when this module is imported, so that worker
+# processes run the same ones.
+REGISTERED_CALCULATORS: dict[str, type[BiasCalculator]] = {
+    "variance": VarianceCalculator,
+    "accuracy": AccuracyCalculator,
+}
+
+
+def register_calculator(name: str, calculator_class: type[BiasCalculator]) -> None:
+    """
+    Registers a calculator to be run by default by every `CalculatorPipeline`.
+
+    Args:
+        name (str): The name under which the calculator's scores are reported.
+        calculator_class (type[BiasCalculator]): The `BiasCalculator` subclass to run.
+
+    Raises:
+        ValueError: If another calculator is already registered under that name.
+    """
+    if REGISTERED_CALCULATORS.get(name, calculator_class) is not calculator_class:
+        raise ValueError(f"A calculator is already registered as {name}.")
+    REGISTERED_CALCULATORS[name] = calculator_class
+
+
+class CalculatorPipeline:
+    """
+    Scores datasets with several calculators sharing one set of per-trait statistics.
+
+    Attributes:
+        calculators (dict[str, BiasCalculator]): The calculators by name, all based on the same metric and
+            statistics engine.
+    """
+
+    calculators: dict[str, BiasCalculator]
+
+    def __init__(self, metric: str = "error_rate", engine: StatisticsEngine | None = None,
+                 calculators: dict[str, type[BiasCalculator]] | None = None) -> None:
+        """
+        Initializes the CalculatorPipeline.
+
+        Args:
+            metric (str): The rate of `METRICS` every calculator bases its scores on.
+            engine (StatisticsEngine | None): The statistics engine shared by the calculators. Defaults to a new
+                `StatisticsEngine`.
+            calculators (dict[str, type[BiasCalculator]] | None): The calculators to run by name. Defaults to
+                `REGISTERED_CALCULATORS`.
+
+        Raises:
+            ValueError: If no calculator is given or the metric is unknown.
+        """
+        calculators = calculators if calculators is not None else REGISTERED_CALCULATORS
+        if not calculators:
+            raise ValueError("A calculator pipeline needs at least one calculator.")
+        engine = engine if engine is not None else StatisticsEngine()
+        self.calculators = {name: calculator_class(engine, metric) for name, calculator_class in calculators.items()}
+
+    def get_versions(self) -> list:
+        """
+        Lists the name, class and scoring version of every calculator, to tell results of other pipelines apart.
+
+        Returns:
+            list: A `[name, class name, VERSION]` list for every calculator.
+        """
+        return [[name, type(calculator).__name__, calculator.VERSION] for name, calculator in self.calculators.items()]
+
+    def process_dataset(self, dataset: DatasetFile) -> dict:
+        """
+        Processes a dataset with the first calculator, then scores its statistics with every calculator.
+
+        The dataset's own scores and FPR maps are those of the first calculator, exactly as if it had been
+        processed by that calculator alone.
+
+        Args:
+            dataset (DatasetFile): The dataset to process.
+
+        Returns:
+            dict: The scores of every calculator (see `score_statistics`).
+        """
+        primary = next(iter(self.calculators.values()))
+        primary.process_dataset(dataset)
+        return self.score_statistics(primary.obtain_dataset_statistics(dataset))
+
+    def score_statistics(self, category_statistics: dict[str, TraitStatistics]) -> dict:
+        """
+        Scores the per-trait statistics of the categories of a dataset with every calculator.
+
+        Args:
+            category_statistics (dict[str, TraitStatistics]): The per-trait statistics of each category.
+
+        Returns:
+            dict: The overall score of every calculator by name under "overall", and the score of every
+                calculator by name for each category under "categories".
+        """
+        return {
+            "overall": {name: calculator.calculate_overall_statistics_score(category_statistics)
+                        for name, calculator in self.calculators.items()},
+            "categories": {category: {name: calculator.calculate_statistics_score(statistics)
+                                      for name, calculator in self.calculators.items()}
+                           for category, statistics in category_statistics.items()}
+        }
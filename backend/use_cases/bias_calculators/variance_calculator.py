@@ -8,6 +8,7 @@ The `VarianceCalculator` evaluates dataset bias by:
 - Mapping FPR variance to a bias score, scaled between 0 and 10.
 """
 
+from backend.entities.trait_statistics import TraitStatistics
 from backend.use_cases.bias_calculators.bias_calculator import BiasCalculator
 import numpy as np
 
@@ -31,15 +32,25 @@ class VarianceCalculator(BiasCalculator):
         Returns:
             float: The overall bias score, scaled between 0 and 10.
         """
-        ave_score = 0
-        for category in categories:
-            ave_score += self.calculate_score(df, category)
-        return ave_score / len(categories)
+        return self.calculate_overall_statistics_score(self.engine.compute(df, categories))
 
     def calculate_score(self, df, category: str) -> float:
         """
         Calculates the bias score for a specific category based on the variance of FPRs.
 
+        Args:
+            df (pd.DataFrame): The dataset as a pandas DataFrame.
+            category (str): The category to calculate the bias score for.
+
+        Returns:
+            float: The calculated bias score for the category.
+        """
+        return self.calculate_statistics_score(self.engine.compute_category(df, category))
+
+    def calculate_statistics_score(self, statistics: TraitStatistics) -> float:
+        """
+        Calculates the bias score for a specific category based on the variance of FPRs.
+
         The score is determined by:
         - Calculating the variance of FPRs for the traits in the category.
         - Scaling and inverting the variance to a score between 0 (high bias) and 10 (low bias).
@@ -49,15 +60,19 @@ class VarianceCalculator(BiasCalculator):
         2. Define a maximum variance threshold (`max_variance = 0.25`).
         3. Scale and invert the variance to produce a score in the range [0, 10].
 
+        The FPRs are the rates of the calculator's `metric` (see `obtain_rates`).
+
         Args:
-            df (pd.DataFrame): The dataset as a pandas DataFrame.
-            category (str): The category to calculate the bias score for.
+            statistics (TraitStatistics): The per-trait statistics of the category.
 
         Returns:
             float: The calculated bias score for the category.
         """
         # Step 1: Calculate the variance of FPRs
-        kind_fprs = self.obtain_fpr_set(df, category)
+        kind_fprs = self.obtain_rates(statistics)
+        if not len(kind_fprs):
+            # No trait has a defined rate, so no disparity can be measured
+            return 10
         fpr_variance = np.var(kind_fprs)
 
         # Step 2: Define the max variance threshold you want to scale within
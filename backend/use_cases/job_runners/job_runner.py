@@ -0,0 +1,258 @@
+"""
+job_runner.py
+
+This module defines the `JobRunner` class, which runs CPU-bound work such as parsing and scoring
+datasets in a pool of worker processes, away from the event loop serving requests.
+
+At most `max_workers` jobs run at once, and at most `max_queue` more wait for a free worker.
+Submitting beyond that raises `JobQueueFullError`, so the server can turn work away (e.g. with
+HTTP 429) instead of accumulating an unbounded backlog.
+
+If a worker process dies (e.g. killed for running out of memory), the pool cannot run anything anymore:
+the jobs it held fail, and the next job is submitted to a new pool.
+"""
+import asyncio
+import multiprocessing
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor
+from typing import Callable
+
+from backend.entities.job import Job
+
+
+class JobQueueFullError(Exception):
+    """
+    Raised when a job is submitted while every worker is busy and the queue is full.
+    """
+
+
+# Error of the jobs that were queued or running in a pool whose worker process died
+BROKEN_POOL_ERROR = "A worker process stopped unexpectedly, for example after running out of memory."
+
+
+class JobRunner:
+    """
+    Runs jobs in a process pool with a bounded number of waiting jobs.
+
+    Attributes:
+        max_workers (int): The number of jobs that can run at once.
+        max_queue (int): The number of jobs that can wait for a worker.
+        jobs (OrderedDict[str, Job]): The known jobs, oldest first. Finished jobs beyond `HISTORY_LIMIT`
+            are forgotten.
+    """
+
+    max_workers: int
+    max_queue: int
+    jobs: OrderedDict[str, Job]
+
+    # Number of finished jobs whose outcome is kept for polling
+    HISTORY_LIMIT = 1000
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        """
+        Initializes a JobRunner. Worker processes are only started when the first job is submitted.
+
+        Args:
+            max_workers (int): The number of jobs that can run at once.
+            max_queue (int): The number of jobs that can wait for a worker.
+
+        Raises:
+            ValueError: If there are no workers or the queue size is negative.
+        """
+        if max_workers < 1 or max_queue < 0:
+            raise ValueError("A job runner needs at least one worker and a non-negative queue size.")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.jobs = OrderedDict()
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, function: Callable, *args, callback: Callable | None = None,
+               on_change: Callable[[Job], None] | None = None) -> Job:
+        """
+        Queues a function to run in a worker process.
+
+        Args:
+            function (Callable): A picklable, module-level function to run.
+            *args: The picklable arguments to call it with.
+            callback (Callable | None): A function called with the result of a successful job, whose return
+                value is kept as the job's result. It runs in a background thread of this process.
+            on_change (Callable[[Job], None] | None): A function called with the job once it is queued and
+                again once it has finished, always in that order.
+
+        Returns:
+            Job: The queued job.
+
+        Raises:
+            JobQueueFullError: If `max_workers` jobs are running and `max_queue` jobs are already waiting.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                raise JobQueueFullError(f"{self._pending} jobs are already queued or running.")
+            self._pending += 1
+
+        try:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(function, *args)
+            except BrokenExecutor:
+                # A worker died since the last job; its jobs fail on their own, and this one goes to a new pool
+                self._discard_executor(executor)
+                executor = self._get_executor()
+                future = executor.submit(function, *args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        job = Job(str(uuid.uuid4()), future)
+        with self._lock:
+            self.jobs[job.id] = job
+        if on_change is not None:
+            on_change(job)
+        # Added after the first change notification, so that the job cannot be reported finished before queued
+        future.add_done_callback(lambda done: self._finish(job, done, executor, callback, on_change))
+        return job
+
+    def has_capacity(self) -> bool:
+        """
+        Checks whether a job can be submitted without raising `JobQueueFullError`.
+
+        Returns:
+            bool: True if fewer than `max_workers + max_queue` jobs are queued or running, False otherwise.
+        """
+        with self._lock:
+            return self._pending < self.max_workers + self.max_queue
+
+    def count_pending(self) -> int:
+        """
+        Counts the jobs queued or running.
+
+        Returns:
+            int: The number of jobs submitted that have not finished.
+        """
+        with self._lock:
+            return self._pending
+
+    def record(self, result: object, on_change: Callable[[Job], None] | None = None) -> Job:
+        """
+        Registers a job that is already done without running anything, such as one whose result was cached.
+
+        Args:
+            result: The result of the job.
+            on_change (Callable[[Job], None] | None): A function called with the job once it is registered.
+
+        Returns:
+            Job: The finished job.
+        """
+        job = Job(str(uuid.uuid4()), None)
+        job.finish(result)
+        with self._lock:
+            self.jobs[job.id] = job
+            self._forget_finished()
+        if on_change is not None:
+            on_change(job)
+        return job
+
+    def get_job(self, id: str) -> Job | None:
+        """
+        Retrieves a job by its unique ID.
+
+        Args:
+            id (str): The unique identifier of the job.
+
+        Returns:
+            Job | None: The job, or None if it is unknown or has been forgotten.
+        """
+        return self.jobs.get(id)
+
+    async def wait(self, job: Job) -> Job:
+        """
+        Waits without blocking the event loop until a job has finished.
+
+        Args:
+            job (Job): The job to wait for.
+
+        Returns:
+            Job: The finished job.
+        """
+        future = job.future
+        if future is not None:
+            # Done callbacks run in the order they were added, so the outcome is recorded on the job by the
+            # time the wrapped future resolves
+            done, _ = await asyncio.wait([asyncio.wrap_future(future)])
+            # The outcome is read from the job, so the error of a failed job is only marked as retrieved
+            done.pop().exception()
+        return job
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker processes, waiting for running jobs to finish.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _finish(self, job: Job, future: Future, executor: ProcessPoolExecutor, callback: Callable | None,
+                on_change: Callable[[Job], None] | None) -> None:
+        """
+        Records the outcome of a finished job and frees its place in the queue. A job that failed because a worker
+        process died discards its pool.
+
+        Args:
+            job (Job): The finished job.
+            future (Future): The completed execution of the job.
+            executor (ProcessPoolExecutor): The pool the job ran in.
+            callback (Callable | None): The function to pass a successful result through.
+            on_change (Callable[[Job], None] | None): The function to notify of the outcome.
+        """
+        try:
+            result = future.result()
+            job.finish(callback(result) if callback is not None else result)
+        except BrokenExecutor:
+            job.finish(error=BROKEN_POOL_ERROR)
+            self._discard_executor(executor)
+        except BaseException as error:
+            job.finish(error=str(error) or type(error).__name__)
+        if on_change is not None:
+            on_change(job)
+
+        with self._lock:
+            self._pending -= 1
+            self._forget_finished()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Retrieves the pool of worker processes, creating it if there is none.
+
+        Returns:
+            ProcessPoolExecutor: The pool to submit jobs to.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Shuts down a pool that can no longer run jobs, so that the next job creates a new one.
+
+        Args:
+            executor (ProcessPoolExecutor): The broken pool, left alone if it has already been replaced.
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        executor.shutdown(wait=False)
+
+    def _forget_finished(self) -> None:
+        """
+        Forgets the oldest finished jobs beyond `HISTORY_LIMIT`. The lock must be held.
+        """
+        finished = [id for id, job in self.jobs.items() if job.is_finished()]
+        for id in finished[:max(0, len(finished) - self.HISTORY_LIMIT)]:
+            del self.jobs[id]
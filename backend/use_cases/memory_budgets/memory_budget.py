@@ -0,0 +1,165 @@
+"""
+memory_budget.py
+
+This module defines the `MemoryBudget` class, which bounds the memory that jobs processing datasets may
+take together, so that one oversized upload cannot exhaust the memory of the server.
+
+Jobs reserve their estimated peak memory before they start and release it once they have finished. A job
+that would never fit in the budget raises `MemoryBudgetExceededError`, and one that does not fit next to
+the jobs already holding reservations raises `MemoryBudgetFullError`, so the server can reject the first
+(e.g. with HTTP 413) and ask the client to retry the second (e.g. with HTTP 429).
+"""
+import os
+import threading
+
+# Files holding the memory limit of the container the server runs in (cgroup v2, then v1)
+CGROUP_LIMIT_FILES = ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes")
+
+# Share of the memory available to the server that is budgeted for jobs when no limit is configured, divided
+# between the server processes
+DEFAULT_SHARE = 0.5
+
+
+class MemoryBudgetExceededError(Exception):
+    """
+    Raised when a job needs more memory than the whole budget.
+    """
+
+
+class MemoryBudgetFullError(Exception):
+    """
+    Raised when a job needs more memory than is left in the budget by the jobs holding reservations.
+    """
+
+
+class MemoryBudget:
+    """
+    Keeps track of the memory reserved by running and queued jobs.
+
+    Attributes:
+        limit (int | None): The number of bytes that can be reserved at once, or None for no limit.
+        reserved (int): The number of bytes currently reserved.
+    """
+
+    limit: int | None
+    reserved: int
+
+    def __init__(self, limit: int | None) -> None:
+        """
+        Initializes a MemoryBudget with nothing reserved.
+
+        Args:
+            limit (int | None): The number of bytes that can be reserved at once, or None for no limit.
+
+        Raises:
+            ValueError: If the limit is not positive.
+        """
+        if limit is not None and limit <= 0:
+            raise ValueError("A memory budget needs a positive limit.")
+        self.limit = limit
+        self.reserved = 0
+        self._lock = threading.Lock()
+
+    def has_room(self, size: int) -> bool:
+        """
+        Checks whether a reservation can be made without raising an error.
+
+        Args:
+            size (int): The number of bytes to reserve.
+
+        Returns:
+            bool: True if the bytes fit next to those already reserved, False otherwise.
+        """
+        with self._lock:
+            return self.limit is None or self.reserved + size <= self.limit
+
+    def reserve(self, size: int) -> None:
+        """
+        Reserves memory for a job, to be given back with `release` once the job has finished.
+
+        Args:
+            size (int): The number of bytes to reserve.
+
+        Raises:
+            MemoryBudgetExceededError: If the bytes exceed the whole budget.
+            MemoryBudgetFullError: If the bytes do not fit next to those already reserved.
+        """
+        with self._lock:
+            if self.limit is not None:
+                if size > self.limit:
+                    raise MemoryBudgetExceededError(
+                        f"Processing this file needs about {format_bytes(size)} of memory, more than the "
+                        f"{format_bytes(self.limit)} available.")
+                if self.reserved + size > self.limit:
+                    raise MemoryBudgetFullError(
+                        f"{format_bytes(self.reserved)} of the {format_bytes(self.limit)} of memory available are "
+                        f"reserved by other datasets being processed.")
+            self.reserved += size
+
+    def release(self, size: int) -> None:
+        """
+        Gives back memory reserved with `reserve`.
+
+        Args:
+            size (int): The number of bytes reserved.
+        """
+        with self._lock:
+            self.reserved = max(0, self.reserved - size)
+
+
+def get_budget_limit(setting: str | None, processes: int = 1) -> int | None:
+    """
+    Determines the limit of the budget of a server process from its configured number of bytes.
+
+    Args:
+        setting (str | None): The number of bytes, "0" for no limit, or None for `DEFAULT_SHARE` of the memory
+            available to the server (see `get_memory_limit`), divided between its processes.
+        processes (int): The number of server processes, each with its own budget.
+
+    Returns:
+        int | None: The number of bytes, or None for no limit.
+    """
+    if setting is not None:
+        return int(setting) or None
+    memory = get_memory_limit()
+    return max(1, int(memory * DEFAULT_SHARE) // processes) if memory is not None else None
+
+
+def get_memory_limit() -> int | None:
+    """
+    Determines how much memory the server can use: the memory limit of its container if it has one, and the
+    physical memory of the machine otherwise.
+
+    Returns:
+        int | None: The number of bytes, or None if it cannot be determined (e.g. on Windows).
+    """
+    for path in CGROUP_LIMIT_FILES:
+        try:
+            with open(path) as file:
+                limit = file.read().strip()
+        except OSError:
+            continue
+        # Unlimited containers report "max" (v2) or a huge number (v1)
+        if limit.isdigit() and int(limit) < 2 ** 60:
+            return int(limit)
+
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def format_bytes(size: int) -> str:
+    """
+    Formats a number of bytes for error messages.
+
+    Args:
+        size (int): The number of bytes.
+
+    Returns:
+        str: The size in the largest unit it amounts to at least one of, such as "1.5 GiB".
+    """
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
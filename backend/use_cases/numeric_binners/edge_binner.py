@@ -0,0 +1,75 @@
+"""
+edge_binner.py
+
+This module defines the `EdgeBinner` class, a subclass of `NumericBinner`.
+
+The `EdgeBinner` uses edges (and optionally labels) supplied by the user, so that numerical
+categories can be grouped into domain-specific ranges such as legal age brackets.
+"""
+
+import numpy as np
+import pandas as pd
+from backend.use_cases.numeric_binners.numeric_binner import NumericBinner
+
+
+class EdgeBinner(NumericBinner):
+    """
+    A concrete implementation of `NumericBinner` that uses user-supplied edges.
+
+    Attributes:
+        edges (np.ndarray): The sorted boundaries between consecutive ranges.
+        labels (list[str] | None): The label of every range, or None to generate them from the edges.
+    """
+
+    edges: np.ndarray
+    labels: list[str] | None
+
+    def __init__(self, edges: list[float], labels: list[str] | None = None) -> None:
+        """
+        Initializes the EdgeBinner with the edges and labels to use.
+
+        Args:
+            edges (list[float]): The boundaries between consecutive ranges.
+            labels (list[str] | None): The label of every range. Defaults to labels generated from the edges.
+        """
+        self.edges = np.sort(np.asarray(edges))
+        self.labels = labels
+
+    def compute_edges(self, column: pd.Series) -> np.ndarray:
+        """
+        Returns the user-supplied edges, which do not depend on the column.
+
+        Args:
+            column (pd.Series): The numerical column to bin.
+
+        Returns:
+            np.ndarray: The user-supplied edges.
+        """
+        return self.edges
+
+    def compute_edges_from_counts(self, values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Returns the user-supplied edges, which do not depend on the column.
+
+        Args:
+            values (np.ndarray): The distinct values of the column.
+            counts (np.ndarray): The number of rows holding each value.
+
+        Returns:
+            np.ndarray: The user-supplied edges.
+        """
+        return self.edges
+
+    def make_labels(self, edges: np.ndarray) -> list[str]:
+        """
+        Labels the ranges with the user-supplied labels, or generates them from the edges when not given.
+
+        Args:
+            edges (np.ndarray): The sorted boundaries between consecutive ranges.
+
+        Returns:
+            list[str]: The label of every range.
+        """
+        if self.labels is None:
+            return super().make_labels(edges)
+        return self.labels
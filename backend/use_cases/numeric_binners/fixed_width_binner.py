@@ -0,0 +1,63 @@
+"""
+fixed_width_binner.py
+
+This module defines the `FixedWidthBinner` class, a subclass of `NumericBinner`.
+
+The `FixedWidthBinner` splits a column into ranges of equal width (e.g. decades of age) covering the
+values present in the column.
+"""
+
+import numpy as np
+import pandas as pd
+from backend.use_cases.numeric_binners.numeric_binner import NumericBinner
+
+
+class FixedWidthBinner(NumericBinner):
+    """
+    A concrete implementation of `NumericBinner` that places edges at multiples of a fixed width.
+
+    Attributes:
+        width (int): The width of every range.
+    """
+
+    width: int
+
+    def __init__(self, width: int) -> None:
+        """
+        Initializes the FixedWidthBinner with the width of its ranges.
+
+        Args:
+            width (int): The width of every range.
+
+        Raises:
+            ValueError: If the width is not positive.
+        """
+        if width <= 0:
+            raise ValueError("The range width must be positive.")
+        self.width = width
+
+    def compute_edges(self, column: pd.Series) -> np.ndarray:
+        """
+        Computes edges at every multiple of the width between the column's minimum and maximum.
+
+        Args:
+            column (pd.Series): The numerical column to bin.
+
+        Returns:
+            np.ndarray: The multiples of the width that fall inside the column's range.
+        """
+        return self.compute_edges_from_counts(np.array([column.min(), column.max()]), np.ones(2))
+
+    def compute_edges_from_counts(self, values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Computes edges at every multiple of the width between the smallest and largest distinct values.
+
+        Args:
+            values (np.ndarray): The distinct values of the column.
+            counts (np.ndarray): The number of rows holding each value.
+
+        Returns:
+            np.ndarray: The multiples of the width that fall inside the column's range.
+        """
+        lowest = np.floor(np.min(values) / self.width) * self.width
+        return np.arange(lowest + self.width, np.max(values) + 1, self.width).astype(int)
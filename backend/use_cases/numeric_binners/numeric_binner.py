@@ -0,0 +1,111 @@
+"""
+numeric_binner.py
+
+This module defines the `NumericBinner` class, which provides an abstract interface for grouping
+numerical categories (such as age) into ranges. Subclasses decide where the range edges go.
+
+The `NumericBinner` class provides methods for:
+- Computing the edges of a numerical column, either from the column itself or from the counts
+  of its distinct values.
+- Labelling the ranges between edges.
+- Building the `NumericBins` used to assign rows to ranges.
+"""
+
+import numpy as np
+import pandas as pd
+from backend.entities.numeric_bins import NumericBins
+
+
+class NumericBinner:
+    """
+    Provides an abstract base for binning numerical categories.
+
+    Methods `compute_edges` and `compute_edges_from_counts` must be implemented by subclasses.
+    """
+
+    def compute_edges(self, column: pd.Series) -> np.ndarray:
+        """
+        Computes the sorted range edges for a numerical column.
+
+        This method must be implemented by subclasses.
+
+        Args:
+            column (pd.Series): The numerical column to bin.
+
+        Returns:
+            np.ndarray: The sorted boundaries between consecutive ranges.
+
+        Raises:
+            NotImplementedError: If not implemented in a subclass.
+        """
+        raise NotImplementedError
+
+    def compute_edges_from_counts(self, values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Computes the sorted range edges for a numerical column summarized by its distinct values.
+
+        This method must be implemented by subclasses, and must give the same edges as `compute_edges`
+        would for the column the counts were taken from.
+
+        Args:
+            values (np.ndarray): The distinct values of the column.
+            counts (np.ndarray): The number of rows holding each value.
+
+        Returns:
+            np.ndarray: The sorted boundaries between consecutive ranges.
+
+        Raises:
+            NotImplementedError: If not implemented in a subclass.
+        """
+        raise NotImplementedError
+
+    def compute_bins_from_counts(self, values: np.ndarray, counts: np.ndarray) -> NumericBins:
+        """
+        Computes the bins of a numerical column summarized by its distinct values.
+
+        Args:
+            values (np.ndarray): The distinct values of the column.
+            counts (np.ndarray): The number of rows holding each value.
+
+        Returns:
+            NumericBins: The edges and labels of the ranges.
+        """
+        edges = self.compute_edges_from_counts(values, counts)
+        return NumericBins(edges, self.make_labels(edges))
+
+    def compute_bins(self, column: pd.Series) -> NumericBins:
+        """
+        Computes the bins of a numerical column.
+
+        Args:
+            column (pd.Series): The numerical column to bin.
+
+        Returns:
+            NumericBins: The edges and labels of the ranges.
+        """
+        edges = self.compute_edges(column)
+        return NumericBins(edges, self.make_labels(edges))
+
+    def make_labels(self, edges: np.ndarray) -> list[str]:
+        """
+        Labels the ranges described by integer edges.
+
+        Ranges are labelled by their inclusive bounds, e.g. edges `[17, 26]` give the labels
+        `"0-16"`, `"17-25"` and `"26+"`.
+
+        Args:
+            edges (np.ndarray): The sorted boundaries between consecutive ranges.
+
+        Returns:
+            list[str]: The label of every range.
+
+        Raises:
+            ValueError: If an edge is not a whole number.
+        """
+        if not np.all(np.mod(edges, 1) == 0):
+            raise ValueError("Range labels can only be generated for whole-number edges.")
+
+        bounds = [0] + [int(edge) for edge in edges]
+        labels = [f"{lower}-{upper - 1}" for lower, upper in zip(bounds, bounds[1:])]
+        labels.append(f"{bounds[-1]}+")
+        return labels
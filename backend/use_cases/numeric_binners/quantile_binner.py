@@ -0,0 +1,98 @@
+"""
+quantile_binner.py
+
+This module defines the `QuantileBinner` class, a subclass of `NumericBinner`.
+
+The `QuantileBinner` places range edges at rounded quantiles of the column. By default it uses the
+quartiles, producing the interquartile-range (IQR) groups used throughout the bias calculations.
+"""
+
+import numpy as np
+import pandas as pd
+from backend.use_cases.numeric_binners.numeric_binner import NumericBinner
+
+
+class QuantileBinner(NumericBinner):
+    """
+    A concrete implementation of `NumericBinner` that places edges at rounded quantiles.
+
+    Attributes:
+        quantiles (tuple[float, ...]): The quantiles to place edges at.
+    """
+
+    quantiles: tuple[float, ...]
+
+    # Decimals quantiles are rounded to before they are rounded to whole numbers, so that floating-point error
+    # in an interpolated quantile (e.g. 25.499999999999996 for 25.5) does not decide which way it is rounded
+    EDGE_DECIMALS = 9
+
+    def __init__(self, quantiles: tuple[float, ...] = (0.25, 0.50, 0.75)) -> None:
+        """
+        Initializes the QuantileBinner with the quantiles to place edges at.
+
+        Args:
+            quantiles (tuple[float, ...]): The quantiles to place edges at. Defaults to the quartiles.
+        """
+        self.quantiles = quantiles
+
+    def compute_edges(self, column: pd.Series) -> np.ndarray:
+        """
+        Computes edges at the rounded quantiles of the column.
+
+        Args:
+            column (pd.Series): The numerical column to bin.
+
+        Returns:
+            np.ndarray: The rounded quantiles of the column.
+        """
+        return self.round_edges(column.quantile(list(self.quantiles)).to_numpy(dtype=float))
+
+    def compute_edges_from_counts(self, values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Computes edges at the rounded quantiles of a column summarized by its distinct values.
+
+        The quantiles are interpolated linearly between the two nearest rows, exactly as pandas does
+        for the expanded column.
+
+        Args:
+            values (np.ndarray): The distinct values of the column.
+            counts (np.ndarray): The number of rows holding each value.
+
+        Returns:
+            np.ndarray: The rounded quantiles of the column.
+        """
+        order = np.argsort(values)
+        values = np.asarray(values, dtype=float)[order]
+        cumulative = np.cumsum(np.asarray(counts)[order])
+        total = cumulative[-1] if len(cumulative) else 0
+        if total == 0:
+            return self.round_edges(np.full(len(self.quantiles), np.nan))
+
+        # Positions within floating-point error of a row are placed on it
+        positions = np.round((total - 1) * np.asarray(self.quantiles, dtype=float), self.EDGE_DECIMALS)
+        lower = np.floor(positions)
+        gamma = positions - lower
+        below = values[np.searchsorted(cumulative, lower, side="right")]
+        above = values[np.searchsorted(cumulative, np.minimum(lower + 1, total - 1), side="right")]
+
+        difference = above - below
+        interpolated = np.where(gamma >= 0.5, above - difference * (1 - gamma), below + difference * gamma)
+        return self.round_edges(interpolated)
+
+    def round_edges(self, quantiles: np.ndarray) -> np.ndarray:
+        """
+        Rounds quantiles to whole-number edges, halves to even as `round` does.
+
+        Quantiles are first rounded to `EDGE_DECIMALS` decimals, so that the same quantile computed from the
+        column or from its value counts gives the same edge. Undefined quantiles (NaN, as
+        for a column without values) give no edge.
+
+        Args:
+            quantiles (np.ndarray): The quantiles of the column.
+
+        Returns:
+            np.ndarray: The whole-number edges, as integers.
+        """
+        quantiles = np.asarray(quantiles, dtype=float)
+        quantiles = quantiles[~np.isnan(quantiles)]
+        return np.round(np.round(quantiles, self.EDGE_DECIMALS)).astype(np.int64)
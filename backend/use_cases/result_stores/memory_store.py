@@ -0,0 +1,240 @@
+"""
+memory_store.py
+
+This module defines the `MemoryStore` class, a `ResultStore` that keeps results in the memory of
+the current process within fixed bounds:
+- At most `max_entries` entries and `max_bytes` bytes are kept, where the size of an entry is
+  estimated from its serialized JSON payload unless another estimate is given. When either bound
+  is exceeded, the least recently used entries are evicted first.
+- Entries can expire after a time to live (TTL), either the store's default or one given per entry.
+- Stores can also share a `StoreBudget` of bytes, evicting the least recently used entries of any of
+  them when their total exceeds it.
+"""
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from backend.use_cases.result_stores.result_store import ResultStore
+from backend.use_cases.result_stores.store_budget import StoreBudget
+
+
+class MemoryStore(ResultStore):
+    """
+    Stores results in memory with LRU eviction, per-entry expiry and a byte budget.
+
+    Attributes:
+        max_entries (int | None): The maximum number of entries, or None for no limit.
+        max_bytes (int | None): The maximum total estimated size of the entries, or None for no limit.
+        ttl (float | None): The default number of seconds after which entries expire, or None to keep them.
+        size (int): The total estimated size of the stored entries in bytes.
+        get_size (Callable[[object], int]): The function estimating the size of a value in bytes.
+        budget (StoreBudget | None): The byte budget shared with other stores, or None.
+    """
+
+    max_entries: int | None
+    max_bytes: int | None
+    ttl: float | None
+    size: int
+    get_size: Callable[[object], int]
+    budget: StoreBudget | None
+
+    def __init__(self, max_entries: int | None = None, max_bytes: int | None = None,
+                 ttl: float | None = None, get_size: Callable[[object], int] | None = None,
+                 budget: StoreBudget | None = None) -> None:
+        """
+        Initializes an empty MemoryStore.
+
+        Args:
+            max_entries (int | None): The maximum number of entries, or None for no limit.
+            max_bytes (int | None): The maximum total estimated size of the entries, or None for no limit.
+            ttl (float | None): The default number of seconds after which entries expire, or None to keep them.
+            get_size (Callable[[object], int] | None): The function estimating the size of a value in bytes, for
+                values that are not JSON-serializable. Defaults to `estimate_size`.
+            budget (StoreBudget | None): A byte budget to share with other stores, on top of `max_bytes`.
+        """
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.get_size = get_size if get_size is not None else self.estimate_size
+        self.size = 0
+        self.budget = budget
+        # Entries from least to most recently used, as (value, size, expiry time, recency stamp) tuples
+        self._entries = OrderedDict()
+        if budget is not None:
+            # Stores sharing a budget share its lock, so that any of them can evict the entries of the others
+            self._lock = budget.lock
+            self._clock = budget.clock
+            with budget.lock:
+                budget.stores.append(self)
+        else:
+            self._lock = threading.Lock()
+            self._clock = itertools.count()
+
+    def get(self, key: str) -> object | None:
+        """
+        Retrieves the value stored under a key and marks it as the most recently used. An expired entry
+        is evicted and counted as a miss.
+
+        Args:
+            key (str): The key to look up.
+
+        Returns:
+            object | None: The stored value, or None if the key is not stored or has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry):
+                self._remove(key)
+                self.evictions += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries[key] = (*entry[:3], next(self._clock))
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, value: object, ttl: float | None = None) -> None:
+        """
+        Stores a value under a key, replacing any previous value, and evicts the least recently used
+        entries until the store is within its bounds.
+
+        An entry larger than `max_bytes` or the shared budget on its own is not stored, and is counted as
+        evicted.
+
+        Args:
+            key (str): The key to store the value under.
+            value (object): The value to store, JSON-serializable unless `get_size` was given.
+            ttl (float | None): The number of seconds after which the entry expires, or None to use the
+                store's default.
+        """
+        size = self.get_size(value)
+        ttl = ttl if ttl is not None else self.ttl
+        expiry = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if any(limit is not None and size > limit for limit in (self.max_bytes, self._get_shared_limit())):
+                self.evictions += 1
+                return
+
+            self._entries[key] = (value, size, expiry, next(self._clock))
+            self.size += size
+            if self.budget is not None:
+                self.budget.size += size
+            while self._is_over_budget():
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            if self.budget is not None:
+                self._evict_shared()
+
+    def delete(self, key: str) -> None:
+        """
+        Removes the entry stored under a key, if any.
+
+        Args:
+            key (str): The key to remove.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def contains(self, key: str) -> bool:
+        """
+        Checks whether a key is stored, without counting a hit or a miss or changing its recency.
+
+        Args:
+            key (str): The key to check.
+
+        Returns:
+            bool: True if the key is stored and has not expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._is_expired(entry)
+
+    def __len__(self) -> int:
+        """
+        Counts the stored entries, including expired entries that have not been evicted yet.
+
+        Returns:
+            int: The number of entries in the store.
+        """
+        return len(self._entries)
+
+    @staticmethod
+    def estimate_size(value: object) -> int:
+        """
+        Estimates the memory taken by a value from the size of its JSON payload.
+
+        Args:
+            value (object): The value to measure.
+
+        Returns:
+            int: The estimated size in bytes.
+        """
+        return len(json.dumps(value, separators=(",", ":"), default=str).encode())
+
+    def _is_over_budget(self) -> bool:
+        """
+        Checks whether the store holds more entries or bytes than allowed.
+
+        Returns:
+            bool: True if an entry must be evicted.
+        """
+        return ((self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_bytes is not None and self.size > self.max_bytes))
+
+    def _get_shared_limit(self) -> int | None:
+        """
+        Retrieves the limit of the shared budget.
+
+        Returns:
+            int | None: The maximum total size of the stores sharing the budget, or None without a limit.
+        """
+        return self.budget.max_bytes if self.budget is not None else None
+
+    def _evict_shared(self) -> None:
+        """
+        Evicts the least recently used entries of the stores sharing the budget until they are within it. The
+        lock must be held.
+        """
+        budget = self.budget
+        while budget.max_bytes is not None and budget.size > budget.max_bytes:
+            # The least recently used entry of every store is its first one
+            store = min((store for store in budget.stores if store._entries),
+                        key=lambda store: next(iter(store._entries.values()))[3])
+            store._remove(next(iter(store._entries)))
+            store.evictions += 1
+
+    @staticmethod
+    def _is_expired(entry: tuple) -> bool:
+        """
+        Checks whether an entry has outlived its TTL.
+
+        Args:
+            entry (tuple): The (value, size, expiry time, recency stamp) of the entry.
+
+        Returns:
+            bool: True if the entry has expired.
+        """
+        return entry[2] is not None and entry[2] <= time.monotonic()
+
+    def _remove(self, key: str) -> None:
+        """
+        Removes an entry and releases its size from the budget. The lock must be held.
+
+        Args:
+            key (str): The key of the entry to remove.
+        """
+        size = self._entries.pop(key)[1]
+        self.size -= size
+        if self.budget is not None:
+            self.budget.size -= size
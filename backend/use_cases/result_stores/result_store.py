@@ -0,0 +1,175 @@
+"""
+result_store.py
+
+This module defines the `ResultStore` class, which provides an abstract interface for storing the
+results served by the API, such as generated datasets and saved comparisons, under their IDs.
+
+Stores may forget entries (for example to stay within a memory budget), so a stored ID is not
+guaranteed to be found later. Every store counts its hits, misses and evictions for tuning.
+
+Stores can also be used like dictionaries: `store[id]`, `store[id] = value`, `del store[id]` and
+`id in store`.
+"""
+
+
+class ResultStore:
+    """
+    Provides an abstract base for stores of API results.
+
+    Methods `get`, `put`, `delete`, `contains` and `__len__` must be implemented by subclasses, which must
+    also keep the counters up to date.
+
+    Attributes:
+        hits (int): The number of lookups that found their entry.
+        misses (int): The number of lookups that did not find their entry.
+        evictions (int): The number of entries forgotten to make room or because they expired.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self) -> None:
+        """
+        Initializes the counters of the store.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> object | None:
+        """
+        Retrieves the value stored under a key, counting the lookup as a hit or a miss.
+
+        This method must be implemented by subclasses.
+
+        Args:
+            key (str): The key to look up.
+
+        Returns:
+            object | None: The stored value, or None if the key is not stored.
+
+        Raises:
+            NotImplementedError: If not implemented in a subclass.
+        """
+        raise NotImplementedError
+
+    def put(self, key: str, value: object, ttl: float | None = None) -> None:
+        """
+        Stores a value under a key, replacing any previous value.
+
+        This method must be implemented by subclasses.
+
+        Args:
+            key (str): The key to store the value under.
+            value (object): The JSON-serializable value to store.
+            ttl (float | None): The number of seconds after which the entry expires, or None to use the
+                store's default.
+
+        Raises:
+            NotImplementedError: If not implemented in a subclass.
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """
+        Removes the entry stored under a key, if any.
+
+        This method must be implemented by subclasses.
+
+        Args:
+            key (str): The key to remove.
+
+        Raises:
+            NotImplementedError: If not implemented in a subclass.
+        """
+        raise NotImplementedError
+
+    def contains(self, key: str) -> bool:
+        """
+        Checks whether a key is stored, without counting a hit or a miss.
+
+        This method must be implemented by subclasses.
+
+        Args:
+            key (str): The key to check.
+
+        Returns:
+            bool: True if the key is stored and has not expired.
+
+        Raises:
+            NotImplementedError: If not implemented in a subclass.
+        """
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        """
+        Counts the stored entries.
+
+        This method must be implemented by subclasses.
+
+        Returns:
+            int: The number of entries in the store.
+
+        Raises:
+            NotImplementedError: If not implemented in a subclass.
+        """
+        raise NotImplementedError
+
+    def get_statistics(self) -> dict:
+        """
+        Generates a summary of the store's usage counters.
+
+        Returns:
+            dict: The number of entries, hits, misses and evictions.
+        """
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def __getitem__(self, key: str) -> object:
+        """
+        Retrieves the value stored under a key.
+
+        Args:
+            key (str): The key to look up.
+
+        Returns:
+            object: The stored value.
+
+        Raises:
+            KeyError: If the key is not stored.
+        """
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: object) -> None:
+        """
+        Stores a value under a key with the store's default TTL.
+
+        Args:
+            key (str): The key to store the value under.
+            value (object): The JSON-serializable value to store.
+        """
+        self.put(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Removes the entry stored under a key, if any.
+
+        Args:
+            key (str): The key to remove.
+        """
+        self.delete(key)
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Checks whether a key is stored, without counting a hit or a miss.
+
+        Args:
+            key (str): The key to check.
+
+        Returns:
+            bool: True if the key is stored.
+        """
+        return self.contains(key)
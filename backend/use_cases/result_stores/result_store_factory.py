@@ -0,0 +1,82 @@
+"""
+result_store_factory.py
+
+This module provides the `create_result_store` function, which builds the `ResultStore` used by
+the API from environment variables:
+- `STORE_BACKEND`: `memory` (default) to keep results in the memory of each worker process, or
+  `sqlite` to share them between worker processes through a local SQLite database.
+- `STORE_PATH`: the path of the SQLite database (default `results.db`).
+- `STORE_MAX_ENTRIES`: the maximum number of entries of each store (default 10000).
+- `STORE_MAX_BYTES`: the maximum estimated size in bytes of the in-memory stores of a process together,
+  shared between them through `store_budget` (default 256 MiB).
+- `STORE_TTL`: the number of seconds after which entries expire (default: never).
+"""
+import os
+from typing import Callable
+
+from backend.use_cases.result_stores.memory_store import MemoryStore
+from backend.use_cases.result_stores.result_store import ResultStore
+from backend.use_cases.result_stores.sqlite_store import SqliteStore
+from backend.use_cases.result_stores.store_budget import StoreBudget
+
+# Bytes the in-memory stores of this process may hold together, set by the STORE_MAX_BYTES environment variable
+store_budget = StoreBudget(int(os.getenv("STORE_MAX_BYTES", 256 * 1024 * 1024)) or None)
+
+
+def create_result_store(namespace: str) -> ResultStore:
+    """
+    Builds a result store configured by the environment.
+
+    Args:
+        namespace (str): The kind of results kept in the store, such as "datasets". Stores sharing a
+            database file keep their entries apart by namespace.
+
+    Returns:
+        ResultStore: A bounded in-memory store, or a SQLite store bounded to `STORE_MAX_ENTRIES` entries if
+            `STORE_BACKEND` is `sqlite`.
+
+    Raises:
+        ValueError: If `STORE_BACKEND` names an unknown backend.
+    """
+    backend = os.getenv("STORE_BACKEND", "memory")
+    if backend == "memory":
+        return create_memory_store()
+    elif backend == "sqlite":
+        return SqliteStore(os.getenv("STORE_PATH", "results.db"), namespace, get_ttl(),
+                           int(os.getenv("STORE_MAX_ENTRIES", 10_000)))
+    else:
+        raise ValueError(f"Unknown result store backend: {backend}")
+
+
+def create_memory_store(get_size: Callable[[object], int] | None = None,
+                        max_entries: int | None = None) -> MemoryStore:
+    """
+    Builds an in-memory store bounded by the environment, whatever `STORE_BACKEND` is, sharing `store_budget`
+    with the other in-memory stores. It can also hold values derived from results, such as encoded responses,
+    in each worker process.
+
+    Args:
+        get_size (Callable[[object], int] | None): The function estimating the size of a value in bytes.
+            Defaults to the size of its JSON payload.
+        max_entries (int | None): The maximum number of entries, or None for `STORE_MAX_ENTRIES`.
+
+    Returns:
+        MemoryStore: A bounded in-memory store.
+    """
+    return MemoryStore(
+        max_entries=max_entries if max_entries is not None else int(os.getenv("STORE_MAX_ENTRIES", 10_000)),
+        ttl=get_ttl(),
+        get_size=get_size,
+        budget=store_budget
+    )
+
+
+def get_ttl() -> float | None:
+    """
+    Reads the number of seconds after which stored entries expire.
+
+    Returns:
+        float | None: The value of `STORE_TTL`, or None if entries do not expire.
+    """
+    ttl = os.getenv("STORE_TTL")
+    return float(ttl) if ttl else None
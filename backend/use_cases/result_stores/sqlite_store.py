@@ -0,0 +1,197 @@
+"""
+sqlite_store.py
+
+This module defines the `SqliteStore` class, a `ResultStore` that keeps results in a local SQLite
+database, so that every worker process of the server sees the same results and they survive
+restarts.
+
+The database runs in write-ahead logging (WAL) mode, which lets readers proceed while another
+process writes. Values are stored as zlib-compressed JSON, and several stores can share one
+database file under different namespaces. Each namespace can be bounded to `max_entries` entries,
+beyond which the least recently written are evicted.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from backend.use_cases.result_stores.result_store import ResultStore
+
+
+class SqliteStore(ResultStore):
+    """
+    Stores results in a SQLite database shared between processes.
+
+    Attributes:
+        path (str): The path of the database file.
+        namespace (str): The namespace separating this store's entries from other stores in the same file.
+        ttl (float | None): The default number of seconds after which entries expire, or None to keep them.
+        max_entries (int | None): The maximum number of entries in the namespace, or None for no limit.
+    """
+
+    path: str
+    namespace: str
+    ttl: float | None
+    max_entries: int | None
+
+    # Number of writes between two purges of expired entries
+    PURGE_INTERVAL = 100
+
+    # Milliseconds to wait for another process's write lock before failing
+    BUSY_TIMEOUT = 5000
+
+    def __init__(self, path: str, namespace: str = "results", ttl: float | None = None,
+                 max_entries: int | None = None) -> None:
+        """
+        Initializes a SqliteStore, creating its database file and table if needed.
+
+        Args:
+            path (str): The path of the database file.
+            namespace (str): The namespace separating this store's entries from other stores in the same file.
+            ttl (float | None): The default number of seconds after which entries expire, or None to keep them.
+            max_entries (int | None): The maximum number of entries in the namespace, or None for no limit.
+        """
+        super().__init__()
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._connection = None
+        self._pid = None
+        self._writes = 0
+        self._lock = threading.Lock()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires REAL, "
+                "written REAL NOT NULL DEFAULT 0, PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+            )
+            # Databases created before entries were bounded have no write times
+            if "written" not in [column[1] for column in connection.execute("PRAGMA table_info(results)")]:
+                connection.execute("ALTER TABLE results ADD COLUMN written REAL NOT NULL DEFAULT 0")
+            connection.execute("CREATE INDEX IF NOT EXISTS results_written ON results (namespace, written)")
+
+    def get(self, key: str) -> object | None:
+        """
+        Retrieves the value stored under a key. An expired entry is deleted and counted as a miss.
+
+        Args:
+            key (str): The key to look up.
+
+        Returns:
+            object | None: The stored value, or None if the key is not stored or has expired.
+        """
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute("SELECT value, expires FROM results WHERE namespace = ? AND key = ?",
+                                     (self.namespace, key)).fetchone()
+            if row is not None and row[1] is not None and row[1] <= time.time():
+                connection.execute("DELETE FROM results WHERE namespace = ? AND key = ?", (self.namespace, key))
+                self.evictions += 1
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, value: object, ttl: float | None = None) -> None:
+        """
+        Stores a value under a key, replacing any previous value. Expired entries are purged every
+        `PURGE_INTERVAL` writes, and the least recently written entries beyond `max_entries` are evicted.
+
+        Args:
+            key (str): The key to store the value under.
+            value (object): The JSON-serializable value to store.
+            ttl (float | None): The number of seconds after which the entry expires, or None to use the
+                store's default.
+        """
+        payload = zlib.compress(json.dumps(value, separators=(",", ":"), default=str).encode())
+        ttl = ttl if ttl is not None else self.ttl
+        expires = time.time() + ttl if ttl is not None else None
+
+        with self._lock:
+            connection = self._connect()
+            connection.execute("INSERT OR REPLACE INTO results (namespace, key, value, expires, written) "
+                               "VALUES (?, ?, ?, ?, ?)", (self.namespace, key, payload, expires, time.time()))
+            self._writes += 1
+            if self._writes % self.PURGE_INTERVAL == 0:
+                purged = connection.execute("DELETE FROM results WHERE namespace = ? AND expires <= ?",
+                                            (self.namespace, time.time()))
+                self.evictions += purged.rowcount
+            if self.max_entries is not None:
+                excess = connection.execute("SELECT COUNT(*) FROM results WHERE namespace = ?",
+                                            (self.namespace,)).fetchone()[0] - self.max_entries
+                if excess > 0:
+                    evicted = connection.execute(
+                        "DELETE FROM results WHERE namespace = ? AND key IN "
+                        "(SELECT key FROM results WHERE namespace = ? ORDER BY written LIMIT ?)",
+                        (self.namespace, self.namespace, excess))
+                    self.evictions += evicted.rowcount
+
+    def delete(self, key: str) -> None:
+        """
+        Removes the entry stored under a key, if any.
+
+        Args:
+            key (str): The key to remove.
+        """
+        with self._lock:
+            self._connect().execute("DELETE FROM results WHERE namespace = ? AND key = ?", (self.namespace, key))
+
+    def contains(self, key: str) -> bool:
+        """
+        Checks whether a key is stored, without counting a hit or a miss.
+
+        Args:
+            key (str): The key to check.
+
+        Returns:
+            bool: True if the key is stored and has not expired.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT 1 FROM results WHERE namespace = ? AND key = ? AND (expires IS NULL OR expires > ?)",
+                (self.namespace, key, time.time())
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        """
+        Counts the stored entries, including expired entries that have not been purged yet.
+
+        Returns:
+            int: The number of entries in the store.
+        """
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM results WHERE namespace = ?",
+                                           (self.namespace,)).fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Closes the database connection of this process. It is reopened on the next operation.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Retrieves the database connection of the current process, opening it if needed. A connection
+        inherited from a parent process is never reused. The lock must be held.
+
+        Returns:
+            sqlite3.Connection: An autocommit connection in WAL mode.
+        """
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT / 1000,
+                                               isolation_level=None, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._pid = os.getpid()
+        return self._connection
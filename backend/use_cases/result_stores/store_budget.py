@@ -0,0 +1,46 @@
+"""
+store_budget.py
+
+This module defines the `StoreBudget` class, a byte budget shared by several `MemoryStore`s, so that
+the results kept in the memory of a process are bounded as a whole rather than store by store.
+
+When a store sharing the budget takes it over its limit, the least recently used entry of any of the
+stores is evicted first, so that stores holding large results (such as datasets) and stores holding
+small ones (such as job statuses) divide the budget by use.
+"""
+import itertools
+import threading
+
+
+class StoreBudget:
+    """
+    Keeps track of the bytes held by the memory stores sharing it.
+
+    Attributes:
+        max_bytes (int | None): The maximum total estimated size of the entries of the stores, or None for no
+            limit.
+        size (int): The total estimated size of the entries of the stores in bytes.
+        stores (list): The `MemoryStore`s sharing the budget.
+        lock (threading.Lock): The lock guarding the budget and every store sharing it.
+        clock (itertools.count): The source of the recency stamps of the entries of the stores.
+    """
+
+    max_bytes: int | None
+    size: int
+    stores: list
+    lock: threading.Lock
+    clock: itertools.count
+
+    def __init__(self, max_bytes: int | None) -> None:
+        """
+        Initializes a StoreBudget shared by no store yet.
+
+        Args:
+            max_bytes (int | None): The maximum total estimated size of the entries of the stores, or None for
+                no limit.
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.stores = []
+        self.lock = threading.Lock()
+        self.clock = itertools.count()
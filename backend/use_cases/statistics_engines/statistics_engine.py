@@ -0,0 +1,182 @@
+"""
+statistics_engine.py
+
+This module defines the `StatisticsEngine` class, which computes per-trait statistics for the
+protected categories of a dataset.
+
+Rather than masking the DataFrame once per trait, the engine:
+- Computes the |marked - actual| mismatch column once for the whole dataset, and, when the outcomes are
+  binary, the confusion matrix column (true or false positive or negative) of every row.
+- Encodes each category column into integer trait codes: the existing codes of dictionary-encoded
+  (`category` dtype) columns, a single factorize pass for other text columns, or, for numerical
+  columns, the range codes of a `NumericBinner`.
+- Aggregates row counts and mismatch totals, or whole confusion matrices, for every trait with a
+  single `np.bincount`.
+
+The cost of a category is therefore O(rows) regardless of how many traits it has, and every rate of
+`METRICS` is then derived from the per-trait totals without another pass over the rows.
+"""
+
+import numpy as np
+import pandas as pd
+from backend.entities.numeric_bins import NumericBins
+from backend.entities.trait_statistics import TraitStatistics, get_outcome_cells
+from backend.use_cases.numeric_binners.numeric_binner import NumericBinner
+from backend.use_cases.numeric_binners.quantile_binner import QuantileBinner
+
+
+class StatisticsEngine:
+    """
+    Computes `TraitStatistics` for the categories of a dataset in vectorized passes.
+
+    Attributes:
+        binner (NumericBinner): The binner used to group numerical categories into ranges.
+    """
+
+    binner: NumericBinner
+
+    def __init__(self, binner: NumericBinner | None = None) -> None:
+        """
+        Initializes the StatisticsEngine with the binner used for numerical categories.
+
+        Args:
+            binner (NumericBinner | None): The binner to use. Defaults to a quartile-based `QuantileBinner`.
+        """
+        self.binner = binner if binner is not None else QuantileBinner()
+
+    def compute(self, df: pd.DataFrame, categories: set,
+                numeric_bins: dict[str, NumericBins] | None = None) -> dict[str, TraitStatistics]:
+        """
+        Computes the trait statistics of every given category.
+
+        Args:
+            df (pd.DataFrame): The dataset as a pandas DataFrame.
+            categories (set): The categories to compute statistics for.
+            numeric_bins (dict[str, NumericBins] | None): Precomputed bins for numerical categories. Bins
+                missing from this dictionary are computed with the engine's binner.
+
+        Returns:
+            dict[str, TraitStatistics]: A dictionary mapping each category to its trait statistics.
+        """
+        numeric_bins = numeric_bins or {}
+        mismatches, cells = self.get_mismatches(df), self.get_cells(df)
+        return {category: self.aggregate(*self.encode(df[category], numeric_bins.get(category)), mismatches, cells)
+                for category in categories}
+
+    def compute_category(self, df: pd.DataFrame, category: str) -> TraitStatistics:
+        """
+        Computes the trait statistics of a single category.
+
+        Args:
+            df (pd.DataFrame): The dataset as a pandas DataFrame.
+            category (str): The category to compute statistics for.
+
+        Returns:
+            TraitStatistics: The trait statistics of the category.
+        """
+        return self.aggregate(*self.encode(df[category]), self.get_mismatches(df), self.get_cells(df))
+
+    def compute_values(self, df: pd.DataFrame, categories: set) -> dict[str, TraitStatistics]:
+        """
+        Computes per-value statistics of every given category, with one trait per distinct value. Unlike
+        `compute`, numerical categories are not grouped into ranges, so the statistics can be merged with
+        those of other rows and binned afterwards.
+
+        Args:
+            df (pd.DataFrame): The dataset as a pandas DataFrame.
+            categories (set): The categories to compute statistics for.
+
+        Returns:
+            dict[str, TraitStatistics]: A dictionary mapping each category to its per-value statistics.
+        """
+        mismatches, cells = self.get_mismatches(df), self.get_cells(df)
+        statistics = {}
+        for category in categories:
+            column = df[category]
+            if self.is_numeric(column):
+                codes, uniques = pd.factorize(column.to_numpy(dtype=float))
+                statistics[category] = self.aggregate(codes, uniques.tolist(), mismatches, cells)
+            else:
+                statistics[category] = self.aggregate(*self.encode(column), mismatches, cells)
+        return statistics
+
+    def get_mismatches(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Calculates the mismatch between the "marked" and "actual" values of every row.
+
+        Args:
+            df (pd.DataFrame): The dataset as a pandas DataFrame.
+
+        Returns:
+            np.ndarray: The |marked - actual| value of every row.
+        """
+        return np.abs(df["marked"].to_numpy() - df["actual"].to_numpy())
+
+    def get_cells(self, df: pd.DataFrame) -> np.ndarray | None:
+        """
+        Determines the confusion matrix column of every row of the dataset.
+
+        Args:
+            df (pd.DataFrame): The dataset as a pandas DataFrame.
+
+        Returns:
+            np.ndarray | None: The column of every row (see `get_outcome_cells`), or None if the outcomes are not
+                binary.
+        """
+        return get_outcome_cells(df["marked"].to_numpy(), df["actual"].to_numpy())
+
+    def is_numeric(self, column: pd.Series) -> bool:
+        """
+        Determines whether a category column is numerical and should be grouped into ranges.
+
+        Args:
+            column (pd.Series): The category column to check.
+
+        Returns:
+            bool: True if the column holds numbers (other than booleans), False otherwise.
+        """
+        return pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column)
+
+    def encode(self, column: pd.Series, bins: NumericBins | None = None) -> tuple[np.ndarray, list]:
+        """
+        Encodes a category column into integer trait codes.
+
+        Numerical columns are grouped into the ranges of `bins`, computed with the engine's binner
+        when not given. Missing values are given the code -1.
+
+        Args:
+            column (pd.Series): The category column to encode.
+            bins (NumericBins | None): Precomputed bins to use if the column is numerical.
+
+        Returns:
+            tuple[np.ndarray, list]: The trait code of every row and the traits the codes refer to.
+        """
+        if self.is_numeric(column):
+            if bins is None:
+                bins = self.binner.compute_bins(column)
+            return bins.assign(column.to_numpy(dtype=float)), bins.labels
+
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            return column.cat.codes.to_numpy(), column.cat.categories.tolist()
+
+        codes, uniques = pd.factorize(column)
+        return codes, uniques.tolist()
+
+    def aggregate(self, codes: np.ndarray, traits: list, mismatches: np.ndarray,
+                  cells: np.ndarray | None = None) -> TraitStatistics:
+        """
+        Aggregates per-row trait codes and mismatches into per-trait statistics.
+
+        Rows with a negative code are ignored, and traits without any rows are dropped.
+
+        Args:
+            codes (np.ndarray): The trait code of every row.
+            traits (list): The traits the codes refer to.
+            mismatches (np.ndarray): The |marked - actual| value of every row.
+            cells (np.ndarray | None): The confusion matrix column of every row, to count the confusion matrix of
+                every trait.
+
+        Returns:
+            TraitStatistics: The row count, mismatch total and confusion matrix of every trait.
+        """
+        return TraitStatistics.from_codes(codes, traits, mismatches, cells)
@@ -1,9 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from backend.controllers import controllers
+from backend.controllers.http_cache_middleware import HttpCacheMiddleware
+from backend.controllers.timing_middleware import TimingMiddleware
+from backend.presenters import metrics
 
 app = FastAPI()
 
+# Added first so that it runs inside the CORS middleware, which adds its headers to cached responses too
+app.add_middleware(HttpCacheMiddleware)
+
 origins = [
     "*",
 ]
@@ -16,4 +22,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Added last so that it times every request, including those answered by the other middleware
+if metrics.METRICS_ENABLED:
+    app.add_middleware(TimingMiddleware)
+
 app.include_router(controllers.router)
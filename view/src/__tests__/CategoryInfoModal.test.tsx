@@ -33,6 +33,16 @@ describe("SelectedCategoryModal Component", () => {
     expect(screen.getByText("gender")).toBeInTheDocument();
   });
 
+  test("lists the traits without a false positive rate", () => {
+    const category: Category = {
+      ...mockCategory,
+      traits: [...mockCategory.traits, { name: "race", fprMean: null, count: 3 }],
+    };
+    render(<SelectedCategoryModal category={category} onClose={mockOnClose} />);
+
+    expect(screen.getByText(/No false positive rate for:\s*race/)).toBeInTheDocument();
+  });
+
   test("calls onClose when the modal is closed", () => {
     render(<SelectedCategoryModal category={mockCategory} onClose={mockOnClose} />);
 
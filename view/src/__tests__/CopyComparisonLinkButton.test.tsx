@@ -1,4 +1,4 @@
-import { render, screen, fireEvent } from "@testing-library/react";
+import { render, screen, fireEvent, waitFor } from "@testing-library/react";
 import axios from "axios";
 import CopyComparisonLinkButton from "../components/CopyComparisonLinkButton";
 
@@ -34,11 +34,9 @@ describe("CopyComparisonLinkButton Component", () => {
     const button = screen.getByRole("button", { name: /copy comparison link/i });
     fireEvent.click(button);
 
-    expect(mockedAxios.post).toHaveBeenCalledWith("http://mock-api-url.com/api/saveComparison", {
-      data: JSON.stringify({
-        dataset1: mockDataset1,
-        dataset2: mockDataset2,
-      }),
+    expect(mockedAxios.post).toHaveBeenCalledWith("http://mock-api-url.com/api/saveComparisonReference", {
+      dataset1Id: "1",
+      dataset2Id: "2",
     });
 
     // wait for async function to complete
@@ -48,4 +46,31 @@ describe("CopyComparisonLinkButton Component", () => {
       `${window.location.origin}/#comparison123`
     );
   });
+
+  test("saves both datasets when the server no longer has them", async () => {
+    mockedAxios.post.mockReset();
+    mockedAxios.post.mockResolvedValueOnce({ data: "Missing" });
+    mockedAxios.post.mockResolvedValueOnce({ data: "comparison456" });
+
+    render(
+      <CopyComparisonLinkButton
+        selectedDataset1={mockDataset1}
+        selectedDataset2={mockDataset2}
+      />
+    );
+
+    fireEvent.click(screen.getByRole("button", { name: /copy comparison link/i }));
+
+    await waitFor(() =>
+      expect(navigator.clipboard.writeText).toHaveBeenCalledWith(
+        `${window.location.origin}/#comparison456`
+      )
+    );
+    expect(mockedAxios.post).toHaveBeenLastCalledWith("http://mock-api-url.com/api/saveComparison", {
+      data: JSON.stringify({
+        dataset1: mockDataset1,
+        dataset2: mockDataset2,
+      }),
+    });
+  });
 });
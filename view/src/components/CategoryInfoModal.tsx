@@ -13,6 +13,9 @@ export default function CategoryInfoModal({
   category,
   onClose,
 }: SelectedCategoryModalProps): JSX.Element {
+  // The rate of a trait is undefined when none of its rows could be falsely flagged
+  const undefinedTraits = category.traits.filter((t) => t.fprMean === null);
+
   return (
     <Modal
       content={
@@ -46,10 +49,12 @@ export default function CategoryInfoModal({
           </p>
           <Graph
             name={`False Positive Rate V.S. ${capitalize(category.name)}`}
-            entries={category.traits.map((t) => ({
-              name: t.name,
-              value: t.fprMean,
-            }))}
+            entries={category.traits
+              .filter((t) => t.fprMean !== null)
+              .map((t) => ({
+                name: t.name,
+                value: t.fprMean as number,
+              }))}
             getColor={() => "blue-500"}
             maxValue={1}
             maxValueLabel="100%"
@@ -60,6 +65,12 @@ export default function CategoryInfoModal({
             keyboardNavigationEnabled={false}
             valueToText={(value) => `${(value * 100).toFixed(0)}%`}
           />
+          {undefinedTraits.length > 0 && (
+            <p className="mt-32 max-w-96 text-sm text-center">
+              No false positive rate for:{" "}
+              {undefinedTraits.map((t) => t.name).join(", ")}
+            </p>
+          )}
           <div className="mt-32" />
         </div>
       }
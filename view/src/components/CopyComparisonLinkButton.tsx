@@ -12,12 +12,23 @@ export default function CopyComparisonLinkButton({
   selectedDataset2,
 }: CopyComparisonLinkButtonProps): JSX.Element {
   const handleCopyLink = async () => {
-    const response = await axios.post(`${API_BASE_URL}/api/saveComparison`, {
-      data: JSON.stringify({
-        dataset1: selectedDataset1,
-        dataset2: selectedDataset2,
-      }),
-    });
+    // Save the comparison as references to the stored datasets, and fall back
+    // to saving both datasets whole if the server no longer has them
+    let response = await axios.post(
+      `${API_BASE_URL}/api/saveComparisonReference`,
+      {
+        dataset1Id: selectedDataset1?.id,
+        dataset2Id: selectedDataset2?.id,
+      }
+    );
+    if (response.data === "Missing") {
+      response = await axios.post(`${API_BASE_URL}/api/saveComparison`, {
+        data: JSON.stringify({
+          dataset1: selectedDataset1,
+          dataset2: selectedDataset2,
+        }),
+      });
+    }
     const comparisonId = response.data;
     navigator.clipboard.writeText(`${window.location.origin}/#${comparisonId}`);
   };
@@ -2,12 +2,14 @@ export interface Category {
   name: string;
   fprScore: number;
   traits: Trait[];
+  otherTraits?: number;
 }
 
 export interface Trait {
   name: string;
-  fprMean: number;
+  fprMean: number | null;
   count: number;
+  aggregated?: boolean;
 }
 
 export interface Dataset {